@@ -14,11 +14,13 @@ __email__ = "contact@upesy.com"
 # Local imports
 # Import main functionality for easy access
 from .easyeda.easyeda_api import EasyedaApi
+from .easyeda.easyeda_api_async import AsyncEasyedaApi
 from .easyeda.easyeda_importer import (
     Easyeda3dModelImporter,
     EasyedaFootprintImporter,
     EasyedaSymbolImporter,
 )
+from .easyeda.easyeda_views import EasyedaFootprintView, EasyedaSymbolView
 from .kicad.export_kicad_3d_model import Exporter3dModelKicad
 from .kicad.export_kicad_footprint import ExporterFootprintKicad
 from .kicad.export_kicad_symbol import ExporterSymbolKicad
@@ -28,9 +30,12 @@ __all__ = [
     "__author__",
     "__email__",
     "EasyedaApi",
+    "AsyncEasyedaApi",
     "EasyedaSymbolImporter",
     "EasyedaFootprintImporter",
     "Easyeda3dModelImporter",
+    "EasyedaSymbolView",
+    "EasyedaFootprintView",
     "ExporterSymbolKicad",
     "ExporterFootprintKicad",
     "Exporter3dModelKicad",
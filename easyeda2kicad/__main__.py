@@ -3,24 +3,78 @@ from __future__ import annotations
 # Global imports
 import argparse
 import ctypes
+import json
 import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 # Local imports
 from ._version import __version__
+from .easyeda.background import (
+    BackgroundTask,
+    deferred_logs,
+    replay_logs,
+    run_in_background,
+)
+from .easyeda.cache_bundle import bundle_keys, export_bundle, import_bundle
 from .easyeda.easyeda_api import EasyedaApi
+from .easyeda.cache_maintenance import (
+    disk_usage,
+    prune_cache,
+    sum_run_stats,
+    summarize,
+    verify_cache,
+)
+from .easyeda.easyeda_cache import (
+    CACHE_BACKENDS,
+    CACHE_DIR_ENV,
+    CACHE_DIR_NAME,
+    DAY,
+    DEFAULT_CACHE_BACKEND,
+    DEFAULT_CACHE_TTLS,
+    BundleCacheStore,
+    CacheStore,
+    default_cache_dir,
+    detect_cache_backend,
+    open_cache_store,
+    read_run_stats,
+    user_cache_dir,
+)
 from .easyeda.easyeda_importer import (
     Easyeda3dModelImporter,
     EasyedaFootprintImporter,
     EasyedaSymbolImporter,
 )
+from .easyeda.easyeda_views import EasyedaFootprintView, EasyedaSymbolView
 from .easyeda.easyeda_svg_renderer import render_footprint_svg, render_symbol_svg
-from .easyeda.parameters_easyeda import EeSymbol
-from .kicad.export_kicad_3d_model import Exporter3dModelKicad
+from .easyeda.parameters_easyeda import Ee3dModel, EeSymbol
+from .easyeda.prefetch import (
+    DEFAULT_PREFETCH_JOBS,
+    PrefetchResult,
+    prefetch_to_cache,
+    read_lcsc_ids,
+)
+from .kicad.conversion_cache import (
+    CONVERTED_FOOTPRINT,
+    CONVERTED_SYMBOL,
+    ConversionCache,
+    conversion_key,
+)
+from .kicad.export_kicad_3d_model import Exporter3dModelKicad, ExportedModels
 from .kicad.export_kicad_footprint import ExporterFootprintKicad
-from .kicad.export_kicad_symbol import ExporterSymbolKicad
+from .kicad.export_kicad_symbol import (
+    ExporterSymbolKicad,
+    id_already_in_symbol_lib,
+    read_symbol_lib_version,
+    write_component_in_symbol_lib_file,
+)
+
+# Serializes every read-modify-write of the shared library outputs
+# (.kicad_sym, .pretty/, .3dshapes/) when components are processed in parallel.
+_LIBRARY_LOCK = threading.Lock()
 
 
 def parse_custom_fields(custom_field_args: list[str]) -> dict[str, str]:
@@ -41,6 +95,145 @@ def parse_custom_fields(custom_field_args: list[str]) -> dict[str, str]:
     return custom_fields
 
 
+def parse_cache_ttls(cache_ttl_args: list[str]) -> dict[str, float | None]:
+    cache_ttls: dict[str, float | None] = {}
+    for cache_ttl in cache_ttl_args:
+        resource, separator, days = cache_ttl.partition("=")
+        resource = resource.strip()
+        days = days.strip()
+        if not separator or resource not in DEFAULT_CACHE_TTLS:
+            raise ValueError(
+                f'Invalid cache TTL "{cache_ttl}". Expected TYPE=DAYS with TYPE one'
+                f" of {', '.join(DEFAULT_CACHE_TTLS)}."
+            )
+        if days.lower() == "never":
+            cache_ttls[resource] = None
+            continue
+        try:
+            cache_ttls[resource] = float(days) * DAY
+        except ValueError:
+            raise ValueError(
+                f'Invalid cache TTL "{cache_ttl}". DAYS must be a number or "never".'
+            ) from None
+    return cache_ttls
+
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(size: str) -> int:
+    """Parse a byte count such as ``500M`` or ``2G`` (binary units)."""
+    value = size.strip().upper().removesuffix("B").removesuffix("I")
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ""
+    try:
+        number = float(value[: len(value) - len(unit)])
+    except ValueError:
+        raise ValueError(
+            f'Invalid size "{size}". Expected a number with an optional K, M, G'
+            " or T suffix."
+        ) from None
+    if number < 0:
+        raise ValueError(f'Invalid size "{size}". It must not be negative.')
+    return int(number * _SIZE_UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    """Byte count in binary units, e.g. ``1.5 MiB``."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024:
+            break
+        value /= 1024
+    else:
+        unit = "TiB"
+    return f"{int(value)} B" if unit == "B" else f"{value:.1f} {unit}"
+
+
+def add_cache_dir_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        help=(
+            f"cache folder (default: ./{CACHE_DIR_NAME} if it exists, otherwise"
+            f" the user cache {user_cache_dir()}, also set with ${CACHE_DIR_ENV})"
+        ),
+        required=False,
+        default=None,
+        metavar="DIR",
+    )
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    add_cache_dir_argument(parser)
+
+    parser.add_argument(
+        "--revalidate-cache",
+        dest="revalidate_cache",
+        help=(
+            "like --use-cache, but check cached component data with the server"
+            " (ETag/Last-Modified) and only download it again if it changed"
+        ),
+        required=False,
+        default=False,
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--cache-backend",
+        dest="cache_backend",
+        help=(
+            "storage format of the cache folder: compressed content-addressed"
+            " objects (cas), one plain file per entry (files) or an SQLite"
+            " database with expiring entries (sqlite)"
+            f" (default: detected from its files, {DEFAULT_CACHE_BACKEND} for a new"
+            " cache)"
+        ),
+        required=False,
+        default=None,
+        choices=sorted(CACHE_BACKENDS),
+    )
+
+    parser.add_argument(
+        "--cache-ttl",
+        dest="cache_ttl",
+        nargs="+",
+        default=[],
+        metavar="TYPE=DAYS",
+        help=(
+            "days after which cached entries of a type are downloaded again, or"
+            " 'never': component, svg, obj, step, converted (sqlite backend) and"
+            " missing"
+            " (parts/models the server does not have), e.g. --cache-ttl"
+            " component=7 missing=never"
+        ),
+    )
+
+    parser.add_argument(
+        "--cache-bundle",
+        dest="cache_bundle",
+        nargs="+",
+        default=[],
+        metavar="FILE",
+        help=(
+            "read-only cache bundle (easyeda2kicad cache export) looked up after"
+            " the cache folders, e.g. for runners without network access;"
+            " implies --use-cache"
+        ),
+    )
+
+    parser.add_argument(
+        "--cache-max-size",
+        dest="cache_max_size",
+        help=(
+            "size budget of the cache folder (e.g. 500M, 2G): least recently used"
+            " entries are evicted beyond it (cas and sqlite backends)"
+        ),
+        required=False,
+        default=None,
+        metavar="SIZE",
+    )
+
+
 def get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description=(
@@ -121,12 +314,28 @@ def get_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--use-cache",
         dest="use_cache",
-        help="cache API responses in .easyeda_cache/ to avoid repeated network requests",
+        help=(
+            "cache API responses to avoid repeated network requests: in"
+            f" ./{CACHE_DIR_NAME} if it exists, then in the user cache"
+        ),
         required=False,
         default=False,
         action="store_true",
     )
 
+    add_cache_arguments(parser)
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        dest="jobs",
+        help="number of components fetched and converted in parallel (default: 1)",
+        required=False,
+        default=1,
+        type=int,
+        metavar="N",
+    )
+
     parser.add_argument(
         "--custom-field",
         dest="custom_field",
@@ -139,6 +348,19 @@ def get_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def parse_cache_arguments(arguments: dict[str, Any]) -> None:
+    """Convert the options of add_cache_arguments in place; raises ValueError."""
+    arguments["cache_ttls"] = parse_cache_ttls(arguments["cache_ttl"])
+    if arguments["cache_max_size"] is not None:
+        arguments["cache_max_size"] = parse_size(arguments["cache_max_size"])
+    if arguments["cache_dir"] is not None:
+        arguments["cache_dir"] = Path(arguments["cache_dir"]).expanduser()
+    arguments["cache_bundles"] = [Path(file) for file in arguments["cache_bundle"]]
+    for bundle in arguments["cache_bundles"]:
+        # Fail early on a wrong path rather than on the first cache lookup
+        BundleCacheStore(bundle).close()
+
+
 def valid_arguments(arguments: dict[str, Any]) -> bool:
     for lcsc_id in arguments["lcsc_id"]:
         if not lcsc_id.startswith("C"):
@@ -159,8 +381,16 @@ def valid_arguments(arguments: dict[str, Any]) -> bool:
         )
         return False
 
+    if arguments["revalidate_cache"] or arguments["cache_bundle"]:
+        arguments["use_cache"] = True
+
+    if arguments["jobs"] < 1:
+        logging.error(f"--jobs must be at least 1, got {arguments['jobs']}")
+        return False
+
     try:
         arguments["custom_fields"] = parse_custom_fields(arguments["custom_field"])
+        parse_cache_arguments(arguments)
     except ValueError as err:
         logging.error(str(err))
         return False
@@ -204,117 +434,171 @@ def _process_component(
     component_id: str,
     arguments: dict[str, Any],
     api: EasyedaApi,
+    exported_models: ExportedModels | None = None,
 ) -> bool:
-    """Process a single LCSC component. Returns True on success, False on error."""
+    """Process a single LCSC component. Returns True on success, False on error.
+
+    *exported_models* is shared by the components of a run, so that a 3D model
+    used by several of them is written once.
+    """
     cad_data = api.get_cad_data_of_component(lcsc_id=component_id)
     if not cad_data:
         logging.error(f"Failed to fetch data from EasyEDA API for part {component_id}")
         return False
 
     output = arguments["output"]
+    # Generated outputs of earlier runs, reused while the part and options
+    # stay the same
+    conversions = ConversionCache(
+        api.cache_store if api.use_cache else None, count=api.count_cache_lookup
+    )
 
+    # The names parse no shape: a symbol or footprint that is already in the
+    # library is not converted at all, and the 3D model of a part rejected
+    # for that is not downloaded
+    lib_path = f"{output}.kicad_sym"
     if arguments["symbol"]:
-        # ---------------- SYMBOL ----------------
-        easyeda_symbol: EeSymbol = EasyedaSymbolImporter(
-            easyeda_cp_cad_data=cad_data
-        ).get_symbol()
-        lib_path = f"{output}.kicad_sym"
-        exporter = ExporterSymbolKicad(
-            symbol=easyeda_symbol,
-            lib_path=lib_path,
-            custom_fields=arguments["custom_fields"],
-        )
-        if not exporter.save_to_lib(
-            lib_path=lib_path,
-            footprint_lib_name=Path(output).stem,
-            overwrite=arguments["overwrite"],
-        ):
+        with _LIBRARY_LOCK:
+            lib_version = read_symbol_lib_version(lib_path)
+            exists = not arguments["overwrite"] and id_already_in_symbol_lib(
+                lib_path=lib_path, component_name=EasyedaSymbolView(cad_data).name
+            )
+        if exists:
             logging.error(
                 f"Symbol for {component_id} already exists. Use --overwrite to update"
             )
             return False
-        if easyeda_symbol.sub_symbols:
-            logging.info(
-                f"Integrated {len(easyeda_symbol.sub_symbols)} sub-symbols into main symbol"
-            )
-        logging.info(
-            f"Created Kicad symbol for ID : {component_id}\n"
-            f"       Symbol name : {easyeda_symbol.info.name}\n"
-            f"       Library path : {lib_path}"
-        )
-
+    footprint_path = Path(f"{output}.pretty")
     if arguments["footprint"]:
-        # ---------------- FOOTPRINT ----------------
-        easyeda_footprint = EasyedaFootprintImporter(
-            easyeda_cp_cad_data=cad_data
-        ).get_footprint()
+        footprint_filename = f"{EasyedaFootprintView(cad_data).name}.kicad_mod"
         if (
-            Path(f"{output}.pretty") / f"{easyeda_footprint.info.name}.kicad_mod"
-        ).is_file() and not arguments["overwrite"]:
+            not arguments["overwrite"]
+            and (footprint_path / footprint_filename).is_file()
+        ):
             logging.error(
-                f"Footprint for {component_id} already exists. Use --overwrite to replace"
+                f"Footprint for {component_id} already exists. Use --overwrite to"
+                " replace"
             )
             return False
-        footprint_path = Path(f"{output}.pretty")
-        if arguments.get("use_default_folder"):
-            model_3d_path = "${EASYEDA2KICAD}/easyeda2kicad.3dshapes"
-        elif arguments["project_relative"]:
-            model_3d_path = (
-                "${KIPRJMOD}/"
-                + Path(f"{output}.3dshapes").relative_to(Path.cwd()).as_posix()
+
+    model_3d_task: BackgroundTask[Ee3dModel | None] | None = None
+    if arguments["3d"]:
+        # Download the 3D assets while the symbol and footprint are converted
+        model_3d_task = run_in_background(_import_3d_model, cad_data, api)
+    try:
+        if arguments["symbol"]:
+            # ---------------- SYMBOL ----------------
+            symbol = _convert_symbol(
+                cad_data,
+                lib_version=lib_version,
+                custom_fields=arguments["custom_fields"],
+                footprint_lib_name=Path(output).stem,
+                conversions=conversions,
+            )
+            with _LIBRARY_LOCK:
+                # Another worker may have added it in the meantime
+                saved = arguments["overwrite"] or not id_already_in_symbol_lib(
+                    lib_path=lib_path, component_name=symbol["name"]
+                )
+                if saved:
+                    write_component_in_symbol_lib_file(
+                        lib_path=lib_path,
+                        component_name=symbol["name"],
+                        component_content=symbol["content"],
+                        version=lib_version,
+                    )
+            if not saved:
+                logging.error(
+                    f"Symbol for {component_id} already exists. Use --overwrite to"
+                    " update"
+                )
+                return False
+            if symbol["sub_symbols"]:
+                logging.info(
+                    f"Integrated {symbol['sub_symbols']} sub-symbols into main symbol"
+                )
+            logging.info(
+                f"Created Kicad symbol for ID : {component_id}\n"
+                f"       Symbol name : {symbol['name']}\n"
+                f"       Library path : {lib_path}"
             )
-        else:
-            model_3d_path = Path(f"{output}.3dshapes").as_posix()
-        footprint_filename = f"{easyeda_footprint.info.name}.kicad_mod"
-        ExporterFootprintKicad(footprint=easyeda_footprint).export(
-            footprint_full_path=str(footprint_path / footprint_filename),
-            model_3d_path=model_3d_path,
-        )
-        logging.info(
-            f"Created Kicad footprint for ID: {component_id}\n"
-            f"       Footprint name: {easyeda_footprint.info.name}\n"
-            f"       Footprint path: {footprint_path / footprint_filename}"
-        )
 
-    if arguments["svg"]:
-        # ---------------- SVG ----------------
-        svg_dir = Path(f"{output}.svgs")
-        svg_dir.mkdir(parents=True, exist_ok=True)
+        if arguments["footprint"]:
+            # ---------------- FOOTPRINT ----------------
+            if arguments.get("use_default_folder"):
+                model_3d_path = "${EASYEDA2KICAD}/easyeda2kicad.3dshapes"
+            elif arguments["project_relative"]:
+                model_3d_path = (
+                    "${KIPRJMOD}/"
+                    + Path(f"{output}.3dshapes").relative_to(Path.cwd()).as_posix()
+                )
+            else:
+                model_3d_path = Path(f"{output}.3dshapes").as_posix()
+            footprint = _convert_footprint(cad_data, model_3d_path, conversions)
+            with _LIBRARY_LOCK:
+                saved = (
+                    arguments["overwrite"]
+                    or not (footprint_path / footprint_filename).is_file()
+                )
+                if saved:
+                    footprint_path.mkdir(parents=True, exist_ok=True)
+                    (footprint_path / footprint_filename).write_text(
+                        footprint["content"], encoding="utf-8"
+                    )
+            if not saved:
+                logging.error(
+                    f"Footprint for {component_id} already exists. Use --overwrite to"
+                    " replace"
+                )
+                return False
+            logging.info(
+                f"Created Kicad footprint for ID: {component_id}\n"
+                f"       Footprint name: {footprint['name']}\n"
+                f"       Footprint path: {footprint_path / footprint_filename}"
+            )
 
-        sym_svg_path = svg_dir / f"{component_id}_symbol.svg"
-        sym_svg = render_symbol_svg(cad_data)
-        sym_svg_path.write_text(sym_svg, encoding="utf-8")
-        logging.info(
-            f"Created SVG symbol for ID: {component_id}\n       Path: {sym_svg_path}"
-        )
+        if arguments["svg"]:
+            # ---------------- SVG ----------------
+            svg_dir = Path(f"{output}.svgs")
+            svg_dir.mkdir(parents=True, exist_ok=True)
 
-        fp_svg_path = svg_dir / f"{component_id}_footprint.svg"
-        fp_svg = render_footprint_svg(cad_data)
-        fp_svg_path.write_text(fp_svg, encoding="utf-8")
-        logging.info(
-            f"Created SVG footprint for ID: {component_id}\n       Path: {fp_svg_path}"
-        )
+            sym_svg_path = svg_dir / f"{component_id}_symbol.svg"
+            sym_svg = render_symbol_svg(cad_data)
+            sym_svg_path.write_text(sym_svg, encoding="utf-8")
+            logging.info(
+                f"Created SVG symbol for ID: {component_id}\n"
+                f"       Path: {sym_svg_path}"
+            )
 
-    if arguments["3d"]:
-        # ---------------- 3D MODEL ----------------
-        model_exporter = Exporter3dModelKicad(
-            model_3d=Easyeda3dModelImporter(
-                easyeda_cp_cad_data=cad_data,
-                download_raw_3d_model=True,
-                api=api,
-            ).output,
-        )
-        output_dir = Path(f"{output}.3dshapes")
-        if not model_exporter.output:
-            logging.warning(f"No 3D model available for ID: {component_id}")
-        elif not model_exporter.export(
-            output_dir=str(output_dir), overwrite=arguments["overwrite"]
-        ):
-            logging.error(
-                f"3D model for {component_id} already exists. Use --overwrite to replace"
+            fp_svg_path = svg_dir / f"{component_id}_footprint.svg"
+            fp_svg = render_footprint_svg(cad_data)
+            fp_svg_path.write_text(fp_svg, encoding="utf-8")
+            logging.info(
+                f"Created SVG footprint for ID: {component_id}\n"
+                f"       Path: {fp_svg_path}"
             )
-            return False
-        else:
+
+        if model_3d_task is not None:
+            # ---------------- 3D MODEL ----------------
+            model_exporter = Exporter3dModelKicad(
+                model_3d=model_3d_task.result(), conversions=conversions
+            )
+            output_dir = Path(f"{output}.3dshapes")
+            if not model_exporter.output:
+                logging.warning(f"No 3D model available for ID: {component_id}")
+                return True
+            with _LIBRARY_LOCK:
+                exported = model_exporter.export(
+                    output_dir=str(output_dir),
+                    overwrite=arguments["overwrite"],
+                    exported=exported_models,
+                )
+            if not exported:
+                logging.error(
+                    f"3D model for {component_id} already exists. Use --overwrite to"
+                    " replace"
+                )
+                return False
             model_name = model_exporter.output.name
             logging.info(
                 f"Created 3D model for ID: {component_id}\n"
@@ -323,21 +607,104 @@ def _process_component(
                 f"       3D model path (step): {output_dir / f'{model_name}.step'}"
             )
 
-    return True
+        return True
+    finally:
+        if model_3d_task is not None:
+            # Flush the log records of the downloads on every return path
+            model_3d_task.join()
 
 
-def main(argv: list[str] = sys.argv[1:]) -> int:
-    print(f"-- easyeda2kicad.py v{__version__} --")
+def _convert_symbol(
+    cad_data: dict[str, Any],
+    lib_version: int,
+    custom_fields: dict[str, str],
+    footprint_lib_name: str,
+    conversions: ConversionCache,
+) -> dict[str, Any]:
+    """Symbol block of a part: ``{"name", "content", "sub_symbols"}``."""
+    key = conversion_key(
+        CONVERTED_SYMBOL,
+        json.dumps(cad_data),
+        [lib_version, custom_fields, footprint_lib_name],
+    )
+    symbol = conversions.get(key)
+    if symbol is not None:
+        return symbol
+    easyeda_symbol: EeSymbol = EasyedaSymbolImporter(
+        easyeda_cp_cad_data=cad_data
+    ).get_symbol()
+    exporter = ExporterSymbolKicad(
+        symbol=easyeda_symbol, version=lib_version, custom_fields=custom_fields
+    )
+    symbol = {
+        "name": easyeda_symbol.info.name,
+        "content": exporter.export(footprint_lib_name=footprint_lib_name),
+        "sub_symbols": len(easyeda_symbol.sub_symbols),
+    }
+    conversions.put(key, symbol)
+    return symbol
 
-    # cli interface
-    parser = get_parser()
-    try:
-        args = parser.parse_args(argv)
-    except SystemExit as err:
-        return err.code if isinstance(err.code, int) else 1
-    arguments = vars(args)
 
-    log_level = logging.DEBUG if arguments["debug"] else logging.INFO
+def _convert_footprint(
+    cad_data: dict[str, Any], model_3d_path: str, conversions: ConversionCache
+) -> dict[str, Any]:
+    """.kicad_mod of a part: ``{"name", "content"}``."""
+    key = conversion_key(CONVERTED_FOOTPRINT, json.dumps(cad_data), model_3d_path)
+    footprint = conversions.get(key)
+    if footprint is not None:
+        return footprint
+    easyeda_footprint = EasyedaFootprintImporter(
+        easyeda_cp_cad_data=cad_data
+    ).get_footprint()
+    footprint = {
+        "name": easyeda_footprint.info.name,
+        "content": ExporterFootprintKicad(footprint=easyeda_footprint).generate(
+            model_3d_path=model_3d_path
+        ),
+    }
+    conversions.put(key, footprint)
+    return footprint
+
+
+def _import_3d_model(cad_data: dict[str, Any], api: EasyedaApi) -> Ee3dModel | None:
+    return Easyeda3dModelImporter(
+        easyeda_cp_cad_data=cad_data,
+        download_raw_3d_model=True,
+        api=api,
+        stream_step=True,
+    ).output
+
+
+def _process_components_parallel(
+    component_ids: list[str],
+    arguments: dict[str, Any],
+    api: EasyedaApi,
+    jobs: int,
+    exported_models: ExportedModels | None = None,
+) -> bool:
+    """Process components on a worker pool. Returns True if every component succeeded.
+
+    Each component's log output is buffered and replayed in input order, so the
+    console reads the same as a serial run.
+    """
+
+    def worker(component_id: str) -> tuple[bool, list[logging.LogRecord]]:
+        with deferred_logs() as records:
+            return (
+                _process_component(component_id, arguments, api, exported_models),
+                records,
+            )
+
+    all_ok = True
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for ok, records in executor.map(worker, component_ids):
+            replay_logs(records)
+            all_ok = all_ok and ok
+    return all_ok
+
+
+def setup_logging(debug: bool) -> None:
+    log_level = logging.DEBUG if debug else logging.INFO
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     if not root_logger.handlers:
@@ -348,17 +715,470 @@ def main(argv: list[str] = sys.argv[1:]) -> int:
         )
         root_logger.addHandler(handler)
 
+
+def get_prefetch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="easyeda2kicad prefetch",
+        description=(
+            "Download the component data, SVGs and 3D models of many parts into"
+            " the cache folder without converting them, so that later runs with"
+            " --use-cache need no network"
+        ),
+    )
+
+    parser.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help=(
+            "list of LCSC ids or CSV BOM with an LCSC column ('-' reads from"
+            " standard input)"
+        ),
+    )
+
+    parser.add_argument(
+        "--lcsc_id", help="LCSC id(s)", required=False, default=[], nargs="+"
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        dest="jobs",
+        help=(
+            "number of components fetched in parallel"
+            f" (default: {DEFAULT_PREFETCH_JOBS})"
+        ),
+        required=False,
+        default=DEFAULT_PREFETCH_JOBS,
+        type=int,
+        metavar="N",
+    )
+
+    parser.add_argument(
+        "--debug",
+        help="set the logging level to debug",
+        required=False,
+        default=False,
+        action="store_true",
+    )
+
+    add_cache_arguments(parser)
+
+    return parser
+
+
+def _collect_lcsc_ids(ids: list[str], files: list[str]) -> list[str] | None:
+    """LCSC ids given as options and listed in *files* ("-" for stdin).
+
+    Returns None after logging an error.
+    """
+    lcsc_ids: list[str] = []
+    for lcsc_id in ids:
+        if not lcsc_id.startswith("C"):
+            logging.error(f"lcsc_id '{lcsc_id}' should start with C")
+            return None
+        lcsc_ids.append(lcsc_id)
+    for file in files:
+        try:
+            if file == "-":
+                lcsc_ids.extend(read_lcsc_ids(sys.stdin))
+            else:
+                with open(file, encoding="utf-8-sig", newline="") as f:
+                    lcsc_ids.extend(read_lcsc_ids(f))
+        except OSError as err:
+            logging.error(f"Can't read {file}: {err}")
+            return None
+    return list(dict.fromkeys(lcsc_ids))
+
+
+def prefetch_main(argv: list[str]) -> int:
+    """``easyeda2kicad prefetch``: fill the cache for a list of parts."""
+    parser = get_prefetch_parser()
+    try:
+        arguments = vars(parser.parse_args(argv))
+    except SystemExit as err:
+        return err.code if isinstance(err.code, int) else 1
+    setup_logging(debug=arguments["debug"])
+
+    if arguments["jobs"] < 1:
+        logging.error(f"--jobs must be at least 1, got {arguments['jobs']}")
+        return 1
+    try:
+        parse_cache_arguments(arguments)
+    except ValueError as err:
+        logging.error(str(err))
+        return 1
+
+    lcsc_ids = _collect_lcsc_ids(arguments["lcsc_id"], arguments["files"])
+    if lcsc_ids is None:
+        return 1
+    if not lcsc_ids:
+        logging.error(
+            "No LCSC ids to prefetch\n"
+            "  easyeda2kicad prefetch bom.csv\n"
+            "  easyeda2kicad prefetch --lcsc_id C2040 C20197"
+        )
+        return 1
+
+    api = EasyedaApi(
+        use_cache=True,
+        revalidate=arguments["revalidate_cache"],
+        cache_backend=arguments["cache_backend"],
+        cache_ttls=arguments["cache_ttls"],
+        cache_max_size=arguments["cache_max_size"],
+        cache_bundles=arguments["cache_bundles"],
+        cache_dir=arguments["cache_dir"],
+    )
+
+    def progress(done: int, total: int, result: PrefetchResult) -> None:
+        if result.ok:
+            logging.info(f"[{done}/{total}] {result.lcsc_id}")
+        else:
+            logging.warning(
+                f"[{done}/{total}] {result.lcsc_id}: could not fetch"
+                f" {', '.join(result.missing)}"
+            )
+
+    try:
+        logging.info(f"Prefetching {len(lcsc_ids)} components into {api.cache_dir}")
+        results = prefetch_to_cache(
+            api, lcsc_ids, jobs=arguments["jobs"], progress=progress
+        )
+    finally:
+        api.close()
+
+    failed = [result for result in results if not result.ok]
+    logging.info(
+        f"Prefetched {len(results) - len(failed)}/{len(results)} components completely"
+    )
+    for result in failed:
+        logging.error(f"{result.lcsc_id}: missing {', '.join(result.missing)}")
+    return 1 if failed else 0
+
+
+def get_cache_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="easyeda2kicad cache",
+        description=(
+            f"Inspect and maintain the cache folder (./{CACHE_DIR_NAME} if it"
+            " exists, otherwise the user cache)"
+        ),
+    )
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--cache-backend",
+        dest="cache_backend",
+        help="storage format of the cache (default: detected from its files)",
+        required=False,
+        default=None,
+        choices=sorted(CACHE_BACKENDS),
+    )
+    add_cache_dir_argument(common)
+    common.add_argument(
+        "--debug",
+        help="set the logging level to debug",
+        required=False,
+        default=False,
+        action="store_true",
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    stats = commands.add_parser(
+        "stats",
+        parents=[common],
+        help="show entries and sizes per type and the hit rate of recent runs",
+    )
+    stats.add_argument(
+        "--runs",
+        help="number of recent runs to sum hits and misses over (default: 20)",
+        required=False,
+        default=20,
+        type=int,
+        metavar="N",
+    )
+
+    verify = commands.add_parser(
+        "verify",
+        parents=[common],
+        help="check that every entry is readable and holds valid JSON/OBJ/STEP",
+    )
+    verify.add_argument(
+        "--delete",
+        help="delete broken entries, so they are downloaded again",
+        required=False,
+        default=False,
+        action="store_true",
+    )
+
+    prune = commands.add_parser(
+        "prune", parents=[common], help="delete entries by age or total size"
+    )
+    prune.add_argument(
+        "--older-than",
+        dest="older_than",
+        help="delete entries not used for DAYS days",
+        required=False,
+        default=None,
+        type=float,
+        metavar="DAYS",
+    )
+    prune.add_argument(
+        "--max-size",
+        dest="max_size",
+        help=(
+            "then delete least recently used entries until the cache takes at"
+            " most SIZE (e.g. 500M, 2G)"
+        ),
+        required=False,
+        default=None,
+        metavar="SIZE",
+    )
+
+    commands.add_parser(
+        "compact",
+        parents=[common],
+        help=(
+            "rewrite the store without dead records and free space, remove"
+            " leftovers of interrupted runs"
+        ),
+    )
+
+    export = commands.add_parser(
+        "export",
+        parents=[common],
+        help=(
+            "pack the entries of a BOM (or the whole cache) into a bundle file"
+            " for --cache-bundle"
+        ),
+    )
+    export.add_argument("bundle", help="bundle file to write (zip)", metavar="BUNDLE")
+    export.add_argument(
+        "files",
+        nargs="*",
+        default=[],
+        metavar="FILE",
+        help="BOM (CSV with an LCSC column) or text files of LCSC ids, - for stdin",
+    )
+    export.add_argument(
+        "--lcsc_id",
+        help="LCSC ids to export, in addition to those of FILE",
+        nargs="+",
+        default=[],
+        type=str,
+    )
+
+    import_ = commands.add_parser(
+        "import", parents=[common], help="copy the entries of a bundle into the cache"
+    )
+    import_.add_argument("bundle", help="bundle file to read", metavar="BUNDLE")
+
+    return parser
+
+
+def _print_cache_stats(store: CacheStore, runs: int) -> None:
+    summary = summarize(store)
+    print(f"Cache: {store.root} ({store.name} backend)")
+    print(f"  {'type':<10} {'entries':>8} {'size':>11} {'on disk':>11}")
+    for rtype, totals in summary.items():
+        print(
+            f"  {rtype:<10} {totals.entries:>8} {format_size(totals.size):>11}"
+            f" {format_size(totals.stored):>11}"
+        )
+    print(
+        f"  {'total':<10} {sum(t.entries for t in summary.values()):>8}"
+        f" {format_size(sum(t.size for t in summary.values())):>11}"
+        f" {format_size(sum(t.stored for t in summary.values())):>11}"
+    )
+    print(f"Folder size: {format_size(disk_usage(store.root))}")
+
+    records = read_run_stats(store.root, runs)
+    if not records:
+        print("No runs recorded yet")
+        return
+    hits, misses = sum_run_stats(records)
+    lookups = sum(hits.values()) + sum(misses.values())
+    rate = 100 * sum(hits.values()) / lookups if lookups else 0.0
+    print(
+        f"Last {len(records)} run{'s' if len(records) != 1 else ''}:"
+        f" {sum(hits.values())} hits,"
+        f" {sum(misses.values())} misses ({rate:.1f}% served from cache)"
+    )
+    for rtype in sorted(hits.keys() | misses.keys()):
+        print(f"  {rtype:<10} {hits[rtype]:>8} hits {misses[rtype]:>8} misses")
+
+
+def _export_cache_bundle(store: CacheStore, arguments: dict[str, Any]) -> int:
+    lcsc_ids = _collect_lcsc_ids(arguments["lcsc_id"], arguments["files"])
+    if lcsc_ids is None:
+        return 1
+    if lcsc_ids:
+        keys, uncached = bundle_keys(store, lcsc_ids)
+        for lcsc_id in uncached:
+            logging.warning(
+                f"{lcsc_id} is not cached, run easyeda2kicad prefetch for it first"
+            )
+    else:
+        keys, uncached = store.keys(), []
+    bundle = Path(arguments["bundle"])
+    count = export_bundle(store, bundle, keys)
+    logging.info(
+        f"Exported {count} entries to {bundle} ({format_size(bundle.stat().st_size)})"
+    )
+    return 1 if uncached else 0
+
+
+def cache_main(argv: list[str]) -> int:
+    """``easyeda2kicad cache``: report on and maintain the cache folder."""
+    parser = get_cache_parser()
+    try:
+        arguments = vars(parser.parse_args(argv))
+    except SystemExit as err:
+        return err.code if isinstance(err.code, int) else 1
+    setup_logging(debug=arguments["debug"])
+
+    root = (
+        Path(arguments["cache_dir"]) if arguments["cache_dir"] else default_cache_dir()
+    )
+    command = arguments["command"]
+    if command != "import" and not root.is_dir():
+        logging.error(f"No cache found at {root}")
+        return 1
+    backend = arguments["cache_backend"] or detect_cache_backend(root)
+    store = open_cache_store(backend, root)
+    try:
+        if command == "stats":
+            _print_cache_stats(store, arguments["runs"])
+
+        elif command == "verify":
+            keys = store.keys()
+            problems = verify_cache(store, delete=arguments["delete"])
+            for key, problem in problems:
+                logging.warning(f"{key}: {problem}")
+            logging.info(
+                f"Checked {len(keys)} entries, {len(problems)} broken"
+                + (" (deleted)" if problems and arguments["delete"] else "")
+            )
+            if problems and not arguments["delete"]:
+                return 1
+
+        elif command == "prune":
+            if arguments["older_than"] is None and arguments["max_size"] is None:
+                logging.error("Nothing to prune: give --older-than and/or --max-size")
+                return 1
+            try:
+                max_size = (
+                    parse_size(arguments["max_size"])
+                    if arguments["max_size"] is not None
+                    else None
+                )
+            except ValueError as err:
+                logging.error(str(err))
+                return 1
+            older_than = arguments["older_than"]
+            removed = prune_cache(
+                store,
+                older_than=older_than * DAY if older_than is not None else None,
+                max_size=max_size,
+            )
+            logging.info(
+                f"Deleted {len(removed)} entries"
+                f" ({format_size(sum(info.stored for info in removed))})"
+            )
+
+        elif command == "compact":
+            before = disk_usage(root)
+            store.compact()
+            logging.info(
+                f"Compacted {root}: {format_size(before)}"
+                f" -> {format_size(disk_usage(root))}"
+            )
+
+        elif command == "export":
+            return _export_cache_bundle(store, arguments)
+
+        elif command == "import":
+            try:
+                bundle = BundleCacheStore(Path(arguments["bundle"]))
+            except ValueError as err:
+                logging.error(str(err))
+                return 1
+            try:
+                count = import_bundle(bundle, store)
+            finally:
+                bundle.close()
+            logging.info(f"Imported {count} entries into {root}")
+    finally:
+        store.close()
+    return 0
+
+
+def main(argv: list[str] = sys.argv[1:]) -> int:
+    print(f"-- easyeda2kicad.py v{__version__} --")
+
+    if argv[:1] == ["prefetch"]:
+        return prefetch_main(argv[1:])
+    if argv[:1] == ["cache"]:
+        return cache_main(argv[1:])
+
+    # cli interface
+    parser = get_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as err:
+        return err.code if isinstance(err.code, int) else 1
+    arguments = vars(args)
+    setup_logging(debug=arguments["debug"])
+
     if not valid_arguments(arguments=arguments):
         return 1
 
-    api = EasyedaApi(use_cache=arguments["use_cache"])
-    had_errors = False
+    api = EasyedaApi(
+        use_cache=arguments["use_cache"],
+        revalidate=arguments["revalidate_cache"],
+        cache_backend=arguments["cache_backend"],
+        cache_ttls=arguments["cache_ttls"],
+        cache_max_size=arguments["cache_max_size"],
+        cache_bundles=arguments["cache_bundles"],
+        cache_dir=arguments["cache_dir"],
+    )
+    try:
+        had_errors = False
+        component_ids: list[str] = arguments["lcsc_id"]
 
-    for component_id in arguments["lcsc_id"]:
-        if not _process_component(component_id, arguments, api):
-            had_errors = True
+        if len(component_ids) > 1:
+            # Check the whole list in bulk first: unknown ids are rejected in
+            # a few round-trips instead of one failing request each
+            unknown = set(api.find_unknown_components(component_ids))
+            for component_id in component_ids:
+                if component_id in unknown:
+                    logging.error(f"Unknown LCSC id {component_id}, skipping")
+            if unknown:
+                had_errors = True
+                component_ids = [i for i in component_ids if i not in unknown]
+
+        exported_models = ExportedModels()
+        if arguments["jobs"] > 1 and len(component_ids) > 1:
+            if not _process_components_parallel(
+                component_ids,
+                arguments,
+                api,
+                jobs=arguments["jobs"],
+                exported_models=exported_models,
+            ):
+                had_errors = True
+        else:
+            for component_id in component_ids:
+                if not _process_component(
+                    component_id, arguments, api, exported_models
+                ):
+                    had_errors = True
 
-    return 1 if had_errors else 0
+        return 1 if had_errors else 0
+    finally:
+        # Also on errors: pooled connections, cache handles and run statistics
+        api.close()
 
 
 if __name__ == "__main__":
@@ -4,11 +4,13 @@ EasyEDA module - Handle EasyEDA data import and processing
 
 # Local imports
 from .easyeda_api import EasyedaApi
+from .easyeda_api_async import AsyncEasyedaApi
 from .easyeda_importer import (
     Easyeda3dModelImporter,
     EasyedaFootprintImporter,
     EasyedaSymbolImporter,
 )
+from .easyeda_views import EasyedaFootprintView, EasyedaSymbolView
 from .parameters_easyeda import (
     EasyedaPinType,
     Ee3dModel,
@@ -27,10 +29,14 @@ from .parameters_easyeda import (
 __all__ = [
     # API
     "EasyedaApi",
+    "AsyncEasyedaApi",
     # Importers
     "EasyedaSymbolImporter",
     "EasyedaFootprintImporter",
     "Easyeda3dModelImporter",
+    # Lazy views
+    "EasyedaSymbolView",
+    "EasyedaFootprintView",
     # Data structures
     "EasyedaPinType",
     "EeSymbol",
@@ -0,0 +1,211 @@
+"""
+Background tasks whose log output is replayed by the thread that joins them
+
+Downloads are started on helper threads so they overlap with other work. Log
+records those threads emit are held back and handed to the logging system
+again when the result is collected, so console output keeps the order a
+sequential run would have (and ends up in the joining thread's own buffer
+when that one is deferred too, as with ``--jobs``).
+
+SingleFlight lets threads asking for the same resource share one call.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Generic, Hashable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class DeferredLogFilter(logging.Filter):
+    """Hold back log records emitted by threads that registered a buffer.
+
+    While a thread has a buffer registered, its records are collected instead
+    of being emitted so another thread can replay them later.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._local = threading.local()
+
+    def start(
+        self, records: list[logging.LogRecord] | None = None
+    ) -> list[logging.LogRecord]:
+        if records is None:
+            records = []
+        self._local.records = records
+        return records
+
+    def stop(self) -> None:
+        self._local.records = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        records: list[logging.LogRecord] | None = getattr(self._local, "records", None)
+        if records is None:
+            return True
+        # Every handler consults the filter, keep one copy per record
+        if not records or records[-1] is not record:
+            records.append(record)
+        return False
+
+
+_log_filter = DeferredLogFilter()
+_log_filter_users = 0
+_log_filter_lock = threading.Lock()
+_filtered_handlers: list[logging.Handler] = []
+
+
+def _attach_log_filter() -> None:
+    """Put the shared filter on the handlers records end up at.
+
+    Logger filters only see records logged on that logger itself, while the
+    root handlers also get those propagated from named loggers.
+    """
+    handlers = list(logging.getLogger().handlers)
+    if logging.lastResort is not None:
+        handlers.append(logging.lastResort)
+    for handler in handlers:
+        if handler not in _filtered_handlers:
+            handler.addFilter(_log_filter)
+            _filtered_handlers.append(handler)
+
+
+def _detach_log_filter() -> None:
+    for handler in _filtered_handlers:
+        handler.removeFilter(_log_filter)
+    _filtered_handlers.clear()
+
+
+@contextmanager
+def deferred_logs(
+    records: list[logging.LogRecord] | None = None,
+) -> Iterator[list[logging.LogRecord]]:
+    """Buffer the current thread's log records for the duration of the block.
+
+    Records are appended to ``records`` (a new list if omitted), which is
+    yielded.
+
+    The shared filter sits on the root handlers only while some thread uses
+    it; handlers added in the meantime get it when the next block starts.
+    """
+    global _log_filter_users
+    with _log_filter_lock:
+        _attach_log_filter()
+        _log_filter_users += 1
+    records = _log_filter.start(records)
+    try:
+        yield records
+    finally:
+        _log_filter.stop()
+        with _log_filter_lock:
+            _log_filter_users -= 1
+            if _log_filter_users == 0:
+                _detach_log_filter()
+
+
+def replay_logs(records: list[logging.LogRecord]) -> None:
+    """Emit buffered records from the calling thread."""
+    root_logger = logging.getLogger()
+    for record in records:
+        root_logger.handle(record)
+
+
+class BackgroundTask(Generic[T]):
+    """Handle on a call running in a helper thread."""
+
+    def __init__(self, future: Future[T], records: list[logging.LogRecord]) -> None:
+        self._future = future
+        self._records = records
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self) -> T:
+        """Wait for the call, replay its log records once and return its value."""
+        try:
+            return self._future.result()
+        finally:
+            records, self._records = self._records, []
+            replay_logs(records)
+
+    def join(self) -> None:
+        """Wait for the call and replay its log records if result() did not.
+
+        An exception of the call is left to result(), so this is safe in a
+        ``finally`` block.
+        """
+        wait([self._future])
+        records, self._records = self._records, []
+        replay_logs(records)
+
+
+def run_in_background(
+    fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> BackgroundTask[T]:
+    """Start ``fn(*args, **kwargs)`` on a helper thread.
+
+    Exceptions are re-raised by ``BackgroundTask.result``.
+    """
+
+    records: list[logging.LogRecord] = []
+
+    def run() -> T:
+        with deferred_logs(records):
+            return fn(*args, **kwargs)
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="easyeda2kicad")
+    try:
+        return BackgroundTask(executor.submit(run), records)
+    finally:
+        # The thread finishes the task and exits on its own
+        executor.shutdown(wait=False)
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce calls for the same key into one execution.
+
+    While a call for a key is running, other callers of ``do`` with that key
+    wait for it and get its result (or exception). The last ``max_results``
+    non-None results are also kept, so later requests for a key are served
+    without calling again; failures (None) are never remembered.
+    """
+
+    def __init__(self, max_results: int = 0) -> None:
+        self.max_results = max_results
+        self._calls: dict[Hashable, Future[T]] = {}
+        self._results: OrderedDict[Hashable, T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            value = fn()
+        except BaseException as err:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(err)
+            raise
+        with self._lock:
+            del self._calls[key]
+            if value is not None and self.max_results > 0:
+                self._results[key] = value
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+        future.set_result(value)
+        return value
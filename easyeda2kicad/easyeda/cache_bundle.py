@@ -0,0 +1,135 @@
+"""
+Cache bundles: the cache entries of a BOM in one archive, for offline runs
+
+``export_bundle`` packs entries of a cache into a zip file: one deflated
+member per cache key plus an index member holding the bundle format and the
+metadata (validators) of every entry. easyeda_cache.BundleCacheStore reads
+such a file as a read-only tier behind the cache folder (EasyedaApi
+``cache_bundles``), so a machine without network access converts from the
+bundle alone; ``import_bundle`` copies its entries into a cache instead.
+
+``bundle_keys`` lists the keys a set of LCSC ids needs: component data, SVG
+previews, OBJ/STEP models of their 3D model and the negative entries of any
+of these.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any
+
+# Local imports
+from .._version import __version__
+from .easyeda_cache import (
+    _COPY_CHUNK_SIZE,
+    BUNDLE_FORMAT,
+    BUNDLE_INDEX,
+    MISSING_SUFFIX,
+    BundleCacheStore,
+    CacheStore,
+    resource_type,
+)
+from .easyeda_importer import Easyeda3dModelImporter
+
+
+def _model_uuid(data: bytes) -> str | None:
+    """3D model uuid of a cached component response, if it has one."""
+    try:
+        cad_data = json.loads(data)["result"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(cad_data, dict):
+        return None
+    model = Easyeda3dModelImporter(
+        easyeda_cp_cad_data=cad_data, download_raw_3d_model=False
+    ).output
+    return model.uuid if model is not None else None
+
+
+def bundle_keys(store: CacheStore, lcsc_ids: list[str]) -> tuple[list[str], list[str]]:
+    """Keys of *store* that conversions of *lcsc_ids* read.
+
+    Returns the keys and the ids whose component data is not cached (run
+    ``easyeda2kicad prefetch`` for them first).
+    """
+    keys: list[str] = []
+    uncached: list[str] = []
+    for lcsc_id in dict.fromkeys(lcsc_ids):
+        names = [f"{lcsc_id}.json", f"{lcsc_id}_svg.json"]
+        data = store.read(f"{lcsc_id}.json")
+        if data is None and not store.exists(f"{lcsc_id}.json{MISSING_SUFFIX}"):
+            uncached.append(lcsc_id)
+        uuid = _model_uuid(data) if data is not None else None
+        if uuid is not None:
+            safe_uuid = uuid.replace("/", "_").replace("\\", "_")
+            names += [f"{safe_uuid}.obj", f"{safe_uuid}.step"]
+        for name in names:
+            for key in (name, name + MISSING_SUFFIX):
+                if store.exists(key):
+                    keys.append(key)
+    return list(dict.fromkeys(keys)), uncached
+
+
+def export_bundle(store: CacheStore, path: Path, keys: list[str]) -> int:
+    """Write the entries *keys* of *store* to the bundle *path*.
+
+    The file is replaced atomically. Returns the number of entries written;
+    keys that vanish meanwhile are skipped.
+    """
+    entries: dict[str, dict[str, Any]] = {}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zf:
+                for key in keys:
+                    src = store.peek(key)
+                    if src is None:
+                        continue
+                    with src, zf.open(key, "w", force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+                    entries[key] = {
+                        "type": resource_type(key),
+                        "meta": store.read_meta(key),
+                    }
+                index = {
+                    "format": BUNDLE_FORMAT,
+                    "created": time.time(),
+                    "version": __version__,
+                    "entries": entries,
+                }
+                zf.writestr(BUNDLE_INDEX, json.dumps(index, indent=1))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return len(entries)
+
+
+def import_bundle(bundle: BundleCacheStore, store: CacheStore) -> int:
+    """Copy every entry of *bundle* into *store*; returns the number copied."""
+    count = 0
+    for key in bundle.keys():
+        src = bundle.open(key)
+        if src is None:
+            continue
+        staging = store.staging_path(key)
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        with src, open(staging, "wb") as f:
+            shutil.copyfileobj(src, f, _COPY_CHUNK_SIZE)
+        try:
+            store.put_file(key, staging, meta=bundle.read_meta(key) or None)
+        finally:
+            if store.local_file(key) != staging:
+                staging.unlink(missing_ok=True)
+        count += 1
+    return count
@@ -0,0 +1,149 @@
+"""
+Inspection and upkeep of a cache folder (``easyeda2kicad cache``)
+
+Works on any CacheStore: summarise the entries per resource type, check that
+entries are readable and hold what their type promises, prune them by age or
+size and compact the store.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Local imports
+from .easyeda_cache import CacheEntryInfo, CacheStore, resource_type
+
+STEP_MAGIC = b"ISO-10303-21;"
+# Bytes of a STEP entry read to check its header
+_STEP_HEAD_SIZE = 1024
+
+
+@dataclass
+class TypeSummary:
+    entries: int = 0
+    size: int = 0
+    stored: int = 0
+
+
+def summarize(store: CacheStore) -> dict[str, TypeSummary]:
+    """Entry count and sizes of *store* per resource type."""
+    summary: dict[str, TypeSummary] = {}
+    for info in store.entries():
+        totals = summary.setdefault(resource_type(info.key), TypeSummary())
+        totals.entries += 1
+        totals.size += info.size
+        totals.stored += info.stored
+    return dict(sorted(summary.items()))
+
+
+def sum_run_stats(
+    records: list[dict[str, Any]],
+) -> tuple[Counter[str], Counter[str]]:
+    """Hits and misses per resource type over records of read_run_stats."""
+    hits: Counter[str] = Counter()
+    misses: Counter[str] = Counter()
+    for record in records:
+        for counter, field in ((hits, "hits"), (misses, "misses")):
+            counts = record.get(field)
+            if not isinstance(counts, dict):
+                continue
+            for rtype, count in counts.items():
+                if isinstance(count, int):
+                    counter[rtype] += count
+    return hits, misses
+
+
+def disk_usage(root: Path) -> int:
+    """Bytes taken by every file below *root*."""
+    if not root.is_dir():
+        return 0
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def check_content(key: str, data: bytes) -> str | None:
+    """What is wrong with *data* as the payload of *key*, if anything.
+
+    Only the first bytes of STEP models need to be passed.
+    """
+    rtype = resource_type(key)
+    if rtype in ("component", "svg", "missing"):
+        try:
+            value = json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return "invalid JSON"
+        if not isinstance(value, dict):
+            return "JSON is not an object"
+        if rtype == "component" and not isinstance(value.get("result"), dict):
+            return "no component data"
+        if rtype == "missing" and "at" not in value:
+            return "negative entry without date"
+    elif rtype == "obj":
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return "OBJ model is not text"
+        if not any(line.startswith("v ") for line in text.splitlines()):
+            return "OBJ model without vertices"
+    elif rtype == "step":
+        if not data.lstrip().startswith(STEP_MAGIC):
+            return "not a STEP file"
+    return None
+
+
+def verify_entry(store: CacheStore, key: str) -> str | None:
+    """Check that *key* can be read in full and that its payload is valid."""
+    problem = store.verify(key)
+    if problem is not None:
+        return problem
+    f = store.peek(key)
+    if f is None:
+        return "entry is gone"
+    with f:
+        data = f.read(_STEP_HEAD_SIZE) if resource_type(key) == "step" else f.read()
+    return check_content(key, data)
+
+
+def verify_cache(store: CacheStore, delete: bool = False) -> list[tuple[str, str]]:
+    """Check every entry of *store*; returns ``(key, problem)`` pairs.
+
+    With *delete*, broken entries are removed so they are downloaded again.
+    """
+    problems = []
+    for key in store.keys():
+        problem = verify_entry(store, key)
+        if problem is None:
+            continue
+        problems.append((key, problem))
+        if delete:
+            store.delete(key)
+    return problems
+
+
+def prune_cache(
+    store: CacheStore,
+    older_than: float | None = None,
+    max_size: int | None = None,
+) -> list[CacheEntryInfo]:
+    """Delete entries not used for *older_than* seconds, then the least
+    recently used ones until the rest takes at most *max_size* bytes on disk.
+
+    Returns the deleted entries.
+    """
+    entries = sorted(store.entries(), key=lambda info: info.used_at)
+    usage = sum(info.stored for info in entries)
+    cutoff = time.time() - older_than if older_than is not None else None
+    removed = []
+    for info in entries:
+        too_old = cutoff is not None and info.used_at < cutoff
+        if not too_old and (max_size is None or usage <= max_size):
+            continue
+        store.delete(info.key)
+        usage -= info.stored
+        removed.append(info)
+    return removed
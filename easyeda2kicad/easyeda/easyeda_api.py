@@ -3,19 +3,44 @@ from __future__ import annotations
 # Global imports
 import glob  # noqa: F401  # used inside sys.platform=="darwin" block
 import gzip
+import http.client
+import contextlib
 import json
 import logging
+import os
 import re
+import shutil
 import ssl
 import sys
+import tempfile
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from collections import Counter
 from pathlib import Path
 from types import ModuleType
-from typing import Any
+from typing import Any, ContextManager
 
 # Local imports
+from .background import SingleFlight
+from .easyeda_cache import (
+    MISSING_SUFFIX,
+    BundleCacheStore,
+    CacheStore,
+    LayeredCacheStore,
+    MemoryCache,
+    default_cache_dir,
+    detect_cache_backend,
+    open_cache_store,
+    record_run_stats,
+    resource_type,
+    user_cache_dir,
+)
+from .http_pool import ConnectionPool, build_keep_alive_opener, call_when_closed
+from .request_scheduler import IDEMPOTENT_METHODS, RequestScheduler
+
 try:
     from .._version import __version__
 except ImportError:
@@ -46,14 +71,52 @@ ENDPOINT_V2_DEVICE = "/api/v2/devices/{uuid}"  # requires auth
 ENDPOINT_V2_DEVICE_SEARCH_BY_IDS = "/api/devices/searchByIds"  # requires auth
 ENDPOINT_V2_DOCUMENT_DATASTR = "/api/documents/{uuid}/datastrid"  # requires auth
 
+# Response headers kept next to cache entries to revalidate them later
+CACHE_VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+# Statuses meaning the resource does not exist, remembered as negative entries
+MISSING_STATUSES = frozenset({404, 410})
+
+# Streaming downloads: read size and how often a broken transfer is resumed
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_MAX_RESUMES = 3
+
+# Parsed OBJ models kept in memory for parts that share a 3D model uuid
+OBJ_MEMO_SIZE = 32
+
+# Parsed component responses kept in memory in front of the disk cache,
+# bounded by count and by the size of the JSON they were parsed from
+MEMORY_CACHE_ENTRIES = 256
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+# Number of LCSC ids checked per searchByNumbers request by find_unknown_components
+SEARCH_BY_NUMBERS_CHUNK_SIZE = 50
+
 # JLCPCB component search returns lcsc, name, package, stock, price
 JLCPCB_SEARCH_API = "https://jlcpcb.com/api/overseas-pcb-order/v1/shoppingCart/smtGood/selectSmtComponentList"
+JLCPCB_SEARCH_HEADERS = {
+    "Content-Type": "application/json",
+    "Origin": "https://jlcpcb.com",
+    "Referer": "https://jlcpcb.com/parts",
+}
 
 # ------------------------------------------------------------
 
 
 class EasyedaApi:
-    def __init__(self, use_cache: bool = False) -> None:
+    def __init__(
+        self,
+        use_cache: bool = False,
+        scheduler: RequestScheduler | None = None,
+        revalidate: bool = False,
+        cache_backend: str | None = None,
+        cache_ttls: dict[str, float | None] | None = None,
+        cache_max_size: int | None = None,
+        cache_bundles: list[Path] | None = None,
+        cache_dir: Path | None = None,
+        memory_cache_entries: int = MEMORY_CACHE_ENTRIES,
+        memory_cache_bytes: int = MEMORY_CACHE_BYTES,
+    ) -> None:
         self.headers = {
             "Accept-Encoding": "gzip, deflate",
             "Accept": "application/json, text/javascript, */*; q=0.01",
@@ -62,24 +125,186 @@ class EasyedaApi:
             "Referer": "https://easyeda.com/",
         }
         self.ssl_context = self._create_ssl_context()
-        self.cache_dir = Path.cwd() / ".easyeda_cache"
+        # Cache folder new entries are written to; by default the project
+        # cache if the working directory has one, otherwise the user cache
+        self.cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        # Cache shared by all projects, looked up after cache_dir (None: not used)
+        self.shared_cache_dir: Path | None = user_cache_dir()
         self.use_cache = use_cache
+        # Storage format of cache_dir, see easyeda_cache.CACHE_BACKENDS
+        # (None: detected from the files already there)
+        self.cache_backend = cache_backend
+        # Per-resource-type expiry in seconds, for backends that support it
+        self.cache_ttls = cache_ttls
+        # Size budget in bytes, enforced by LRU eviction after writes
+        self.cache_max_size = cache_max_size
+        # Read-only cache bundles looked up after cache_dir, see cache_bundle.py
+        self.cache_bundles = list(cache_bundles or [])
+        # Hot component responses, so repeated lookups skip disk and parsing
+        self.memory_cache: MemoryCache[dict[str, Any]] = MemoryCache(
+            memory_cache_entries, memory_cache_bytes
+        )
+        self._cache_store: CacheStore | None = None
+        self._cache_layout: tuple[Any, ...] = ()
+        self._cache_store_lock = threading.Lock()
+        # Cache lookups per resource type, logged to the cache folder by close()
+        self.cache_hits: Counter[str] = Counter()
+        self.cache_misses: Counter[str] = Counter()
+        # Check cached component data with the server (If-None-Match /
+        # If-Modified-Since) instead of trusting it forever
+        self.revalidate = revalidate
+        # Persistent connections per host, shared by every call on this instance
+        self.connection_pool = ConnectionPool()
+        self._opener = build_keep_alive_opener(
+            self.connection_pool, context=self.ssl_context
+        )
+        # Rate limit, adaptive concurrency and retries, per host
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        # Scratch folder for streamed downloads that are not plain cache files
+        self._download_dir: Path | None = None
+        self._download_lock = threading.Lock()
+        # Many parts share one 3D model: requests for the same uuid are
+        # coalesced into a single download
+        self._obj_flight: SingleFlight[str | None] = SingleFlight(OBJ_MEMO_SIZE)
+        self._step_flight: SingleFlight[bytes | None] = SingleFlight()
+        self._step_file_flight: SingleFlight[Path | None] = SingleFlight()
+
+    def _urlopen(
+        self, req: urllib.request.Request, timeout: float
+    ) -> http.client.HTTPResponse:
+        """Send *req* over a pooled keep-alive connection.
+
+        Behaves like urllib.request.urlopen: redirects are followed, HTTP error
+        statuses raise urllib.error.HTTPError and transport errors URLError.
+        Throttling, transient 5xx answers and timeouts of idempotent requests
+        are retried by ``self.scheduler`` before an error is raised. The
+        request counts against the host's concurrency limit until the
+        response is closed.
+        """
+
+        def send() -> http.client.HTTPResponse:
+            response: http.client.HTTPResponse = self._opener.open(  # noqa: S310
+                req, timeout=timeout
+            )
+            return response
+
+        return self.scheduler.call(
+            req.full_url,
+            send,
+            idempotent=req.get_method() in IDEMPOTENT_METHODS,
+            hold=call_when_closed,
+        )
+
+    def close(self) -> None:
+        """Close pooled connections and the cache, remove streamed scratch files.
+
+        The cache hits and misses of this run are added to the cache's run
+        statistics.
+        """
+        self.connection_pool.close()
+        with self._cache_store_lock:
+            hits, self.cache_hits = self.cache_hits, Counter()
+            misses, self.cache_misses = self.cache_misses, Counter()
+        if self.use_cache and (hits or misses):
+            try:
+                record_run_stats(self.cache_dir, dict(hits), dict(misses))
+            except OSError as e:
+                logging.debug(f"Could not record cache statistics: {e}")
+        with self._cache_store_lock:
+            if self._cache_store is not None:
+                self._cache_store.close()
+        with self._download_lock:
+            download_dir, self._download_dir = self._download_dir, None
+        if download_dir is not None:
+            shutil.rmtree(download_dir, ignore_errors=True)
+
+    @property
+    def cache_store(self) -> CacheStore:
+        """Backend holding cache_dir, reopened when cache_dir is reassigned.
+
+        Entries missing from cache_dir are looked up in shared_cache_dir,
+        then in the cache_bundles; new entries always go to cache_dir.
+        """
+        with self._cache_store_lock:
+            store = self._cache_store
+            layout = (
+                self.cache_dir,
+                self.cache_backend,
+                self.shared_cache_dir,
+                tuple(self.cache_bundles),
+            )
+            if store is None or layout != self._cache_layout:
+                if store is not None:
+                    store.close()
+                store = open_cache_store(
+                    self.cache_backend or detect_cache_backend(self.cache_dir),
+                    self.cache_dir,
+                    self.cache_ttls,
+                    self.cache_max_size,
+                )
+                tiers: list[CacheStore] = [
+                    BundleCacheStore(path) for path in self.cache_bundles
+                ]
+                shared = self.shared_cache_dir
+                if (
+                    shared is not None
+                    and shared.is_dir()
+                    and shared.resolve() != self.cache_dir.resolve()
+                ):
+                    tiers.insert(
+                        0,
+                        open_cache_store(
+                            detect_cache_backend(shared), shared, self.cache_ttls
+                        ),
+                    )
+                if tiers:
+                    store = LayeredCacheStore(store, tiers)
+                self._cache_store = store
+                self._cache_layout = layout
+            return store
 
     def _get_cache_path(self, identifier: str, extension: str) -> Path:
-        """Get the cache file path for a specific resource."""
+        """Get the cache file path for a specific resource.
+
+        Its file name is the key of the resource in ``cache_store``.
+        """
         safe_id = identifier.replace("/", "_").replace("\\", "_")
         return self.cache_dir / f"{safe_id}.{extension}"
 
+    def _cache_lock(self, cache_path: Path) -> ContextManager[None]:
+        """Hold the cache entry of *cache_path* across processes.
+
+        Taken around downloads on a cache miss, so that runs sharing the cache
+        folder wait for each other instead of fetching the same resource.
+        """
+        if not self.use_cache:
+            return contextlib.nullcontext()
+        return self.cache_store.lock(cache_path.name)
+
+    def count_cache_lookup(self, key: str, hit: bool) -> None:
+        """Count a cache hit, or a miss (a resource about to be downloaded or
+        converted)."""
+        if not self.use_cache:
+            return
+        counter = self.cache_hits if hit else self.cache_misses
+        with self._cache_store_lock:
+            counter[resource_type(key)] += 1
+
+    def _in_cache(self, cache_path: Path) -> bool:
+        return self.use_cache and self.cache_store.exists(cache_path.name)
+
     def _read_from_cache(
         self, cache_path: Path, binary: bool = False
     ) -> str | bytes | None:
         """Read data from cache if it exists."""
-        if not self.use_cache or not cache_path.exists():
+        if not self.use_cache:
             return None
         try:
-            mode = "rb" if binary else "r"
-            with open(cache_path, mode) as f:
-                data: str | bytes = f.read()
+            raw = self.cache_store.read(cache_path.name)
+            if raw is None:
+                return None
+            self.count_cache_lookup(cache_path.name, hit=True)
+            data: str | bytes = raw if binary else raw.decode("utf-8")
             logging.debug(f"Cache hit: {cache_path}")
             return data
         except Exception as e:
@@ -87,34 +312,88 @@ class EasyedaApi:
             return None
 
     def _write_to_cache(
-        self, cache_path: Path, data: str | bytes, binary: bool = False
+        self,
+        cache_path: Path,
+        data: str | bytes,
+        binary: bool = False,
+        validators: dict[str, str] | None = None,
     ) -> None:
-        """Write data to cache."""
+        """Write data to cache.
+
+        ``validators`` (ETag/Last-Modified of the response) are stored with
+        the entry; without them any previous metadata is dropped so it can
+        never describe a different body.
+        """
         if not self.use_cache:
             return
         try:
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # For JSON files, pretty-print with indentation
-            if not binary and cache_path.suffix == ".json":
-                try:
-                    # Try to parse as JSON and write with indentation
-                    json_data = json.loads(data) if isinstance(data, str) else data
-                    with open(cache_path, "w") as f:
-                        json.dump(json_data, f, indent=2, ensure_ascii=False)
-                    logging.debug(f"Cached (formatted): {cache_path}")
-                    return
-                except (json.JSONDecodeError, TypeError):
-                    # If not valid JSON, fall back to normal write
-                    pass
-
-            mode = "wb" if binary else "w"
-            with open(cache_path, mode) as f:
-                f.write(data)
+            raw = data.encode("utf-8") if isinstance(data, str) else data
+            self.cache_store.write(cache_path.name, raw, meta=validators)
             logging.debug(f"Cached: {cache_path}")
         except Exception as e:
             logging.warning(f"Failed to write cache {cache_path}: {e}")
 
+    def _remember_missing(self, cache_path: Path, reason: str) -> None:
+        """Store a negative entry: the server has nothing for *cache_path*.
+
+        Negative entries expire after the "missing" TTL of the cache, after
+        which the resource is requested again.
+        """
+        if not self.use_cache:
+            return
+        record = {"reason": reason, "at": time.time()}
+        try:
+            self.cache_store.write(
+                cache_path.name + MISSING_SUFFIX, json.dumps(record).encode()
+            )
+        except Exception as e:
+            logging.warning(f"Failed to write cache {cache_path}{MISSING_SUFFIX}: {e}")
+
+    def _known_missing(self, cache_path: Path) -> bool:
+        """Whether a negative entry younger than its TTL exists."""
+        if not self.use_cache:
+            return False
+        store = self.cache_store
+        data = store.read(cache_path.name + MISSING_SUFFIX)
+        if data is None:
+            return False
+        try:
+            record = json.loads(data)
+            age = time.time() - float(record["at"])
+        except (ValueError, KeyError, TypeError):
+            return False
+        ttl = store.ttls.get("missing")
+        if ttl is not None and age > ttl:
+            return False
+        self.count_cache_lookup(cache_path.name + MISSING_SUFFIX, hit=True)
+        logging.debug(f"Known missing: {cache_path.name} ({record.get('reason')})")
+        return True
+
+    def _read_validators(self, cache_path: Path) -> dict[str, str]:
+        """Return the validators stored for a cache entry (empty if none)."""
+        return self.cache_store.read_meta(cache_path.name)
+
+    @staticmethod
+    def _conditional_headers(validators: dict[str, str]) -> dict[str, str]:
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return headers
+
+    @staticmethod
+    def _response_validators(response: Any) -> dict[str, str]:
+        headers = getattr(response, "headers", None)
+        if headers is None:
+            return {}
+        validators = {}
+        for name in CACHE_VALIDATOR_HEADERS:
+            value = headers.get(name)
+            if isinstance(value, str) and value:
+                validators[name] = value
+        return validators
+
     @staticmethod
     def _decode_response(raw: bytes) -> str:
         """Decompress gzip if needed and decode bytes to UTF-8 string."""
@@ -161,27 +440,80 @@ class EasyedaApi:
         logging.debug("Using system default SSL certificates")
         return context
 
+    def _cached_component(self, lcsc_id: str) -> dict[str, Any] | None:
+        """Parsed component response from the memory or disk cache."""
+        if not self.use_cache:
+            return None
+        cached = self.memory_cache.get(lcsc_id)
+        if cached is not None:
+            self.count_cache_lookup(f"{lcsc_id}.json", hit=True)
+            return cached
+        cached_data = self._read_from_cache(self._get_cache_path(lcsc_id, "json"))
+        if cached_data is None:
+            return None
+        try:
+            cached = json.loads(cached_data)
+        except json.JSONDecodeError:
+            logging.warning(f"Invalid cached JSON for {lcsc_id}, fetching fresh data")
+            return None
+        if not isinstance(cached, dict):
+            return None
+        self.memory_cache.put(lcsc_id, cached, len(cached_data), self._component_ttl())
+        return cached
+
+    def _component_ttl(self) -> float | None:
+        """Lifetime of component data in the memory cache: the TTL the disk
+        cache gives it, so a long-running process does not keep serving a
+        part after its disk copy would have expired."""
+        return self.cache_store.ttls.get("component")
+
+    def _store_component(
+        self,
+        lcsc_id: str,
+        data: str,
+        api_response: dict[str, Any],
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        if not self.use_cache:
+            return
+        self._write_to_cache(
+            self._get_cache_path(lcsc_id, "json"), data, validators=validators
+        )
+        self.memory_cache.put(lcsc_id, api_response, len(data), self._component_ttl())
+
     def get_info_from_easyeda_api(self, lcsc_id: str) -> dict[str, Any]:
+        return self._get_info(lcsc_id)
+
+    def _get_info(self, lcsc_id: str, locked: bool = False) -> dict[str, Any]:
         # Try to read from cache first
         cache_path = self._get_cache_path(lcsc_id, "json")
-        cached_data = self._read_from_cache(cache_path, binary=False)
-        if cached_data is not None:
-            try:
-                cached: dict[str, Any] = json.loads(cached_data)
-                return cached
-            except json.JSONDecodeError:
-                logging.warning(
-                    f"Invalid cached JSON for {lcsc_id}, fetching fresh data"
-                )
+        cached = self._cached_component(lcsc_id)
+        if cached is not None and not self.revalidate:
+            return cached
+
+        if cached is None and self._known_missing(cache_path):
+            return {}
+        if cached is None and not locked:
+            # Another process may be fetching it: check again once it is done
+            with self._cache_lock(cache_path):
+                return self._get_info(lcsc_id, locked=True)
+        if cached is None:
+            self.count_cache_lookup(cache_path.name, hit=False)
+
+        headers = self.headers
+        if cached is not None:
+            headers = {
+                **headers,
+                **self._conditional_headers(self._read_validators(cache_path)),
+            }
 
         try:
             req = urllib.request.Request(  # noqa: S310
-                url=API_ENDPOINT.format(lcsc_id=lcsc_id), headers=self.headers
+                url=API_ENDPOINT.format(lcsc_id=lcsc_id), headers=headers
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=30, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=30) as response:
                 data = self._decode_response(response.read())
+                validators = self._response_validators(response)
                 try:
                     api_response: dict[str, Any] = json.loads(data)
                 except json.JSONDecodeError as e:
@@ -190,13 +522,27 @@ class EasyedaApi:
 
             if not api_response or api_response.get("success") is False:
                 logging.debug(f"{api_response}")
+                self._remember_missing(cache_path, "success: false")
                 return {}
 
             # Write to cache
-            self._write_to_cache(cache_path, data, binary=False)
+            self._store_component(lcsc_id, data, api_response, validators)
 
             return api_response
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                logging.debug(f"Cache revalidated: {cache_path}")
+                return cached
+            if e.code in MISSING_STATUSES:
+                self._remember_missing(cache_path, f"HTTP {e.code}")
+            logging.error(f"API request failed: {e}")
+            return {}
         except (urllib.error.URLError, json.JSONDecodeError) as e:
+            if cached is not None:
+                logging.warning(
+                    f"Could not revalidate {lcsc_id} ({e}), using cached data"
+                )
+                return cached
             logging.error(f"API request failed: {e}")
             return {}
 
@@ -208,6 +554,9 @@ class EasyedaApi:
         return result
 
     def get_raw_3d_model_obj(self, uuid: str) -> str | None:
+        return self._obj_flight.do(uuid, lambda: self._fetch_raw_3d_model_obj(uuid))
+
+    def _fetch_raw_3d_model_obj(self, uuid: str, locked: bool = False) -> str | None:
         # Try to read from cache first
         cache_path = self._get_cache_path(uuid, "obj")
         cached_data = self._read_from_cache(cache_path, binary=False)
@@ -215,15 +564,19 @@ class EasyedaApi:
             if not isinstance(cached_data, str):
                 return None
             return cached_data
+        if self._known_missing(cache_path):
+            return None
+        if not locked:
+            with self._cache_lock(cache_path):
+                return self._fetch_raw_3d_model_obj(uuid, locked=True)
+        self.count_cache_lookup(cache_path.name, hit=False)
 
         try:
             req = urllib.request.Request(  # noqa: S310
                 url=ENDPOINT_3D_MODEL.format(uuid=uuid),
                 headers={"User-Agent": self.headers["User-Agent"]},
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=30, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=30) as response:
                 if response.status != 200:
                     logging.error(
                         f"No raw 3D model data found for uuid:{uuid} on easyeda"
@@ -234,10 +587,15 @@ class EasyedaApi:
                 self._write_to_cache(cache_path, data, binary=False)
                 return data
         except urllib.error.URLError as e:
+            if isinstance(e, urllib.error.HTTPError) and e.code in MISSING_STATUSES:
+                self._remember_missing(cache_path, f"HTTP {e.code}")
             logging.error(f"Failed to get 3D model for uuid:{uuid}: {e}")
             return None
 
     def get_step_3d_model(self, uuid: str) -> bytes | None:
+        return self._step_flight.do(uuid, lambda: self._fetch_step_3d_model(uuid))
+
+    def _fetch_step_3d_model(self, uuid: str, locked: bool = False) -> bytes | None:
         # Try to read from cache first
         cache_path = self._get_cache_path(uuid, "step")
         cached_data = self._read_from_cache(cache_path, binary=True)
@@ -245,15 +603,19 @@ class EasyedaApi:
             if not isinstance(cached_data, bytes):
                 return None
             return cached_data
+        if self._known_missing(cache_path):
+            return None
+        if not locked:
+            with self._cache_lock(cache_path):
+                return self._fetch_step_3d_model(uuid, locked=True)
+        self.count_cache_lookup(cache_path.name, hit=False)
 
         try:
             req = urllib.request.Request(  # noqa: S310
                 url=ENDPOINT_3D_MODEL_STEP.format(uuid=uuid),
                 headers={"User-Agent": self.headers["User-Agent"]},
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=30, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=30) as response:
                 if response.status != 200:
                     logging.error(
                         f"No step 3D model data found for uuid:{uuid} on easyeda"
@@ -264,9 +626,160 @@ class EasyedaApi:
                 self._write_to_cache(cache_path, data, binary=True)
                 return data
         except urllib.error.URLError as e:
+            if isinstance(e, urllib.error.HTTPError) and e.code in MISSING_STATUSES:
+                self._remember_missing(cache_path, f"HTTP {e.code}")
             logging.error(f"Failed to get STEP model for uuid:{uuid}: {e}")
             return None
 
+    def download_step_3d_model(self, uuid: str) -> Path | None:
+        """Stream the STEP model of *uuid* to disk and return the file path.
+
+        Unlike get_step_3d_model the model never sits in memory: chunks go
+        straight into the cache entry (or, without cache, a scratch file that
+        lives until close()). A broken transfer is resumed with an HTTP Range
+        request, also across runs when caching is on.
+        """
+        return self._step_file_flight.do(
+            uuid, lambda: self._download_step_3d_model(uuid)
+        )
+
+    def _download_step_3d_model(self, uuid: str, locked: bool = False) -> Path | None:
+        cache_path = self._get_cache_path(uuid, "step")
+        key = cache_path.name
+        url = ENDPOINT_3D_MODEL_STEP.format(uuid=uuid)
+        if not self.use_cache:
+            dest = self._scratch_path(key)
+            try:
+                if dest.exists() or self._download_to_file(url, dest):
+                    return dest
+            except urllib.error.HTTPError as e:
+                logging.debug(f"Download of {url} failed: {e}")
+            logging.error(f"Failed to get STEP model for uuid:{uuid}")
+            return None
+
+        store = self.cache_store
+        local = store.local_file(key)
+        if local is not None and local.exists():
+            logging.debug(f"Cache hit: {local}")
+            self.count_cache_lookup(key, hit=True)
+            return local
+        if local is None and store.exists(key):
+            # Stored in a packed form: unpack a plain copy for the exporter
+            dest = self._scratch_path(key)
+            src = store.open(key)
+            if src is not None:
+                with src, open(dest, "wb") as f:
+                    shutil.copyfileobj(src, f, DOWNLOAD_CHUNK_SIZE)
+                logging.debug(f"Cache hit: {key}")
+                self.count_cache_lookup(key, hit=True)
+                return dest
+
+        if self._known_missing(cache_path):
+            return None
+        if not locked:
+            with self._cache_lock(cache_path):
+                return self._download_step_3d_model(uuid, locked=True)
+        self.count_cache_lookup(key, hit=False)
+
+        staging = store.staging_path(key)
+        try:
+            downloaded = self._download_to_file(url, staging)
+        except urllib.error.HTTPError as e:
+            logging.debug(f"Download of {url} failed: {e}")
+            self._remember_missing(cache_path, f"HTTP {e.code}")
+            downloaded = False
+        if not downloaded:
+            logging.error(f"Failed to get STEP model for uuid:{uuid}")
+            return None
+        store.put_file(key, staging)
+        local = store.local_file(key)
+        if local is not None:
+            if local != staging:
+                staging.unlink(missing_ok=True)
+            return local
+        dest = self._scratch_path(key)
+        shutil.move(str(staging), dest)
+        return dest
+
+    def _scratch_path(self, name: str) -> Path:
+        """Path in the per-instance scratch folder removed by close()."""
+        with self._download_lock:
+            if self._download_dir is None:
+                self._download_dir = Path(tempfile.mkdtemp(prefix="easyeda2kicad-"))
+            return self._download_dir / name
+
+    def _download_to_file(self, url: str, dest: Path) -> bool:
+        """Copy the body of *url* chunk by chunk into *dest*.
+
+        Data lands in ``<dest>.part`` first and is renamed once complete. When
+        the connection breaks, the download continues from the bytes already
+        on disk with a ``Range`` request (restarting if the server ignores it).
+        Raises HTTPError if the server reports that *url* does not exist.
+        """
+        part_path = dest.with_name(f"{dest.name}.part")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        for attempt in range(DOWNLOAD_MAX_RESUMES + 1):
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            headers = {"User-Agent": self.headers["User-Agent"]}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            req = urllib.request.Request(url=url, headers=headers)  # noqa: S310
+            try:
+                with self._urlopen(req, timeout=30) as response:
+                    if response.status == 206:
+                        mode = "ab"
+                    elif response.status == 200:
+                        mode, offset = "wb", 0
+                    else:
+                        logging.error(f"Unexpected status {response.status} for {url}")
+                        return False
+                    expected = self._expected_size(response, offset)
+                    with open(part_path, mode) as f:
+                        while chunk := response.read(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                        f.flush()
+                        os.fsync(f.fileno())
+            except urllib.error.HTTPError as e:
+                if e.code == 416:
+                    # Our partial file does not fit the remote one: start over
+                    part_path.unlink(missing_ok=True)
+                    continue
+                if e.code in MISSING_STATUSES:
+                    raise
+                logging.error(f"Download of {url} failed: {e}")
+                return False
+            except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
+                logging.warning(
+                    f"Download of {url} interrupted ({e!r}),"
+                    f" resuming ({attempt + 1}/{DOWNLOAD_MAX_RESUMES})"
+                )
+                continue
+
+            size = part_path.stat().st_size
+            if expected is not None and size < expected:
+                logging.warning(
+                    f"Download of {url} stopped at {size}/{expected} bytes, resuming"
+                )
+                continue
+            os.replace(part_path, dest)
+            logging.debug(f"Downloaded {size} bytes to {dest}")
+            return True
+        return False
+
+    @staticmethod
+    def _expected_size(response: http.client.HTTPResponse, offset: int) -> int | None:
+        """Total size of the remote file if the response tells it."""
+        content_range = response.headers.get("Content-Range", "")
+        if "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            if total.isdigit():
+                return int(total)
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            return offset + int(length)
+        return None
+
     # ------------------------------------------------------------------
     # EasyEDA Pro v2 API helpers
     # ------------------------------------------------------------------
@@ -276,9 +789,7 @@ class EasyedaApi:
         url = base + path
         try:
             req = urllib.request.Request(url=url, headers=self.headers)  # noqa: S310
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=30, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=30) as response:
                 result: dict[str, Any] = json.loads(
                     self._decode_response(response.read())
                 )
@@ -307,9 +818,7 @@ class EasyedaApi:
                     "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
                 },
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=30, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=30) as response:
                 result: dict[str, Any] = json.loads(
                     self._decode_response(response.read())
                 )
@@ -318,6 +827,69 @@ class EasyedaApi:
             logging.error(f"searchByNumbers failed: {e}")
             return {}
 
+    def find_unknown_components(
+        self, lcsc_ids: list[str], chunk_size: int = SEARCH_BY_NUMBERS_CHUNK_SIZE
+    ) -> list[str]:
+        """Check many LCSC ids with chunked searchByNumbers requests.
+
+        searchByNumbers only maps each id to a component UUID, so this is an
+        id-validity check: component data is still fetched per component.
+        Returns the ids an answer maps to no UUID, or that a negative cache
+        entry still marks as unknown. Ids already in the cache are not sent.
+        The check never writes negative entries itself, and a chunk whose
+        answer cannot be interpreted rejects nothing, so a failing bulk
+        lookup never turns valid parts into errors.
+        """
+        pending = list(dict.fromkeys(lcsc_ids))
+        unknown: list[str] = []
+        if self.use_cache:
+            pending = [
+                lcsc_id
+                for lcsc_id in pending
+                if not self._in_cache(self._get_cache_path(lcsc_id, "json"))
+            ]
+            unknown = [
+                lcsc_id
+                for lcsc_id in pending
+                if self._known_missing(self._get_cache_path(lcsc_id, "json"))
+            ]
+            pending = [lcsc_id for lcsc_id in pending if lcsc_id not in unknown]
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            uuids = self._parse_search_by_numbers(
+                self.search_v2_component_uuids_by_lcsc(chunk)
+            )
+            if uuids is None:
+                logging.debug(
+                    f"searchByNumbers gave no usable answer for {len(chunk)} ids,"
+                    " leaving them to per-component requests"
+                )
+                continue
+            # Ids the answer leaves out are not known to be unknown
+            unknown += [i for i in chunk if i in uuids and not uuids[i]]
+        return unknown
+
+    @staticmethod
+    def _parse_search_by_numbers(response: dict[str, Any]) -> dict[str, str] | None:
+        """UUID of each LCSC id in a searchByNumbers answer
+        (``{"result": {"C1591": "<uuid>"}}``), "" for ids it maps to none.
+
+        Returns None when the answer is missing, failed, empty or not a
+        mapping of ids.
+        """
+        if not response or response.get("success") is False:
+            return None
+        result = response.get("result")
+        if not isinstance(result, dict) or not result:
+            return None
+        uuids: dict[str, str] = {}
+        for lcsc_id, uuid in result.items():
+            if uuid and not isinstance(uuid, str):
+                return None
+            uuids[lcsc_id] = uuid or ""
+        return uuids
+
     def search_jlcpcb_components(
         self,
         keyword: str,
@@ -332,33 +904,36 @@ class EasyedaApi:
         price_breaks, min_qty, reel_qty, description, url, datasheet, attributes.
         part_type: "base" = Basic, "expand" = Extended.
         """
-        payload: dict[str, Any] = {
-            "keyword": keyword,
-            "currentPage": page,
-            "pageSize": page_size,
-        }
-        if part_type:
-            payload["componentLibraryType"] = part_type
-
         try:
             req = urllib.request.Request(  # noqa: S310
                 url=JLCPCB_SEARCH_API,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={
-                    **self.headers,
-                    "Content-Type": "application/json",
-                    "Origin": "https://jlcpcb.com",
-                    "Referer": "https://jlcpcb.com/parts",
-                },
+                data=self._jlcpcb_search_body(keyword, page, page_size, part_type),
+                headers={**self.headers, **JLCPCB_SEARCH_HEADERS},
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=15, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=15) as response:
                 raw: dict[str, Any] = json.loads(self._decode_response(response.read()))
         except (urllib.error.URLError, json.JSONDecodeError) as e:
             logging.error(f"JLCPCB search failed: {e}")
             return {"total": 0, "results": []}
 
+        return self._parse_jlcpcb_search(raw)
+
+    @staticmethod
+    def _jlcpcb_search_body(
+        keyword: str, page: int, page_size: int, part_type: str | None
+    ) -> bytes:
+        payload: dict[str, Any] = {
+            "keyword": keyword,
+            "currentPage": page,
+            "pageSize": page_size,
+        }
+        if part_type:
+            payload["componentLibraryType"] = part_type
+        return json.dumps(payload).encode("utf-8")
+
+    @staticmethod
+    def _parse_jlcpcb_search(raw: dict[str, Any]) -> dict[str, Any]:
+        """Flatten a raw JLCPCB search response into ``{"total", "results"}``."""
         page_info: dict[str, Any] = (raw.get("data") or {}).get(
             "componentPageInfo"
         ) or {}
@@ -417,31 +992,40 @@ class EasyedaApi:
                 return result
             except json.JSONDecodeError:
                 pass
+        if self._known_missing(cache_path):
+            return {"symbol": "", "footprint": ""}
+        self.count_cache_lookup(cache_path.name, hit=False)
 
         try:
             req = urllib.request.Request(  # noqa: S310
                 url=ENDPOINT_SVG.format(lcsc_id=lcsc_id),
                 headers=self.headers,
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=15, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=15) as response:
                 raw = self._decode_response(response.read())
                 data: dict[str, Any] = json.loads(raw)
         except (urllib.error.URLError, json.JSONDecodeError) as e:
+            if isinstance(e, urllib.error.HTTPError) and e.code in MISSING_STATUSES:
+                self._remember_missing(cache_path, f"HTTP {e.code}")
             logging.error(f"get_svg_from_api failed for {lcsc_id}: {e}")
             return {"symbol": "", "footprint": ""}
 
         entries: list[dict[str, Any]] = data.get("result") or []
         if not entries:
+            self._remember_missing(cache_path, "no SVG entries")
             return {"symbol": "", "footprint": ""}
 
+        result = self._svgs_from_entries(entries)
+        self._write_to_cache(cache_path, json.dumps(result), binary=False)
+        return result
+
+    @staticmethod
+    def _svgs_from_entries(entries: list[dict[str, Any]]) -> dict[str, Any]:
+        """Pick the first symbol unit and the footprint out of /svgs entries."""
         # Last entry = footprint, all earlier entries = symbol units
         symbol_svg: str = entries[0].get("svg", "") if len(entries) >= 2 else ""
         footprint_svg: str = entries[-1].get("svg", "") if len(entries) >= 1 else ""
-        result = {"symbol": symbol_svg, "footprint": footprint_svg}
-        self._write_to_cache(cache_path, json.dumps(result), binary=False)
-        return result
+        return {"symbol": symbol_svg, "footprint": footprint_svg}
 
     def get_product_image_url(self, lcsc_url: str) -> str | None:
         """Fetch the 900x900 product image URL for an LCSC product page.
@@ -469,9 +1053,7 @@ class EasyedaApi:
                     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                 },
             )
-            with urllib.request.urlopen(  # noqa: S310
-                req, timeout=10, context=self.ssl_context
-            ) as response:
+            with self._urlopen(req, timeout=10) as response:
                 html = self._decode_response(response.read())
         except (urllib.error.URLError, OSError) as e:
             logging.error(f"Failed to fetch LCSC product page: {e}")
@@ -0,0 +1,443 @@
+"""
+Asyncio counterpart of EasyedaApi
+
+AsyncEasyedaApi exposes the same getters as EasyedaApi as coroutines, so a
+service running an event loop can fetch hundreds of components concurrently
+from a single thread. HTTP is spoken directly over asyncio streams (standard
+library only); caching is delegated to a regular EasyedaApi instance so both
+clients share one cache and its semantics.
+
+Proxies configured through HTTPS_PROXY are not used by this client.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import asyncio
+import http.client
+import json
+import logging
+import urllib.error
+import urllib.parse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Local imports
+from .easyeda_api import (
+    API_BASE_LEGACY,
+    API_ENDPOINT,
+    CACHE_VALIDATOR_HEADERS,
+    ENDPOINT_3D_MODEL,
+    ENDPOINT_3D_MODEL_STEP,
+    ENDPOINT_SVG,
+    ENDPOINT_V2_SEARCH_BY_NUMBERS,
+    JLCPCB_SEARCH_API,
+    MISSING_STATUSES,
+    JLCPCB_SEARCH_HEADERS,
+    EasyedaApi,
+)
+from .request_scheduler import IDEMPOTENT_METHODS
+
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+@dataclass
+class AsyncResponse:
+    status: int
+    reason: str
+    url: str
+    # Header names are lower-cased
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+class AsyncEasyedaApi:
+    """Non-blocking EasyEDA/JLCPCB client with bounded concurrency.
+
+    At most ``max_concurrency`` requests are in flight at once and each one is
+    cancelled after ``timeout`` seconds. Transport failures raise URLError and
+    HTTP error statuses HTTPError internally, and every public getter reports
+    them the same way EasyedaApi does (log + empty result).
+    """
+
+    def __init__(
+        self,
+        use_cache: bool = False,
+        max_concurrency: int = 16,
+        timeout: float = 30.0,
+        api: EasyedaApi | None = None,
+    ) -> None:
+        self.api = api if api is not None else EasyedaApi(use_cache=use_cache)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        # Created on first use so it binds to the loop that actually runs us
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return self.api.headers
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes | None = None,
+        timeout: float | None = None,
+    ) -> AsyncResponse:
+        """Send one request (following redirects) within the concurrency limit.
+
+        Retries and rate limiting are handled by the wrapped EasyedaApi's
+        scheduler.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        semaphore = self._semaphore
+        limit = self.timeout if timeout is None else timeout
+
+        async def send() -> AsyncResponse:
+            async with semaphore:
+                try:
+                    response = await asyncio.wait_for(
+                        self._follow_redirects(method, url, headers, data), limit
+                    )
+                except asyncio.TimeoutError as err:
+                    raise urllib.error.URLError(f"timed out after {limit}s") from err
+            if response.status >= 400:
+                message = http.client.HTTPMessage()
+                for name, value in response.headers.items():
+                    message[name] = value
+                raise urllib.error.HTTPError(
+                    response.url, response.status, response.reason, message, None
+                )
+            return response
+
+        # Same rate limit and retry policy as the blocking client it wraps
+        return await self.api.scheduler.call_async(
+            url, send, idempotent=method in IDEMPOTENT_METHODS
+        )
+
+    async def _follow_redirects(
+        self, method: str, url: str, headers: dict[str, str], data: bytes | None
+    ) -> AsyncResponse:
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = await self._send(method, url, headers, data)
+            location = response.headers.get("location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+            url = urllib.parse.urljoin(url, location)
+            if response.status in (301, 302, 303) and method == "POST":
+                method, data = "GET", None
+        raise urllib.error.URLError(f"too many redirects for {url}")
+
+    async def _send(
+        self, method: str, url: str, headers: dict[str, str], data: bytes | None
+    ) -> AsyncResponse:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise urllib.error.URLError(f"unsupported URL: {url}")
+        is_https = parts.scheme == "https"
+        port = parts.port or (443 if is_https else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append("Connection: close")
+        if data is not None:
+            lines.append(f"Content-Length: {len(data)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (data or b"")
+
+        try:
+            reader, writer = await asyncio.open_connection(
+                parts.hostname,
+                port,
+                ssl=self.api.ssl_context if is_https else None,
+                server_hostname=parts.hostname if is_https else None,
+            )
+        except OSError as err:
+            raise urllib.error.URLError(err) from err
+        try:
+            writer.write(request)
+            await writer.drain()
+            return await self._read_response(reader, url)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as err:
+            raise urllib.error.URLError(err) from err
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, url: str) -> AsyncResponse:
+        status_line = (await reader.readline()).decode("latin-1").strip()
+        version, _, rest = status_line.partition(" ")
+        if not version.startswith("HTTP/"):
+            raise ValueError(f"malformed status line: {status_line!r}")
+        code, _, reason = rest.partition(" ")
+
+        headers: dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Skip optional trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+
+        return AsyncResponse(
+            status=int(code), reason=reason, url=url, headers=headers, body=body
+        )
+
+    # ------------------------------------------------------------------
+    # Cache helpers (run in a thread so disk I/O never blocks the loop)
+    # ------------------------------------------------------------------
+
+    async def _read_cache(self, identifier: str, extension: str) -> str | bytes | None:
+        cache_path = self.api._get_cache_path(identifier, extension)
+        return await asyncio.to_thread(
+            self.api._read_from_cache, cache_path, extension == "step"
+        )
+
+    async def _remember_if_missing(
+        self, error: urllib.error.URLError, cache_path: Path
+    ) -> None:
+        """Store a negative entry when *error* says the resource does not exist."""
+        if isinstance(error, urllib.error.HTTPError) and error.code in MISSING_STATUSES:
+            await asyncio.to_thread(
+                self.api._remember_missing, cache_path, f"HTTP {error.code}"
+            )
+
+    async def _write_cache(
+        self, identifier: str, extension: str, data: str | bytes
+    ) -> None:
+        cache_path = self.api._get_cache_path(identifier, extension)
+        await asyncio.to_thread(
+            self.api._write_to_cache, cache_path, data, isinstance(data, bytes)
+        )
+
+    # ------------------------------------------------------------------
+    # Public getters — same contract as EasyedaApi
+    # ------------------------------------------------------------------
+
+    async def get_info_from_easyeda_api(self, lcsc_id: str) -> dict[str, Any]:
+        """Component data, looked up in the same order as EasyedaApi does."""
+        api = self.api
+        cache_path = api._get_cache_path(lcsc_id, "json")
+        cached = await asyncio.to_thread(api._cached_component, lcsc_id)
+        if cached is not None and not api.revalidate:
+            return cached
+        if cached is None:
+            if await asyncio.to_thread(api._known_missing, cache_path):
+                return {}
+            api.count_cache_lookup(cache_path.name, hit=False)
+
+        headers = self.headers
+        if cached is not None:
+            validators = await asyncio.to_thread(api._read_validators, cache_path)
+            headers = {**headers, **api._conditional_headers(validators)}
+
+        try:
+            response = await self._request(
+                "GET", API_ENDPOINT.format(lcsc_id=lcsc_id), headers
+            )
+            if response.status == 304 and cached is not None:
+                logging.debug(f"Cache revalidated: {cache_path}")
+                return cached
+            data = api._decode_response(response.body)
+            api_response: dict[str, Any] = json.loads(data)
+        except urllib.error.URLError as e:
+            if isinstance(e, urllib.error.HTTPError):
+                await self._remember_if_missing(e, cache_path)
+            elif cached is not None:
+                logging.warning(
+                    f"Could not revalidate {lcsc_id} ({e}), using cached data"
+                )
+                return cached
+            logging.error(f"API request failed: {e}")
+            return {}
+        except json.JSONDecodeError as e:
+            logging.error(f"Invalid JSON response from API: {e}")
+            return {}
+
+        if not api_response or api_response.get("success") is False:
+            logging.debug(f"{api_response}")
+            await asyncio.to_thread(api._remember_missing, cache_path, "success: false")
+            return {}
+
+        validators = {
+            name: response.headers[name.lower()]
+            for name in CACHE_VALIDATOR_HEADERS
+            if response.headers.get(name.lower())
+        }
+        await asyncio.to_thread(
+            api._store_component, lcsc_id, data, api_response, validators
+        )
+        return api_response
+
+    async def get_cad_data_of_component(self, lcsc_id: str) -> dict[str, Any]:
+        cp_cad_info = await self.get_info_from_easyeda_api(lcsc_id=lcsc_id)
+        if not cp_cad_info:
+            return {}
+        result: dict[str, Any] = cp_cad_info["result"]
+        return result
+
+    async def get_raw_3d_model_obj(self, uuid: str) -> str | None:
+        cached_data = await self._read_cache(uuid, "obj")
+        if cached_data is not None:
+            return cached_data if isinstance(cached_data, str) else None
+        cache_path = self.api._get_cache_path(uuid, "obj")
+        if await asyncio.to_thread(self.api._known_missing, cache_path):
+            return None
+
+        try:
+            response = await self._request(
+                "GET",
+                ENDPOINT_3D_MODEL.format(uuid=uuid),
+                {"User-Agent": self.headers["User-Agent"]},
+            )
+        except urllib.error.URLError as e:
+            await self._remember_if_missing(e, cache_path)
+            logging.error(f"Failed to get 3D model for uuid:{uuid}: {e}")
+            return None
+        if response.status != 200:
+            logging.error(f"No raw 3D model data found for uuid:{uuid} on easyeda")
+            return None
+        data = self.api._decode_response(response.body)
+        await self._write_cache(uuid, "obj", data)
+        return data
+
+    async def get_step_3d_model(self, uuid: str) -> bytes | None:
+        cached_data = await self._read_cache(uuid, "step")
+        if cached_data is not None:
+            return cached_data if isinstance(cached_data, bytes) else None
+        cache_path = self.api._get_cache_path(uuid, "step")
+        if await asyncio.to_thread(self.api._known_missing, cache_path):
+            return None
+
+        try:
+            response = await self._request(
+                "GET",
+                ENDPOINT_3D_MODEL_STEP.format(uuid=uuid),
+                {"User-Agent": self.headers["User-Agent"]},
+            )
+        except urllib.error.URLError as e:
+            await self._remember_if_missing(e, cache_path)
+            logging.error(f"Failed to get STEP model for uuid:{uuid}: {e}")
+            return None
+        if response.status != 200:
+            logging.error(f"No step 3D model data found for uuid:{uuid} on easyeda")
+            return None
+        await self._write_cache(uuid, "step", response.body)
+        return response.body
+
+    async def search_v2_component_uuids_by_lcsc(
+        self, lcsc_numbers: list[str]
+    ) -> dict[str, Any]:
+        """POST /api/components/searchByNumbers — see EasyedaApi."""
+        params = urllib.parse.urlencode({"numbers": json.dumps(lcsc_numbers)})
+        try:
+            response = await self._request(
+                "POST",
+                API_BASE_LEGACY + ENDPOINT_V2_SEARCH_BY_NUMBERS,
+                {
+                    **self.headers,
+                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+                },
+                data=params.encode("utf-8"),
+            )
+            result: dict[str, Any] = json.loads(
+                self.api._decode_response(response.body)
+            )
+            return result
+        except (urllib.error.URLError, json.JSONDecodeError) as e:
+            logging.error(f"searchByNumbers failed: {e}")
+            return {}
+
+    async def search_jlcpcb_components(
+        self,
+        keyword: str,
+        page: int = 1,
+        page_size: int = 10,
+        part_type: str | None = None,
+    ) -> dict[str, Any]:
+        """Keyword search across the JLCPCB parts library — see EasyedaApi."""
+        try:
+            response = await self._request(
+                "POST",
+                JLCPCB_SEARCH_API,
+                {**self.headers, **JLCPCB_SEARCH_HEADERS},
+                data=EasyedaApi._jlcpcb_search_body(
+                    keyword, page, page_size, part_type
+                ),
+                timeout=min(self.timeout, 15),
+            )
+            raw: dict[str, Any] = json.loads(self.api._decode_response(response.body))
+        except (urllib.error.URLError, json.JSONDecodeError) as e:
+            logging.error(f"JLCPCB search failed: {e}")
+            return {"total": 0, "results": []}
+        return EasyedaApi._parse_jlcpcb_search(raw)
+
+    async def get_svg_from_api(self, lcsc_id: str) -> dict[str, Any]:
+        """Pre-rendered symbol/footprint SVGs — see EasyedaApi."""
+        cached_data = await self._read_cache(f"{lcsc_id}_svg", "json")
+        if cached_data is not None:
+            try:
+                result: dict[str, Any] = json.loads(cached_data)
+                return result
+            except json.JSONDecodeError:
+                pass
+        cache_path = self.api._get_cache_path(f"{lcsc_id}_svg", "json")
+        if await asyncio.to_thread(self.api._known_missing, cache_path):
+            return {"symbol": "", "footprint": ""}
+
+        try:
+            response = await self._request(
+                "GET",
+                ENDPOINT_SVG.format(lcsc_id=lcsc_id),
+                self.headers,
+                timeout=min(self.timeout, 15),
+            )
+            data: dict[str, Any] = json.loads(self.api._decode_response(response.body))
+        except (urllib.error.URLError, json.JSONDecodeError) as e:
+            if isinstance(e, urllib.error.URLError):
+                await self._remember_if_missing(e, cache_path)
+            logging.error(f"get_svg_from_api failed for {lcsc_id}: {e}")
+            return {"symbol": "", "footprint": ""}
+
+        entries: list[dict[str, Any]] = data.get("result") or []
+        if not entries:
+            await asyncio.to_thread(
+                self.api._remember_missing, cache_path, "no SVG entries"
+            )
+            return {"symbol": "", "footprint": ""}
+
+        result = EasyedaApi._svgs_from_entries(entries)
+        await self._write_cache(f"{lcsc_id}_svg", "json", json.dumps(result))
+        return result
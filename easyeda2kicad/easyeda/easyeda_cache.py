@@ -0,0 +1,1533 @@
+"""
+Storage backends for the cache folders
+
+A cache folder is either the project cache (.easyeda_cache in the working
+directory) or the user cache shared by all projects (user_cache_dir).
+
+Every cached resource is addressed by a key, the file name the original cache
+layout used for it (``C2040.json``, ``<uuid>.obj``, ``<uuid>.step``, ...).
+Backends only move bytes; EasyedaApi decides what to cache and how to decode
+it.
+
+- ``files``: one plain file per key, JSON pretty-printed (the original layout)
+- ``cas``: gzip-compressed objects named by the SHA-256 of their content plus
+  an append-only index mapping keys to hashes. Identical payloads are stored
+  once, and entries of the original layout are still read when a key is not
+  in the index.
+- ``sqlite``: a single SQLite database (WAL mode, so several processes can
+  share it) whose entries expire after a per-resource-type TTL.
+- ``bundle``: a read-only zip archive of entries (see cache_bundle.py), read
+  through a memory map without extracting it.
+
+LayeredCacheStore puts read-only tiers, such as bundles, behind a writable
+backend. MemoryCache is the in-process LRU EasyedaApi keeps in front of them.
+
+Several processes may share a cache folder: files are replaced atomically
+(written to a temporary file, fsynced and renamed), and ``CacheStore.lock``
+takes an advisory per-key file lock so a resource is downloaded only once.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import gzip
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import sys
+import time
+import zipfile
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, ContextManager, Generic, Iterator, TypeVar, cast
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+T = TypeVar("T")
+
+# Folder name of a project cache, in the working directory
+CACHE_DIR_NAME = ".easyeda_cache"
+# Environment variable overriding the location of the user cache
+CACHE_DIR_ENV = "EASYEDA2KICAD_CACHE_DIR"
+# Folder of the user cache below the platform's cache directory
+USER_CACHE_NAME = "easyeda2kicad"
+
+CAS_INDEX_FILE = "index.jsonl"
+CAS_OBJECTS_DIR = "objects"
+CAS_INDEX_LOCK = "index.lock"
+# Partial downloads and objects being written
+STAGING_DIR = "tmp"
+# Lock files of the per-key advisory locks
+LOCKS_DIR = "locks"
+
+SQLITE_DB_FILE = "cache.sqlite3"
+# 3D model payloads of the sqlite backend, kept as files beside the database
+SQLITE_FILES_DIR = "files"
+SQLITE_FILE_TYPES = ("obj", "step")
+
+# Hit/miss counts of past runs, one JSON record per line
+STATS_FILE = "stats.jsonl"
+# Runs kept in STATS_FILE by compaction
+RUN_STATS_KEPT = 100
+
+DAY = 24 * 3600
+# Leftovers of interrupted writes and downloads older than this are removed
+# by compaction; younger ones may belong to a run still in progress
+STALE_AGE = DAY
+# Seconds an entry of the sqlite backend stays valid, None meaning forever.
+# 3D models are addressed by uuid and never change, component data does.
+DEFAULT_CACHE_TTLS: dict[str, float | None] = {
+    "component": 30 * DAY,
+    "svg": 30 * DAY,
+    "obj": None,
+    "step": None,
+    # Negative entries: parts or models the server reported as missing
+    "missing": DAY,
+    # Generated KiCad outputs, keyed by a hash of their inputs
+    "converted": None,
+    "other": 30 * DAY,
+}
+
+# Index member of a cache bundle (see cache_bundle.py), and its layout version
+BUNDLE_INDEX = "easyeda2kicad-bundle.json"
+BUNDLE_FORMAT = 1
+
+# Suffix of negative entries, e.g. ``C2040.json.missing``
+MISSING_SUFFIX = ".missing"
+
+# With a size budget, eviction frees space down to this fraction of it
+EVICTION_TARGET = 0.9
+
+_COPY_CHUNK_SIZE = 64 * 1024
+_GZIP_LEVEL = 6
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace *path* with *data* so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def copy_atomic(src: Path, path: Path) -> None:
+    """Replace *path* with a copy of *src*, chunk by chunk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f, open(src, "rb") as fin:
+            shutil.copyfileobj(fin, f, _COPY_CHUNK_SIZE)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on *path* (created if needed).
+
+    The lock is held per open file, so it also serialises threads of one
+    process. Lock files are left in place: removing them could let two
+    holders lock different files of the same name.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            while True:
+                try:
+                    # LK_LOCK gives up after 10 one-second retries
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _is_stale(path: Path) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime > STALE_AGE
+    except FileNotFoundError:
+        return False
+
+
+def user_cache_dir() -> Path:
+    """Cache shared by every project of the user.
+
+    $EASYEDA2KICAD_CACHE_DIR if set (e.g. a folder shared by all users of a
+    build machine), otherwise easyeda2kicad in the platform's cache directory:
+    $XDG_CACHE_HOME or ~/.cache, ~/Library/Caches on macOS and %LOCALAPPDATA%
+    on Windows.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA")
+        base = Path(local) if local else Path.home() / "AppData" / "Local"
+        return base / USER_CACHE_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / USER_CACHE_NAME
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg and Path(xdg).is_absolute() else Path.home() / ".cache"
+    return base / USER_CACHE_NAME
+
+
+def project_cache_dir() -> Path:
+    """Cache of the project in the working directory."""
+    return Path.cwd() / CACHE_DIR_NAME
+
+
+def default_cache_dir() -> Path:
+    """Where new entries go: the project cache if the working directory has
+    one (a .easyeda_cache folder), otherwise the user cache."""
+    project = project_cache_dir()
+    return project if project.is_dir() else user_cache_dir()
+
+
+def record_run_stats(root: Path, hits: dict[str, int], misses: dict[str, int]) -> None:
+    """Append the cache hits and misses of one run, per resource type."""
+    record = {"at": time.time(), "hits": hits, "misses": misses}
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / STATS_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def read_run_stats(root: Path, last: int = RUN_STATS_KEPT) -> list[dict[str, Any]]:
+    """Records written by record_run_stats for the *last* runs, oldest first."""
+    try:
+        with open(root / STATS_FILE, encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records[-last:] if last > 0 else []
+
+
+@dataclass
+class CacheEntryInfo:
+    key: str
+    # Payload bytes
+    size: int
+    # Bytes on disk (compressed; an object shared by several keys is split
+    # evenly between them)
+    stored: int
+    # Last write or read (as far as the backend tracks reads), epoch seconds
+    used_at: float
+
+
+class CacheStore(ABC):
+    """Interface shared by the cache backends.
+
+    Backends implement the abstract methods; the others have defaults.
+
+    ``meta`` holds small string fields stored with an entry (e.g. the
+    ETag/Last-Modified validators); writing an entry replaces its meta.
+    ``ttls`` overrides DEFAULT_CACHE_TTLS for backends that expire entries,
+    ``max_size`` is a size budget in bytes for backends that evict entries.
+    """
+
+    name = ""
+
+    def __init__(
+        self,
+        root: Path,
+        ttls: dict[str, float | None] | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.root = root
+        self.ttls = dict(DEFAULT_CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_size = max_size
+
+    @abstractmethod
+    def read(self, key: str) -> bytes | None:
+        """Payload of *key*, or None if missing."""
+
+    @abstractmethod
+    def write(self, key: str, data: bytes, meta: dict[str, str] | None = None) -> None:
+        """Store *data* under *key*, replacing the entry and its meta."""
+
+    @abstractmethod
+    def read_meta(self, key: str) -> dict[str, str]:
+        """Meta stored with *key* (empty if none)."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether *key* has a live entry."""
+
+    @abstractmethod
+    def open(self, key: str) -> IO[bytes] | None:
+        """Open an entry for streamed reading, or return None if missing."""
+
+    @abstractmethod
+    def put_file(self, key: str, src: Path, meta: dict[str, str] | None = None) -> None:
+        """Store the content of *src* under *key* without loading it at once."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove *key* if present."""
+
+    @abstractmethod
+    def keys(self) -> list[str]:
+        """Keys of every live entry."""
+
+    def local_file(self, key: str) -> Path | None:
+        """Plain file holding *key*, for backends that keep entries as-is."""
+        return None
+
+    def staging_path(self, key: str) -> Path:
+        """Where a download for *key* is assembled before it is stored."""
+        return self.root / STAGING_DIR / key
+
+    @abstractmethod
+    def entries(self) -> list[CacheEntryInfo]:
+        """Size and last use of every entry, for cache maintenance."""
+
+    def peek(self, key: str) -> IO[bytes] | None:
+        """Like open(), but without counting as a use of the entry."""
+        return self.open(key)
+
+    def verify(self, key: str) -> str | None:
+        """Read *key* in full and return what is wrong with it, if anything."""
+        try:
+            f = self.peek(key)
+            if f is None:
+                return "entry is gone"
+            with f:
+                while f.read(_COPY_CHUNK_SIZE):
+                    pass
+        except (OSError, EOFError, zlib.error, sqlite3.Error) as e:
+            return f"unreadable ({e})"
+        return None
+
+    def compact(self) -> None:
+        """Reclaim space; only removes what no live entry needs.
+
+        Drops leftovers of interrupted writes and downloads and trims the run
+        statistics to the last RUN_STATS_KEPT runs.
+        """
+        staging = self.root / STAGING_DIR
+        if staging.is_dir():
+            for path in staging.iterdir():
+                if path.is_file() and _is_stale(path):
+                    path.unlink(missing_ok=True)
+        records = read_run_stats(self.root)
+        if records:
+            write_atomic(
+                self.root / STATS_FILE,
+                "".join(json.dumps(r) + "\n" for r in records).encode(),
+            )
+
+    def lock(self, key: str) -> ContextManager[None]:
+        """Advisory lock on *key*, shared with other processes using the folder.
+
+        Held while a missing entry is fetched, so concurrent runs wait for
+        the first download instead of repeating it.
+        """
+        return file_lock(self.root / LOCKS_DIR / f"{key}.lock")
+
+    def close(self) -> None:
+        """Release resources held by the store (it can still be used later)."""
+
+
+class FileCacheStore(CacheStore):
+    """One file per key directly in the cache folder (original layout)."""
+
+    name = "files"
+
+    def __init__(
+        self,
+        root: Path,
+        ttls: dict[str, float | None] | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        super().__init__(root, ttls, max_size)
+        if max_size is not None:
+            logging.warning(
+                f"The {self.name} cache backend keeps no access times,"
+                " ignoring the cache size limit"
+            )
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.meta"
+
+    def read(self, key: str) -> bytes | None:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        return path.read_bytes()
+
+    def write(self, key: str, data: bytes, meta: dict[str, str] | None = None) -> None:
+        path = self._path(key)
+        if path.suffix == ".json":
+            # Pretty-print JSON so entries are easy to inspect by hand
+            try:
+                json_data = json.loads(data)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass
+            else:
+                data = json.dumps(json_data, indent=2, ensure_ascii=False).encode()
+        write_atomic(path, data)
+        self._write_meta(key, meta)
+
+    def _write_meta(self, key: str, meta: dict[str, str] | None) -> None:
+        meta_path = self._meta_path(key)
+        if meta:
+            write_atomic(meta_path, json.dumps(meta).encode())
+        else:
+            meta_path.unlink(missing_ok=True)
+
+    def read_meta(self, key: str) -> dict[str, str]:
+        try:
+            with open(self._meta_path(key)) as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(meta, dict):
+            return {}
+        return {k: v for k, v in meta.items() if isinstance(v, str)}
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def open(self, key: str) -> IO[bytes] | None:
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            return None
+
+    def put_file(self, key: str, src: Path, meta: dict[str, str] | None = None) -> None:
+        path = self._path(key)
+        if src != path:
+            copy_atomic(src, path)
+        self._write_meta(key, meta)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        self._meta_path(key).unlink(missing_ok=True)
+
+    def keys(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if path.is_file()
+            and path.suffix not in (".meta", ".part", ".lock")
+            # Files of the other backends sharing the folder
+            and not path.name.startswith(
+                (".", CAS_INDEX_FILE, SQLITE_DB_FILE, STATS_FILE)
+            )
+        )
+
+    def entries(self) -> list[CacheEntryInfo]:
+        infos = []
+        for key in self.keys():
+            try:
+                st = self._path(key).stat()
+            except FileNotFoundError:
+                continue
+            infos.append(CacheEntryInfo(key, st.st_size, st.st_size, st.st_mtime))
+        return infos
+
+    def compact(self) -> None:
+        super().compact()
+        if not self.root.is_dir():
+            return
+        for path in self.root.iterdir():
+            if not path.is_file():
+                continue
+            if path.suffix == ".meta":
+                if not self._path(path.name.removesuffix(".meta")).exists():
+                    path.unlink(missing_ok=True)
+            elif (path.suffix == ".part" or path.name.startswith(".")) and _is_stale(
+                path
+            ):
+                path.unlink(missing_ok=True)
+
+    def local_file(self, key: str) -> Path | None:
+        return self._path(key)
+
+    def staging_path(self, key: str) -> Path:
+        # Downloads go straight to their final place (via a .part file)
+        return self._path(key)
+
+
+class CasCacheStore(CacheStore):
+    """Content-addressed, gzip-compressed objects with a key index.
+
+    ``objects/ab/cdef...gz`` holds the payload whose SHA-256 is ``abcdef...``.
+    ``index.jsonl`` is an append-only log of ``{"key", "hash", "size",
+    "stored", "atime", "meta"}`` records (``"hash": null`` deletes a key, a
+    record without ``hash`` only updates ``atime``); the last record for a
+    key wins. Keys missing from the index fall back to a file of the original
+    layout in the same folder.
+
+    Processes sharing the folder append to the index under ``index.lock``
+    and pick up each other's records by reading what was appended since
+    they last looked.
+
+    With ``max_size``, least recently used keys are evicted once the objects
+    take more than that many bytes on disk.
+    """
+
+    name = "cas"
+
+    def __init__(
+        self,
+        root: Path,
+        ttls: dict[str, float | None] | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        super().__init__(root, ttls, max_size)
+        self.legacy = FileCacheStore(root)
+        self._lock = threading.RLock()
+        # Keys read since their access time was last written to the index
+        self._touched: set[str] = set()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries: dict[str, dict[str, Any]] = {}
+        # Bytes of index.jsonl already applied to _entries, and which file
+        # they came from (compaction replaces it)
+        self._index_offset = 0
+        self._index_id: tuple[int, int] | None = None
+        # Keys referencing each object, and the object sizes on disk
+        self._refs: dict[str, int] = {}
+        self._stored: dict[str, int] = {}
+        self._usage = 0
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / CAS_INDEX_FILE
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / CAS_OBJECTS_DIR / digest[:2] / f"{digest[2:]}.gz"
+
+    def _index(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return self._entries
+
+    def _refresh(self) -> list[str]:
+        """Apply the index records appended since the last call.
+
+        Returns the objects no key references anymore.
+        """
+        try:
+            st = self.index_path.stat()
+            size, index_id = st.st_size, (st.st_dev, st.st_ino)
+        except FileNotFoundError:
+            size, index_id = 0, None
+        if index_id != self._index_id or size < self._index_offset:
+            # Rewritten in the meantime: start over
+            self._reset()
+            self._index_id = index_id
+        if size == self._index_offset:
+            return []
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            chunk = f.read(size - self._index_offset)
+        # A line another process is still writing is read next time
+        end = chunk.rfind(b"\n") + 1
+        self._index_offset += end
+        freed: list[str] = []
+        for line in chunk[:end].decode("utf-8", errors="replace").splitlines():
+            freed.extend(self._apply(line))
+        return freed
+
+    def _apply(self, line: str) -> list[str]:
+        try:
+            record = json.loads(line)
+            key = record["key"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            # e.g. a line cut short by an interrupted run
+            logging.debug(f"Skipping malformed cache index line: {line!r}")
+            return []
+        if "hash" not in record:
+            if key in self._entries and "atime" in record:
+                self._entries[key]["atime"] = record["atime"]
+            return []
+        if record["hash"]:
+            self._add_ref(record)
+            previous = self._entries.get(key)
+            self._entries[key] = record
+        else:
+            previous = self._entries.pop(key, None)
+        if previous is None:
+            return []
+        return self._drop_ref(previous)
+
+    def _add_ref(self, record: dict[str, Any]) -> None:
+        digest = record["hash"]
+        self._refs[digest] = self._refs.get(digest, 0) + 1
+        if self._refs[digest] == 1:
+            stored = record.get("stored")
+            if stored is None:
+                # Written before object sizes were recorded
+                try:
+                    stored = self.object_path(digest).stat().st_size
+                except OSError:
+                    stored = 0
+            self._stored[digest] = stored
+            self._usage += stored
+
+    def _drop_ref(self, record: dict[str, Any]) -> list[str]:
+        digest = record["hash"]
+        self._refs[digest] -= 1
+        if self._refs[digest] > 0:
+            return []
+        del self._refs[digest]
+        self._usage -= self._stored.pop(digest, 0)
+        return [digest]
+
+    @contextmanager
+    def _updating(self) -> Iterator[None]:
+        """Exclusive access to the index, up to date with other processes."""
+        with self._lock, file_lock(self.root / CAS_INDEX_LOCK):
+            self._refresh()
+            yield
+
+    def _append(self, *records: dict[str, Any]) -> None:
+        """Log and apply *records*; the caller holds ``_updating()``.
+
+        Objects left without a key are removed: nobody can add a new
+        reference to them while the index lock is held.
+        """
+        if not records:
+            return
+        lines = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        with open(self.index_path, "a+b") as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Terminate a line an interrupted run left behind
+                    lines = "\n" + lines
+            f.write(lines.encode("utf-8"))
+        for digest in self._refresh():
+            self.object_path(digest).unlink(missing_ok=True)
+
+    def _touch_records(self) -> list[dict[str, Any]]:
+        records = [
+            {"key": key, "atime": self._entries[key]["atime"]}
+            for key in sorted(self._touched)
+            if key in self._entries
+        ]
+        self._touched.clear()
+        return records
+
+    def _store(
+        self,
+        key: str,
+        tmp_path: Path,
+        digest: str,
+        size: int,
+        meta: dict[str, str] | None,
+    ) -> None:
+        """Move a written object in place and point *key* at it."""
+        record: dict[str, Any] = {"key": key, "hash": digest, "size": size}
+        if meta:
+            record["meta"] = meta
+        with self._updating():
+            final = self.object_path(digest)
+            if final.exists():
+                # Same content already stored (possibly under another key)
+                tmp_path.unlink()
+            else:
+                final.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, final)
+            record["stored"] = final.stat().st_size
+            record["atime"] = time.time()
+            self._touched.discard(key)
+            self._append(*self._touch_records(), record)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used keys until the objects fit in max_size.
+
+        Runs after each write and only does work once the budget is
+        exceeded; it then frees some headroom so the next writes do not
+        each trigger another round.
+        """
+        if self.max_size is None or self._usage <= self.max_size:
+            return
+        target = self.max_size * EVICTION_TARGET
+        entries = self._entries
+        usage = self._usage
+        tombstones = []
+        freed: set[str] = set()
+        refs = dict(self._refs)
+        for key in sorted(entries, key=lambda k: entries[k].get("atime", 0.0)):
+            if usage <= target:
+                break
+            digest = entries[key]["hash"]
+            refs[digest] -= 1
+            if refs[digest] == 0 and digest not in freed:
+                freed.add(digest)
+                usage -= self._stored.get(digest, 0)
+            self._touched.discard(key)
+            tombstones.append({"key": key, "hash": None})
+        logging.debug(f"Evicted {len(tombstones)} cache entries (LRU)")
+        self._append(*tombstones)
+
+    def _new_temp_object(self) -> tuple[IO[bytes], Path]:
+        staging = self.root / STAGING_DIR
+        staging.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=staging, suffix=".gz")
+        return os.fdopen(fd, "wb"), Path(name)
+
+    def write(self, key: str, data: bytes, meta: dict[str, str] | None = None) -> None:
+        f, tmp_path = self._new_temp_object()
+        with f:
+            f.write(gzip.compress(data, compresslevel=_GZIP_LEVEL, mtime=0))
+            f.flush()
+            os.fsync(f.fileno())
+        self._store(key, tmp_path, hashlib.sha256(data).hexdigest(), len(data), meta)
+
+    def put_file(self, key: str, src: Path, meta: dict[str, str] | None = None) -> None:
+        hasher = hashlib.sha256()
+        size = 0
+        f, tmp_path = self._new_temp_object()
+        with f, open(src, "rb") as fin:
+            with gzip.GzipFile(
+                fileobj=f, mode="wb", compresslevel=_GZIP_LEVEL, mtime=0
+            ) as gz:
+                while chunk := fin.read(_COPY_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    gz.write(chunk)
+                    size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        self._store(key, tmp_path, hasher.hexdigest(), size, meta)
+
+    def entry(self, key: str) -> dict[str, Any] | None:
+        """Index record of *key*, or None if it is not stored in the CAS."""
+        return self._index().get(key)
+
+    def _use(self, key: str) -> dict[str, Any] | None:
+        """Like entry(), but also mark *key* as recently used."""
+        with self._lock:
+            entry = self._index().get(key)
+            if entry is not None:
+                entry["atime"] = time.time()
+                self._touched.add(key)
+            return entry
+
+    def read(self, key: str) -> bytes | None:
+        entry = self._use(key)
+        if entry is None:
+            return self.legacy.read(key)
+        try:
+            with gzip.open(self.object_path(entry["hash"]), "rb") as f:
+                data: bytes = f.read()
+        except FileNotFoundError:
+            logging.warning(f"Cache object for {key} is missing")
+            return None
+        return data
+
+    def read_meta(self, key: str) -> dict[str, str]:
+        entry = self.entry(key)
+        if entry is None:
+            return self.legacy.read_meta(key)
+        meta = entry.get("meta") or {}
+        return {k: v for k, v in meta.items() if isinstance(v, str)}
+
+    def exists(self, key: str) -> bool:
+        return self.entry(key) is not None or self.legacy.exists(key)
+
+    def open(self, key: str) -> IO[bytes] | None:
+        entry = self._use(key)
+        if entry is None:
+            return self.legacy.open(key)
+        try:
+            return cast(IO[bytes], gzip.open(self.object_path(entry["hash"]), "rb"))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str) -> None:
+        if self.entry(key) is not None:
+            with self._updating():
+                if key in self._entries:
+                    self._touched.discard(key)
+                    self._append({"key": key, "hash": None})
+        # Otherwise the compatibility path would bring the entry back
+        self.legacy.delete(key)
+
+    def keys(self) -> list[str]:
+        return sorted(set(self._index()) | set(self.legacy.keys()))
+
+    def entries(self) -> list[CacheEntryInfo]:
+        with self._lock:
+            index = self._index()
+            infos = [
+                CacheEntryInfo(
+                    key,
+                    entry.get("size", 0),
+                    self._stored.get(entry["hash"], 0)
+                    // self._refs.get(entry["hash"], 1),
+                    entry.get("atime", 0.0),
+                )
+                for key, entry in index.items()
+            ]
+        infos.extend(info for info in self.legacy.entries() if info.key not in index)
+        return sorted(infos, key=lambda info: info.key)
+
+    def peek(self, key: str) -> IO[bytes] | None:
+        entry = self.entry(key)
+        if entry is None:
+            return self.legacy.peek(key)
+        try:
+            return cast(IO[bytes], gzip.open(self.object_path(entry["hash"]), "rb"))
+        except FileNotFoundError:
+            return None
+
+    def verify(self, key: str) -> str | None:
+        entry = self.entry(key)
+        if entry is None:
+            return self.legacy.verify(key)
+        hasher = hashlib.sha256()
+        try:
+            with gzip.open(self.object_path(entry["hash"]), "rb") as f:
+                while chunk := f.read(_COPY_CHUNK_SIZE):
+                    hasher.update(chunk)
+        except (OSError, EOFError, zlib.error) as e:
+            return f"unreadable ({e})"
+        if hasher.hexdigest() != entry["hash"]:
+            return "content does not match its hash"
+        return None
+
+    def compact(self) -> None:
+        """Rewrite the index with one record per key, drop orphaned objects."""
+        self.legacy.compact()
+        with self._updating():
+            self._touched.clear()
+            data = "".join(
+                json.dumps(entry, separators=(",", ":")) + "\n"
+                for entry in self._entries.values()
+            ).encode("utf-8")
+            write_atomic(self.index_path, data)
+            st = self.index_path.stat()
+            self._index_offset = st.st_size
+            self._index_id = (st.st_dev, st.st_ino)
+
+            # e.g. objects of a run killed between storing and indexing them
+            objects = self.root / CAS_OBJECTS_DIR
+            if not objects.is_dir():
+                return
+            for path in objects.glob("*/*.gz"):
+                if path.parent.name + path.name[: -len(".gz")] not in self._refs:
+                    path.unlink(missing_ok=True)
+            for folder in objects.iterdir():
+                if folder.is_dir() and not any(folder.iterdir()):
+                    folder.rmdir()
+
+    def usage(self) -> int:
+        """Bytes taken by the objects of the indexed keys."""
+        with self._lock:
+            self._refresh()
+            return self._usage
+
+    def close(self) -> None:
+        # Access times are only needed for eviction: write them in one go
+        with self._lock:
+            if not self._touched:
+                return
+            with self._updating():
+                self._append(*self._touch_records())
+
+
+def resource_type(key: str) -> str:
+    """Resource type of a cache key, the unit TTLs are configured for."""
+    if key.endswith(MISSING_SUFFIX):
+        return "missing"
+    if key.endswith("_svg.json"):
+        return "svg"
+    suffix = key.rpartition(".")[2]
+    if suffix == "json":
+        return "component"
+    if suffix in ("obj", "step"):
+        return suffix
+    if suffix in ("kicad_sym", "kicad_mod", "wrl"):
+        return "converted"
+    return "other"
+
+
+def resource_id(key: str) -> str:
+    """LCSC id or 3D model uuid a cache key belongs to."""
+    return key.split(".", 1)[0].removesuffix("_svg")
+
+
+class SqliteCacheStore(CacheStore):
+    """All entries in one SQLite database, with per-resource-type expiry.
+
+    Entries older than the TTL of their resource type are treated as
+    missing. The database runs in WAL mode so readers do not block the writer
+    of another process; each thread gets its own connection. Keys missing
+    from the database fall back to a file of the original layout in the same
+    folder.
+
+    OBJ and STEP payloads (SQLITE_FILE_TYPES) are kept as plain files in
+    SQLITE_FILES_DIR, with only their row in the database, so 3D models are
+    streamed to and from disk instead of passing through memory.
+
+    With ``max_size``, least recently used entries are evicted once their
+    payloads take more than that many bytes.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        root: Path,
+        ttls: dict[str, float | None] | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        super().__init__(root, ttls, max_size)
+        self.legacy = FileCacheStore(root)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # Bytes stored by this and other processes, refreshed when the budget
+        # looks exceeded
+        self._usage: int | None = None
+
+    @property
+    def db_path(self) -> Path:
+        return self.root / SQLITE_DB_FILE
+
+    def _db(self) -> sqlite3.Connection:
+        db: sqlite3.Connection | None = getattr(self._local, "db", None)
+        if db is not None:
+            return db
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Autocommit: every statement below is a transaction on its own
+        db = sqlite3.connect(
+            self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " resource_id TEXT NOT NULL,"
+            " resource_type TEXT NOT NULL,"
+            " data BLOB NOT NULL,"
+            " meta TEXT,"
+            " size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " external INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in db.execute("PRAGMA table_info(entries)")}
+        if "external" not in columns:
+            # Database of an earlier version: payloads were all inline
+            try:
+                db.execute(
+                    "ALTER TABLE entries ADD COLUMN external INTEGER NOT NULL DEFAULT 0"
+                )
+            except sqlite3.OperationalError:
+                # Added by another process in the meantime
+                pass
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_resource_id ON entries (resource_id)"
+        )
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        self._local.db = db
+        with self._lock:
+            self._connections.append(db)
+        return db
+
+    def _expired(self, resource: str, stored_at: float) -> bool:
+        ttl = self.ttls.get(resource)
+        return ttl is not None and time.time() - stored_at > ttl
+
+    def _file_path(self, key: str) -> Path:
+        return self.root / SQLITE_FILES_DIR / key
+
+    def _row(self, key: str) -> tuple[bytes, str | None, bool] | None:
+        """Payload, meta and whether the payload is a file, of a live entry."""
+        row = (
+            self._db()
+            .execute(
+                "SELECT data, meta, resource_type, stored_at, external FROM entries"
+                " WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None or self._expired(row[2], row[3]):
+            return None
+        external = bool(row[4])
+        if external and not self._file_path(key).is_file():
+            return None
+        return row[0], row[1], external
+
+    def _touch(self, key: str) -> None:
+        self._db().execute(
+            "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+
+    def _has_row(self, key: str) -> bool:
+        row = (
+            self._db().execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        )
+        return row is not None
+
+    def _open_row(self, key: str, touch: bool) -> IO[bytes] | None:
+        row = self._row(key)
+        if row is None:
+            if self._has_row(key):
+                return None
+            return self.legacy.open(key) if touch else self.legacy.peek(key)
+        if touch:
+            self._touch(key)
+        if not row[2]:
+            return io.BytesIO(row[0])
+        try:
+            return open(self._file_path(key), "rb")
+        except FileNotFoundError:
+            return None
+
+    def read(self, key: str) -> bytes | None:
+        row = self._row(key)
+        if row is None:
+            return None if self._has_row(key) else self.legacy.read(key)
+        self._touch(key)
+        if not row[2]:
+            return row[0]
+        try:
+            return self._file_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def read_meta(self, key: str) -> dict[str, str]:
+        row = self._row(key)
+        if row is None:
+            return {} if self._has_row(key) else self.legacy.read_meta(key)
+        try:
+            meta = json.loads(row[1] or "{}")
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(meta, dict):
+            return {}
+        return {k: v for k, v in meta.items() if isinstance(v, str)}
+
+    def exists(self, key: str) -> bool:
+        if self._row(key) is not None:
+            return True
+        return not self._has_row(key) and self.legacy.exists(key)
+
+    def write(self, key: str, data: bytes, meta: dict[str, str] | None = None) -> None:
+        if resource_type(key) in SQLITE_FILE_TYPES:
+            write_atomic(self._file_path(key), data)
+            self._insert(key, b"", meta, len(data), external=True)
+        else:
+            self._insert(key, data, meta, len(data), external=False)
+
+    def put_file(self, key: str, src: Path, meta: dict[str, str] | None = None) -> None:
+        if resource_type(key) not in SQLITE_FILE_TYPES:
+            # Component data and the like: small enough to go inline
+            self.write(key, src.read_bytes(), meta)
+            return
+        path = self._file_path(key)
+        if src != path:
+            copy_atomic(src, path)
+        self._insert(key, b"", meta, path.stat().st_size, external=True)
+
+    def _insert(
+        self,
+        key: str,
+        data: bytes,
+        meta: dict[str, str] | None,
+        size: int,
+        external: bool,
+    ) -> None:
+        now = time.time()
+        self._db().execute(
+            "INSERT OR REPLACE INTO entries (key, resource_id, resource_type,"
+            " data, meta, size, stored_at, accessed_at, external)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                resource_id(key),
+                resource_type(key),
+                sqlite3.Binary(data),
+                json.dumps(meta) if meta else None,
+                size,
+                now,
+                now,
+                int(external),
+            ),
+        )
+        if self.max_size is not None:
+            with self._lock:
+                if self._usage is not None:
+                    self._usage += size
+            self._evict()
+
+    def local_file(self, key: str) -> Path | None:
+        row = self._row(key)
+        if row is None or not row[2]:
+            return None
+        self._touch(key)
+        return self._file_path(key)
+
+    def staging_path(self, key: str) -> Path:
+        if resource_type(key) in SQLITE_FILE_TYPES:
+            # Downloaded straight into place; put_file() then only adds the row
+            return self._file_path(key)
+        return super().staging_path(key)
+
+    def _delete_rows(self, keys: list[str]) -> None:
+        self._db().executemany(
+            "DELETE FROM entries WHERE key = ?", [(k,) for k in keys]
+        )
+        for key in keys:
+            if resource_type(key) in SQLITE_FILE_TYPES:
+                self._file_path(key).unlink(missing_ok=True)
+
+    def usage(self) -> int:
+        """Bytes taken by the stored payloads."""
+        row = self._db().execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+        usage: int = row.fetchone()[0]
+        with self._lock:
+            self._usage = usage
+        return usage
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until they fit in max_size.
+
+        The running total is only an estimate (other processes write too):
+        the exact usage is queried when the estimate exceeds the budget, and
+        eviction then frees some headroom so following writes stay cheap.
+        """
+        if self.max_size is None:
+            return
+        if self._usage is not None and self._usage <= self.max_size:
+            return
+        usage = self.usage()
+        if usage <= self.max_size:
+            return
+        db = self._db()
+        target = self.max_size * EVICTION_TARGET
+        evicted = 0
+        while usage > target:
+            rows = db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if usage <= target:
+                    break
+                self._delete_rows([key])
+                usage -= size
+                evicted += 1
+        with self._lock:
+            self._usage = usage
+        logging.debug(f"Evicted {evicted} cache entries (LRU)")
+
+    def open(self, key: str) -> IO[bytes] | None:
+        return self._open_row(key, touch=True)
+
+    def delete(self, key: str) -> None:
+        self._delete_rows([key])
+        self.legacy.delete(key)
+
+    def keys(self) -> list[str]:
+        rows = (
+            self._db()
+            .execute("SELECT key, resource_type, stored_at FROM entries")
+            .fetchall()
+        )
+        stored = {key for key, _, _ in rows}
+        valid = {key for key, rtype, at in rows if not self._expired(rtype, at)}
+        return sorted(valid | (set(self.legacy.keys()) - stored))
+
+    def entries(self) -> list[CacheEntryInfo]:
+        rows = (
+            self._db()
+            .execute(
+                "SELECT key, size, accessed_at, resource_type, stored_at FROM entries"
+            )
+            .fetchall()
+        )
+        infos = [
+            CacheEntryInfo(key, size, size, accessed_at)
+            for key, size, accessed_at, rtype, stored_at in rows
+            if not self._expired(rtype, stored_at)
+        ]
+        stored = {row[0] for row in rows}
+        infos.extend(info for info in self.legacy.entries() if info.key not in stored)
+        return sorted(infos, key=lambda info: info.key)
+
+    def peek(self, key: str) -> IO[bytes] | None:
+        return self._open_row(key, touch=False)
+
+    def compact(self) -> None:
+        """Delete expired entries and orphan model files, then give the freed
+        pages back to the filesystem."""
+        self.legacy.compact()
+        db = self._db()
+        rows = db.execute("SELECT key, resource_type, stored_at FROM entries")
+        expired = [key for key, rtype, at in rows if self._expired(rtype, at)]
+        self._delete_rows(expired)
+        files_dir = self.root / SQLITE_FILES_DIR
+        if files_dir.is_dir():
+            for path in files_dir.iterdir():
+                # Young ones may be written by a run still in progress
+                if not self._has_row(path.name) and _is_stale(path):
+                    path.unlink(missing_ok=True)
+        db.execute("VACUUM")
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def keys_for(self, resource: str) -> list[str]:
+        """Keys of the entries of one LCSC id or 3D model uuid."""
+        rows = self._db().execute(
+            "SELECT key, resource_type, stored_at FROM entries"
+            " WHERE resource_id = ? ORDER BY key",
+            (resource,),
+        )
+        return [
+            key for key, rtype, stored_at in rows if not self._expired(rtype, stored_at)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            db.close()
+        self._local = threading.local()
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only memory map usable as the file of a ZipFile."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+class BundleCacheStore(CacheStore):
+    """Read-only cache backed by a bundle (cache_bundle.export_bundle).
+
+    Raises ValueError if *path* is not a readable bundle.
+    """
+
+    name = "bundle"
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path.parent)
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._map = _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._zip = zipfile.ZipFile(cast(IO[bytes], self._map))
+            index = json.loads(self._zip.read(BUNDLE_INDEX))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            self.close()
+            raise ValueError(f"{path} is not a cache bundle: {e}") from None
+        if not isinstance(index, dict) or index.get("format") != BUNDLE_FORMAT:
+            self.close()
+            raise ValueError(f"{path}: unsupported cache bundle format")
+        self.created = float(index.get("created", 0))
+        entries = index.get("entries", {})
+        members = set(self._zip.namelist())
+        self._meta: dict[str, dict[str, str]] = {
+            key: dict(entry.get("meta", {}))
+            for key, entry in entries.items()
+            if key in members
+        }
+
+    def _readonly(self) -> PermissionError:
+        return PermissionError(f"{self.path} is a read-only cache bundle")
+
+    def read(self, key: str) -> bytes | None:
+        if key not in self._meta:
+            return None
+        return self._zip.read(key)
+
+    def write(self, key: str, data: bytes, meta: dict[str, str] | None = None) -> None:
+        raise self._readonly()
+
+    def read_meta(self, key: str) -> dict[str, str]:
+        return dict(self._meta.get(key, {}))
+
+    def exists(self, key: str) -> bool:
+        return key in self._meta
+
+    def open(self, key: str) -> IO[bytes] | None:
+        if key not in self._meta:
+            return None
+        return self._zip.open(key)
+
+    def put_file(self, key: str, src: Path, meta: dict[str, str] | None = None) -> None:
+        raise self._readonly()
+
+    def delete(self, key: str) -> None:
+        raise self._readonly()
+
+    def keys(self) -> list[str]:
+        return sorted(self._meta)
+
+    def entries(self) -> list[CacheEntryInfo]:
+        return [
+            CacheEntryInfo(key, info.file_size, info.compress_size, self.created)
+            for key in self.keys()
+            for info in (self._zip.getinfo(key),)
+        ]
+
+    def verify(self, key: str) -> str | None:
+        try:
+            return super().verify(key)
+        except zipfile.BadZipFile as e:
+            # CRC mismatch of the member
+            return f"unreadable ({e})"
+
+    def compact(self) -> None:
+        pass
+
+    def lock(self, key: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def close(self) -> None:
+        # Members still open keep their own reference to the map
+        zf = getattr(self, "_zip", None)
+        if zf is not None:
+            zf.close()
+        mapping = getattr(self, "_map", None)
+        if mapping is not None and not mapping.closed:
+            try:
+                mapping.close()
+            except BufferError:
+                pass
+
+
+class LayeredCacheStore(CacheStore):
+    """A writable store in front of read-only tiers (e.g. cache bundles).
+
+    Lookups go to *store* first, then to each tier in turn; everything that
+    changes the cache (writes, deletes, locks, staging, compaction) only
+    touches *store*.
+    """
+
+    def __init__(self, store: CacheStore, tiers: list[CacheStore]) -> None:
+        super().__init__(store.root, store.ttls, store.max_size)
+        self.name = store.name
+        self.store = store
+        self.tiers = tiers
+
+    def _holder(self, key: str) -> CacheStore | None:
+        """First store in lookup order that has *key*."""
+        for store in (self.store, *self.tiers):
+            if store.exists(key):
+                return store
+        return None
+
+    def read(self, key: str) -> bytes | None:
+        for store in (self.store, *self.tiers):
+            data = store.read(key)
+            if data is not None:
+                return data
+        return None
+
+    def write(self, key: str, data: bytes, meta: dict[str, str] | None = None) -> None:
+        self.store.write(key, data, meta)
+
+    def read_meta(self, key: str) -> dict[str, str]:
+        store = self._holder(key)
+        return store.read_meta(key) if store is not None else {}
+
+    def exists(self, key: str) -> bool:
+        return self._holder(key) is not None
+
+    def open(self, key: str) -> IO[bytes] | None:
+        for store in (self.store, *self.tiers):
+            f = store.open(key)
+            if f is not None:
+                return f
+        return None
+
+    def peek(self, key: str) -> IO[bytes] | None:
+        store = self._holder(key)
+        return store.peek(key) if store is not None else None
+
+    def put_file(self, key: str, src: Path, meta: dict[str, str] | None = None) -> None:
+        self.store.put_file(key, src, meta)
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    def keys(self) -> list[str]:
+        keys = set(self.store.keys())
+        for tier in self.tiers:
+            keys.update(tier.keys())
+        return sorted(keys)
+
+    def local_file(self, key: str) -> Path | None:
+        # An entry only a tier has is read through open(), never from the
+        # (empty) place it would take in the writable store
+        holder = self._holder(key)
+        if holder is not None and holder is not self.store:
+            return None
+        return self.store.local_file(key)
+
+    def staging_path(self, key: str) -> Path:
+        return self.store.staging_path(key)
+
+    def entries(self) -> list[CacheEntryInfo]:
+        infos = {info.key: info for info in self.store.entries()}
+        for tier in self.tiers:
+            for info in tier.entries():
+                infos.setdefault(info.key, info)
+        return sorted(infos.values(), key=lambda info: info.key)
+
+    def compact(self) -> None:
+        self.store.compact()
+
+    def lock(self, key: str) -> ContextManager[None]:
+        return self.store.lock(key)
+
+    def close(self) -> None:
+        self.store.close()
+        for tier in self.tiers:
+            tier.close()
+
+
+class MemoryCache(Generic[T]):
+    """Thread-safe LRU of parsed values bounded by entry count and bytes.
+
+    ``size`` passed to put() is the cost of a value, e.g. the length of the
+    JSON it was parsed from, and ``ttl`` the seconds after which get() drops
+    it (None: kept until evicted). Values are shared with every caller of
+    get() and must not be modified.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # key -> (value, size, expiry on the time.monotonic() clock or None)
+        self._items: OrderedDict[str, tuple[T, int, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> T | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[2] is not None and time.monotonic() >= item[2]:
+                self._discard(key)
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, value: T, size: int, ttl: float | None = None) -> None:
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            expiry = None if ttl is None else time.monotonic() + ttl
+            self._items[key] = (value, size, expiry)
+            self.nbytes += size
+            while len(self._items) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._items.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def _discard(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.nbytes -= item[1]
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+CACHE_BACKENDS: dict[str, type[CacheStore]] = {
+    FileCacheStore.name: FileCacheStore,
+    CasCacheStore.name: CasCacheStore,
+    SqliteCacheStore.name: SqliteCacheStore,
+}
+DEFAULT_CACHE_BACKEND = CasCacheStore.name
+
+
+def detect_cache_backend(root: Path) -> str:
+    """Backend that wrote the cache at *root*, judged by its files."""
+    if (root / SQLITE_DB_FILE).exists():
+        return SqliteCacheStore.name
+    if (root / CAS_INDEX_FILE).exists():
+        return CasCacheStore.name
+    if root.is_dir() and FileCacheStore(root).keys():
+        return FileCacheStore.name
+    return DEFAULT_CACHE_BACKEND
+
+
+def open_cache_store(
+    backend: str,
+    root: Path,
+    ttls: dict[str, float | None] | None = None,
+    max_size: int | None = None,
+) -> CacheStore:
+    """Create the cache backend called *backend* rooted at *root*."""
+    try:
+        store_class = CACHE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown cache backend {backend!r}, expected one of"
+            f" {', '.join(sorted(CACHE_BACKENDS))}"
+        ) from None
+    return store_class(root, ttls, max_size)
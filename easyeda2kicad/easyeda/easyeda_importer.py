@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import fields
-from typing import Any, Union, get_args, get_origin, get_type_hints
+from operator import attrgetter
+from typing import Any
 
 __all__ = [
     "EasyedaSymbolImporter",
@@ -13,6 +13,7 @@ __all__ = [
 ]
 
 
+from .background import run_in_background
 from .easyeda_api import EasyedaApi
 from .parameters_easyeda import (
     _safe_bool,
@@ -51,6 +52,28 @@ from .parameters_easyeda import (
     EeSymbolRectangle,
     EeFootprint,
 )
+from .shape_schema import ShapeSchema, schema_of
+from .shape_tokenizer import ShapeHandlers, designator_of, split_fields, split_pin
+
+# Field layouts of the shapes, see shape_schema
+_PIN_SETTINGS = schema_of(EeSymbolPinSettings)
+_PIN_NAME = schema_of(EeSymbolPinName)
+_SYMBOL_RECTANGLE = schema_of(EeSymbolRectangle)
+_SYMBOL_POLYLINE = schema_of(EeSymbolPolyline)
+_SYMBOL_POLYGON = schema_of(EeSymbolPolygon)
+_SYMBOL_PATH = schema_of(EeSymbolPath)
+_SYMBOL_CIRCLE = schema_of(EeSymbolCircle)
+_SYMBOL_ELLIPSE = schema_of(EeSymbolEllipse)
+_SYMBOL_ARC = schema_of(EeSymbolArc)
+_FOOTPRINT_PAD = schema_of(EeFootprintPad)
+_FOOTPRINT_TRACK = schema_of(EeFootprintTrack)
+_FOOTPRINT_HOLE = schema_of(EeFootprintHole)
+_FOOTPRINT_VIA = schema_of(EeFootprintVia)
+_FOOTPRINT_CIRCLE = schema_of(EeFootprintCircle)
+_FOOTPRINT_ARC = schema_of(EeFootprintArc)
+_FOOTPRINT_RECTANGLE = schema_of(EeFootprintRectangle)
+_FOOTPRINT_TEXT = schema_of(EeFootprintText)
+_MODEL_3D_BASE = schema_of(Ee3dModelBase)
 
 
 def _sanitize_component_name(name: str) -> str:
@@ -74,41 +97,24 @@ def convert_fields_to_types(
     the dataclass type annotations. Needed because EasyEDA API returns all
     field values as strings regardless of their intended type.
     """
-    try:
-        type_hints = get_type_hints(dataclass_type)
-    except Exception:
-        # Fallback if type hints can't be resolved
-        return field_dict
-
-    converted = {}
-    for key, value in field_dict.items():
-        if key not in type_hints:
-            converted[key] = value
-            continue
-
-        field_type = type_hints[key]
-
-        origin = get_origin(field_type)
-        if origin is Union:
-            args = get_args(field_type)
-            if args and type(None) in args:
-                # It's Optional[T], get the non-None type
-                field_type = next((arg for arg in args if arg is not type(None)), str)
-
-        # Convert based on type
-        if field_type is float or field_type == "float":
-            converted[key] = _safe_float(value)
-        elif field_type is int or field_type == "int":
-            converted[key] = _safe_int(value)
-        elif field_type is bool or field_type == "bool":
-            converted[key] = _safe_bool(value)
-        else:
-            converted[key] = value
+    return schema_of(dataclass_type).convert_named(field_dict)
+
+
+def _unknown_symbol_shape(designator: str) -> None:
+    logging.warning(f"Unknown symbol designator: {designator}")
+
+
+def _unknown_footprint_shape(designator: str) -> None:
+    logging.warning(f"Unknown footprint designator: {designator}")
+
 
-    return converted
+# Handlers of the shape lines, by designator; see shape_tokenizer
+symbol_shape_handlers: ShapeHandlers[None] = ShapeHandlers(_unknown_symbol_shape)
+footprint_shape_handlers: ShapeHandlers[None] = ShapeHandlers(_unknown_footprint_shape)
 
 
-def add_easyeda_pin(pin_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("P", tokenizer=split_pin)
+def add_easyeda_pin(ee_segments: list[list[str]], ee_symbol: EeSymbol) -> None:
     # Format: P~settings^^dot^^path^^name^^num^^dot_bis^^clock
     #   settings: visibility~type~spice_pin_number~pos_x~pos_y~rotation~id~is_locked
     #   dot:      dot_x~dot_y
@@ -117,22 +123,12 @@ def add_easyeda_pin(pin_data: str, ee_symbol: EeSymbol) -> None:
     #   num:      show~x~y~rotation~number~text_anchor~font~font_size (index [4][4] = KiCad pin number)
     #   dot_bis:  is_displayed~circle_x~circle_y
     #   clock:    is_displayed~path
-    segments = pin_data.split("^^")
-    ee_segments = [seg.split("~") for seg in segments]
-
     # Extract the correct KiCad pin number from segment 4[4]
     correct_pin_number = None
     if len(ee_segments) > 4 and len(ee_segments[4]) > 4:
         correct_pin_number = ee_segments[4][4]
 
-    pin_settings_data = (
-        ee_segments[0][1:] if len(ee_segments) > 0 and len(ee_segments[0]) > 1 else []
-    )
-    pin_settings_fields = [f.name for f in fields(EeSymbolPinSettings)]
-    pin_settings_dict = dict(zip(pin_settings_fields, pin_settings_data))
-    pin_settings = EeSymbolPinSettings(
-        **convert_fields_to_types(pin_settings_dict, EeSymbolPinSettings)
-    )
+    pin_settings = _PIN_SETTINGS.create(ee_segments[0][1:])
 
     # Override spice_pin_number with the correct KiCad pin number if found
     if correct_pin_number is not None:
@@ -166,15 +162,7 @@ def add_easyeda_pin(pin_data: str, ee_symbol: EeSymbol) -> None:
             else ""
         ),
     )
-    pin_name_dict = dict(
-        zip(
-            [f.name for f in fields(EeSymbolPinName)],
-            ee_segments[3][:] if len(ee_segments) > 3 else [],
-        )
-    )
-    pin_name = EeSymbolPinName(
-        **convert_fields_to_types(pin_name_dict, EeSymbolPinName)
-    )
+    pin_name = _PIN_NAME.create(ee_segments[3] if len(ee_segments) > 3 else [])
 
     pin_dot_bis = EeSymbolPinDotBis(
         is_displayed=_safe_bool(
@@ -218,8 +206,9 @@ def add_easyeda_pin(pin_data: str, ee_symbol: EeSymbol) -> None:
     )
 
 
-def add_easyeda_rectangle(rectangle_data: str, ee_symbol: EeSymbol) -> None:
-    parts = rectangle_data.split("~")[1:]
+@symbol_shape_handlers.register("R")
+def add_easyeda_rectangle(fields: list[str], ee_symbol: EeSymbol) -> None:
+    parts = fields[1:]
 
     # Handle EasyEDA format inconsistency with TWO different formats:
     # Format 1: R~x~y~~width~height~stroke_color~stroke_width~stroke_style~fill_color~id~locked
@@ -248,93 +237,55 @@ def add_easyeda_rectangle(rectangle_data: str, ee_symbol: EeSymbol) -> None:
         # Fallback: assume Format 1 layout
         normalized_parts = parts
 
-    # Build dict for dataclass fields (without rx, ry first)
-    rectangle_dict = dict(
-        zip(
-            [f.name for f in fields(EeSymbolRectangle)],
-            normalized_parts,
-        )
-    )
-
-    # Add rx, ry at the end if they were extracted
+    # rx, ry (the last dataclass fields) override the positional values
+    corners = {}
     if rx is not None:
-        rectangle_dict["rx"] = rx
+        corners["rx"] = rx
     if ry is not None:
-        rectangle_dict["ry"] = ry
+        corners["ry"] = ry
 
-    ee_symbol.rectangles.append(
-        EeSymbolRectangle(**convert_fields_to_types(rectangle_dict, EeSymbolRectangle))
-    )
+    ee_symbol.rectangles.append(_SYMBOL_RECTANGLE.create(normalized_parts, **corners))
 
 
-def add_easyeda_polyline(polyline_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("PL")
+def add_easyeda_polyline(fields: list[str], ee_symbol: EeSymbol) -> None:
     # Format: PL~points~stroke_color~stroke_width~stroke_style~fill_color~id~locked
-    polyline_dict = dict(
-        zip(
-            [f.name for f in fields(EeSymbolPolyline)],
-            polyline_data.split("~")[1:],
-        )
-    )
-    ee_symbol.polylines.append(
-        EeSymbolPolyline(**convert_fields_to_types(polyline_dict, EeSymbolPolyline))
-    )
+    ee_symbol.polylines.append(_SYMBOL_POLYLINE.create(fields[1:]))
 
 
-def add_easyeda_polygon(polygon_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("PG")
+def add_easyeda_polygon(fields: list[str], ee_symbol: EeSymbol) -> None:
     # Format: PG~points~stroke_color~stroke_width~stroke_style~fill_color~id~locked
-    polygon_dict = dict(
-        zip(
-            [f.name for f in fields(EeSymbolPolygon)],
-            polygon_data.split("~")[1:],
-        )
-    )
-    ee_symbol.polygons.append(
-        EeSymbolPolygon(**convert_fields_to_types(polygon_dict, EeSymbolPolygon))
-    )
+    ee_symbol.polygons.append(_SYMBOL_POLYGON.create(fields[1:]))
 
 
-def add_easyeda_path(path_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("PT")
+def add_easyeda_path(fields: list[str], ee_symbol: EeSymbol) -> None:
     # Format: PT~path~stroke_color~stroke_width~stroke_style~fill_color~id~locked
-    path_dict = dict(
-        zip([f.name for f in fields(EeSymbolPath)], path_data.split("~")[1:])
-    )
-    ee_symbol.paths.append(
-        EeSymbolPath(**convert_fields_to_types(path_dict, EeSymbolPath))
-    )
+    ee_symbol.paths.append(_SYMBOL_PATH.create(fields[1:]))
 
 
-def add_easyeda_circle(circle_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("C")
+def add_easyeda_circle(fields: list[str], ee_symbol: EeSymbol) -> None:
     # Format: C~center_x~center_y~radius~stroke_color~stroke_width~stroke_style~fill_color~id~locked
-    circle_dict = dict(
-        zip([f.name for f in fields(EeSymbolCircle)], circle_data.split("~")[1:])
-    )
-    ee_symbol.circles.append(
-        EeSymbolCircle(**convert_fields_to_types(circle_dict, EeSymbolCircle))
-    )
+    ee_symbol.circles.append(_SYMBOL_CIRCLE.create(fields[1:]))
 
 
-def add_easyeda_ellipse(ellipse_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("E")
+def add_easyeda_ellipse(fields: list[str], ee_symbol: EeSymbol) -> None:
     # Format: E~center_x~center_y~radius_x~radius_y~stroke_color~stroke_width~stroke_style~fill_color~id~locked
-    ellipse_dict = dict(
-        zip(
-            [f.name for f in fields(EeSymbolEllipse)],
-            ellipse_data.split("~")[1:],
-        )
-    )
-    ee_symbol.ellipses.append(
-        EeSymbolEllipse(**convert_fields_to_types(ellipse_dict, EeSymbolEllipse))
-    )
+    ee_symbol.ellipses.append(_SYMBOL_ELLIPSE.create(fields[1:]))
 
 
-def add_easyeda_arc(arc_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("A")
+def add_easyeda_arc(fields: list[str], ee_symbol: EeSymbol) -> None:
     # Format: A~path~helper_dots~stroke_color~stroke_width~stroke_style~fill_color~id~locked
-    arc_dict = dict(zip([f.name for f in fields(EeSymbolArc)], arc_data.split("~")[1:]))
-    ee_symbol.arcs.append(EeSymbolArc(**convert_fields_to_types(arc_dict, EeSymbolArc)))
+    ee_symbol.arcs.append(_SYMBOL_ARC.create(fields[1:]))
 
 
-def add_easyeda_text(text_data: str, ee_symbol: EeSymbol) -> None:
+@symbol_shape_handlers.register("T")
+def add_easyeda_text(parts: list[str], ee_symbol: EeSymbol) -> None:
     # Format: T~type~x~y~rotation~color~font~font_size~stroke_width~baseline~text_anchor~role~text~display~...
-    parts = text_data.split("~")
     if len(parts) < 13 or not parts[12]:
         return
     font_size_str = parts[7]
@@ -356,17 +307,61 @@ def add_easyeda_text(text_data: str, ee_symbol: EeSymbol) -> None:
     )
 
 
-easyeda_handlers = {
-    "P": add_easyeda_pin,
-    "R": add_easyeda_rectangle,
-    "E": add_easyeda_ellipse,
-    "C": add_easyeda_circle,
-    "A": add_easyeda_arc,
-    "PL": add_easyeda_polyline,
-    "PG": add_easyeda_polygon,
-    "PT": add_easyeda_path,
-    "T": add_easyeda_text,
-}
+def _add_footprint_shape(
+    designator: str, schema: ShapeSchema[Any], attribute: str
+) -> None:
+    shapes = attrgetter(attribute)
+
+    @footprint_shape_handlers.register(designator)
+    def add_shape(
+        fields: list[str], ee_footprint: EeFootprint, ee_data_str: dict[str, Any]
+    ) -> None:
+        shapes(ee_footprint).append(schema.make(fields[1:]))
+
+
+_add_footprint_shape("PAD", _FOOTPRINT_PAD, "pads")
+_add_footprint_shape("TRACK", _FOOTPRINT_TRACK, "tracks")
+_add_footprint_shape("HOLE", _FOOTPRINT_HOLE, "holes")
+_add_footprint_shape("VIA", _FOOTPRINT_VIA, "vias")
+_add_footprint_shape("CIRCLE", _FOOTPRINT_CIRCLE, "circles")
+_add_footprint_shape("ARC", _FOOTPRINT_ARC, "arcs")
+_add_footprint_shape("RECT", _FOOTPRINT_RECTANGLE, "rectangles")
+_add_footprint_shape("TEXT", _FOOTPRINT_TEXT, "texts")
+
+
+@footprint_shape_handlers.register("SVGNODE")
+def add_easyeda_svgnode(
+    fields: list[str], ee_footprint: EeFootprint, ee_data_str: dict[str, Any]
+) -> None:
+    # canvas.split("~")[16] and [17] are the authoritative canvas origin.
+    # Fall back to head.x/y if the canvas string is absent or too short.
+    canvas_parts = ee_data_str.get("canvas", "").split("~")
+    if len(canvas_parts) > 17:
+        origin_x = _safe_float(canvas_parts[16])
+        origin_y = _safe_float(canvas_parts[17])
+    else:
+        origin_x = _safe_float(ee_data_str["head"].get("x"))
+        origin_y = _safe_float(ee_data_str["head"].get("y"))
+    ee_footprint.model_3d = model_3d_of_node(
+        node=parse_svgnode(fields) or {},
+        canvas_origin_x=origin_x,
+        canvas_origin_y=origin_y,
+    )
+
+
+@footprint_shape_handlers.register("SOLIDREGION")
+def add_easyeda_solid_region(
+    fields: list[str], ee_footprint: EeFootprint, ee_data_str: dict[str, Any]
+) -> None:
+    # Format: SOLIDREGION~layer_id~net~path~region_type~id~~[is_locked]
+    if len(fields) >= 5:
+        ee_footprint.solid_regions.append(
+            EeFootprintSolidRegion(
+                layer_id=_safe_int(fields[1], 3),
+                path=fields[3],
+                region_type=fields[4],
+            )
+        )
 
 
 class EasyedaSymbolImporter:
@@ -419,6 +414,19 @@ class EasyedaSymbolImporter:
         ee_data_info: dict[str, Any],
         shared_origin: tuple[float, float] | None,
     ) -> EeSymbol:
+        new_ee_symbol = self._unit_header(ee_data, ee_data_info, shared_origin)
+        for line in ee_data["dataStr"]["shape"]:
+            symbol_shape_handlers.dispatch(line, new_ee_symbol)
+
+        return new_ee_symbol
+
+    @staticmethod
+    def _unit_header(
+        ee_data: dict[str, Any],
+        ee_data_info: dict[str, Any],
+        shared_origin: tuple[float, float] | None,
+    ) -> EeSymbol:
+        """Info and bbox of a unit, without its shapes."""
         bbox_data = ee_data["dataStr"].get("BBox", {})
 
         bbox_x = _safe_float(bbox_data.get("x"))
@@ -441,7 +449,7 @@ class EasyedaSymbolImporter:
         lcsc_dict = ee_data.get("lcsc") or {}
         lcsc_number = lcsc_dict.get("number", "")
 
-        new_ee_symbol = EeSymbol(
+        return EeSymbol(
             info=EeSymbolInfo(
                 name=_sanitize_component_name(ee_data_info["name"]),
                 prefix=ee_data_info["pre"],
@@ -468,46 +476,67 @@ class EasyedaSymbolImporter:
             ),
         )
 
-        for line in ee_data["dataStr"]["shape"]:
-            designator = line.split("~")[0]
-            if designator in easyeda_handlers:
-                easyeda_handlers[designator](line, new_ee_symbol)
-            else:
-                logging.warning(f"Unknown symbol designator: {designator}")
 
-        return new_ee_symbol
+def _footprint_arguments(cad_data: dict[str, Any]) -> dict[str, Any]:
+    """Arguments of EasyedaFootprintImporter.extract_easyeda_data for *cad_data*."""
+    c_para = cad_data["packageDetail"]["dataStr"]["head"]["c_para"]
+    # Primary source: customData.jlcPara.assemblyProcess ("SMT" / "THT").
+    # Fallback: top-level SMT flag + title heuristic for older API responses.
+    assembly = (
+        cad_data.get("customData", {}).get("jlcPara", {}).get("assemblyProcess", "")
+    )
+    if assembly:
+        is_smd = assembly.upper() == "SMT"
+    else:
+        is_smd = (
+            bool(cad_data.get("SMT"))
+            and "-TH_" not in cad_data["packageDetail"]["title"]
+        )
+    return {
+        "ee_data_str": cad_data["packageDetail"]["dataStr"],
+        "ee_data_info": c_para,
+        "is_smd": is_smd,
+        "lcsc_id": cad_data.get("lcsc", {}).get("number", ""),
+        "manufacturer": c_para.get("Manufacturer", "")
+        or c_para.get("BOM_Manufacturer", ""),
+        "mpn": c_para.get("Manufacturer Part", "")
+        or c_para.get("BOM_Manufacturer Part", ""),
+        "description": cad_data.get("description", ""),
+    }
+
+
+def _footprint_header(
+    ee_data_str: dict[str, Any],
+    ee_data_info: dict[str, Any],
+    is_smd: bool,
+    lcsc_id: str = "",
+    manufacturer: str = "",
+    mpn: str = "",
+    description: str = "",
+) -> EeFootprint:
+    """Info and bbox of a footprint, without its shapes."""
+    return EeFootprint(
+        info=EeFootprintInfo(
+            name=ee_data_info["package"],
+            fp_type="smd" if is_smd else "tht",
+            model_3d_name=ee_data_info.get("3DModel", ""),
+            lcsc_id=lcsc_id,
+            manufacturer=manufacturer,
+            mpn=mpn,
+            description=description,
+        ),
+        bbox=EeFootprintBbox(
+            x=_safe_float(ee_data_str["head"].get("x")),
+            y=_safe_float(ee_data_str["head"].get("y")),
+        ),
+        model_3d=None,
+    )
 
 
 class EasyedaFootprintImporter:
     def __init__(self, easyeda_cp_cad_data: dict[str, Any]):
         self.input = easyeda_cp_cad_data
-        _c_para = self.input["packageDetail"]["dataStr"]["head"]["c_para"]
-        # Primary source: customData.jlcPara.assemblyProcess ("SMT" / "THT").
-        # Fallback: top-level SMT flag + title heuristic for older API responses.
-        _assembly = (
-            self.input.get("customData", {})
-            .get("jlcPara", {})
-            .get("assemblyProcess", "")
-        )
-        if _assembly:
-            _is_smd = _assembly.upper() == "SMT"
-        else:
-            _is_smd = (
-                bool(self.input.get("SMT"))
-                and "-TH_" not in self.input["packageDetail"]["title"]
-            )
-
-        self.output = self.extract_easyeda_data(
-            ee_data_str=self.input["packageDetail"]["dataStr"],
-            ee_data_info=_c_para,
-            is_smd=_is_smd,
-            lcsc_id=self.input.get("lcsc", {}).get("number", ""),
-            manufacturer=_c_para.get("Manufacturer", "")
-            or _c_para.get("BOM_Manufacturer", ""),
-            mpn=_c_para.get("Manufacturer Part", "")
-            or _c_para.get("BOM_Manufacturer Part", ""),
-            description=self.input.get("description", ""),
-        )
+        self.output = self.extract_easyeda_data(**_footprint_arguments(self.input))
 
     def get_footprint(self) -> EeFootprint:
         return self.output
@@ -522,99 +551,17 @@ class EasyedaFootprintImporter:
         mpn: str = "",
         description: str = "",
     ) -> EeFootprint:
-        new_ee_footprint = EeFootprint(
-            info=EeFootprintInfo(
-                name=ee_data_info["package"],
-                fp_type="smd" if is_smd else "tht",
-                model_3d_name=ee_data_info.get("3DModel", ""),
-                lcsc_id=lcsc_id,
-                manufacturer=manufacturer,
-                mpn=mpn,
-                description=description,
-            ),
-            bbox=EeFootprintBbox(
-                x=_safe_float(ee_data_str["head"].get("x")),
-                y=_safe_float(ee_data_str["head"].get("y")),
-            ),
-            model_3d=None,
+        new_ee_footprint = _footprint_header(
+            ee_data_str=ee_data_str,
+            ee_data_info=ee_data_info,
+            is_smd=is_smd,
+            lcsc_id=lcsc_id,
+            manufacturer=manufacturer,
+            mpn=mpn,
+            description=description,
         )
-
         for line in ee_data_str["shape"]:
-            ee_designator = line.split("~")[0]
-            ee_fields = line.split("~")[1:]
-
-            if ee_designator == "PAD":
-                ee_pad = EeFootprintPad(
-                    **dict(
-                        zip([f.name for f in fields(EeFootprintPad)], ee_fields[:18])
-                    )
-                )
-                new_ee_footprint.pads.append(ee_pad)
-            elif ee_designator == "TRACK":
-                ee_track = EeFootprintTrack(
-                    **dict(zip([f.name for f in fields(EeFootprintTrack)], ee_fields))
-                )
-                new_ee_footprint.tracks.append(ee_track)
-            elif ee_designator == "HOLE":
-                ee_hole = EeFootprintHole(
-                    **dict(zip([f.name for f in fields(EeFootprintHole)], ee_fields))
-                )
-                new_ee_footprint.holes.append(ee_hole)
-            elif ee_designator == "VIA":
-                ee_via = EeFootprintVia(
-                    **dict(zip([f.name for f in fields(EeFootprintVia)], ee_fields))
-                )
-                new_ee_footprint.vias.append(ee_via)
-            elif ee_designator == "CIRCLE":
-                ee_circle = EeFootprintCircle(
-                    **dict(zip([f.name for f in fields(EeFootprintCircle)], ee_fields))
-                )
-                new_ee_footprint.circles.append(ee_circle)
-            elif ee_designator == "ARC":
-                ee_arc = EeFootprintArc(
-                    **dict(zip([f.name for f in fields(EeFootprintArc)], ee_fields))
-                )
-                new_ee_footprint.arcs.append(ee_arc)
-            elif ee_designator == "RECT":
-                ee_rectangle = EeFootprintRectangle(
-                    **dict(
-                        zip([f.name for f in fields(EeFootprintRectangle)], ee_fields)
-                    )
-                )
-                new_ee_footprint.rectangles.append(ee_rectangle)
-            elif ee_designator == "TEXT":
-                ee_text = EeFootprintText(
-                    **dict(zip([f.name for f in fields(EeFootprintText)], ee_fields))
-                )
-                new_ee_footprint.texts.append(ee_text)
-            elif ee_designator == "SVGNODE":
-                # canvas.split("~")[16] and [17] are the authoritative canvas origin.
-                # Fall back to head.x/y if the canvas string is absent or too short.
-                _canvas_parts = ee_data_str.get("canvas", "").split("~")
-                if len(_canvas_parts) > 17:
-                    _cox = _safe_float(_canvas_parts[16])
-                    _coy = _safe_float(_canvas_parts[17])
-                else:
-                    _cox = _safe_float(ee_data_str["head"].get("x"))
-                    _coy = _safe_float(ee_data_str["head"].get("y"))
-                new_ee_footprint.model_3d = Easyeda3dModelImporter(
-                    easyeda_cp_cad_data=[line],
-                    download_raw_3d_model=False,
-                    canvas_origin_x=_cox,
-                    canvas_origin_y=_coy,
-                ).output
-
-            elif ee_designator == "SOLIDREGION":
-                # Format: SOLIDREGION~layer_id~net~path~region_type~id~~[is_locked]
-                if len(ee_fields) >= 4:
-                    region = EeFootprintSolidRegion(
-                        layer_id=_safe_int(ee_fields[0], 3),
-                        path=ee_fields[2] if len(ee_fields) > 2 else "",
-                        region_type=ee_fields[3] if len(ee_fields) > 3 else "solid",
-                    )
-                    new_ee_footprint.solid_regions.append(region)
-            else:
-                logging.warning(f"Unknown footprint designator: {ee_designator}")
+            footprint_shape_handlers.dispatch(line, new_ee_footprint, ee_data_str)
 
         return new_ee_footprint
 
@@ -622,12 +569,96 @@ class EasyedaFootprintImporter:
 # ------------------------------------------------------------------------------
 
 
-class Easyeda3dModelImporter:
-    # EasyEDA canvas scale: 1 canvas-unit = 0.254 mm
-    _CANVAS_SCALE = 0.254
-    # Outline-fix threshold: if |outline_centre - c_origin| > 0.1mm
-    _FIX_THRESHOLD = 0.1
+# EasyEDA canvas scale: 1 canvas-unit = 0.254 mm
+_CANVAS_SCALE = 0.254
+# Outline-fix threshold: if |outline_centre - c_origin| > 0.1mm
+_FIX_THRESHOLD = 0.1
+
+
+def parse_svgnode(fields: list[str]) -> dict[str, Any] | None:
+    """JSON node of the fields of an SVGNODE line (3D model info).
+
+    None when the line carries no node, {} when it is not valid JSON.
+    """
+    if len(fields) < 2:
+        return None
+    try:
+        parsed_json: dict[str, Any] = json.loads(fields[1])
+        # Full node, parse_3d_model_node needs its childNodes
+        return parsed_json
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to parse 3D model JSON: {e}")
+        return {}
 
+
+def _outline_centre_mm(
+    node: dict[str, Any], canvas_origin_x: float, canvas_origin_y: float
+) -> tuple[float, float] | None:
+    """Compute 2D outline bbox centre in mm.
+
+    Returns (cx_mm, cy_mm) or None if no childNode points are found.
+    """
+    xs: list[float] = []
+    ys: list[float] = []
+    ox, oy = canvas_origin_x, canvas_origin_y
+    scale = _CANVAS_SCALE
+    for child in node.get("childNodes", []):
+        pts = child.get("attrs", {}).get("points", "").split()
+        for i in range(0, len(pts) - 1, 2):
+            xs.append((_safe_float(pts[i]) - ox) * scale)
+            ys.append(-(_safe_float(pts[i + 1]) - oy) * scale)
+    if not xs:
+        return None
+    return ((min(xs) + max(xs)) / 2.0, (min(ys) + max(ys)) / 2.0)
+
+
+def parse_3d_model_node(
+    node: dict[str, Any], canvas_origin_x: float, canvas_origin_y: float
+) -> Ee3dModel:
+    info = node.get("attrs", {})
+    scale = _CANVAS_SCALE
+    ox, oy = canvas_origin_x, canvas_origin_y
+
+    co = info.get("c_origin", "0,0").split(",")
+    c_ox = _safe_float(co[0] if co else "0")
+    c_oy = _safe_float(co[1] if len(co) > 1 else "0")
+
+    # Primary offset: (c_origin - canvas_origin) * scale, Y negated
+    # tx = (c_ox - ox)*scale, ty = -(c_oy - oy)*scale
+    tx = (c_ox - ox) * scale
+    ty = -(c_oy - oy) * scale
+    tz = _safe_float(info.get("z", "0")) * scale
+
+    # Outline-centre correction: if |centre - offset| > 0.1mm → use centre
+    outline = _outline_centre_mm(node, ox, oy)
+    if outline is not None:
+        out_x, out_y = outline
+        if abs(out_x - tx) > _FIX_THRESHOLD or abs(out_y - ty) > _FIX_THRESHOLD:
+            logging.debug(
+                f"3D outline fix for {info.get('uuid', '?')}: "
+                f"({tx:.3f},{ty:.3f}) → ({out_x:.3f},{out_y:.3f})"
+            )
+            tx, ty = out_x, out_y
+
+    return Ee3dModel(
+        name=info["title"],
+        uuid=info["uuid"],
+        translation=Ee3dModelBase(x=tx, y=ty, z=tz),
+        rotation=_MODEL_3D_BASE.make(info.get("c_rotation", "0,0,0").split(",")),
+    )
+
+
+def model_3d_of_node(
+    node: dict[str, Any], canvas_origin_x: float, canvas_origin_y: float
+) -> Ee3dModel | None:
+    """3D model info of an SVGNODE *node*; None (with a warning) when empty."""
+    if node:
+        return parse_3d_model_node(node, canvas_origin_x, canvas_origin_y)
+    logging.warning("No 3D model available for this component")
+    return None
+
+
+class Easyeda3dModelImporter:
     def __init__(
         self,
         easyeda_cp_cad_data: dict[str, Any] | list[str],
@@ -635,10 +666,13 @@ class Easyeda3dModelImporter:
         api: EasyedaApi | None = None,
         canvas_origin_x: float | None = None,
         canvas_origin_y: float | None = None,
+        stream_step: bool = False,
     ):
         self.input = easyeda_cp_cad_data
         self.download_raw_3d_model = download_raw_3d_model
         self.api = api
+        # Download the STEP model to a file (Ee3dModel.step_file) instead of memory
+        self.stream_step = stream_step
         if canvas_origin_x is None or canvas_origin_y is None:
             _head = (
                 easyeda_cp_cad_data.get("packageDetail", {})
@@ -661,90 +695,46 @@ class Easyeda3dModelImporter:
             else self.input
         )
 
-        if model_3d_info := self.get_3d_model_info(ee_data=ee_data):
-            model_3d: Ee3dModel = self.parse_3d_model_info(node=model_3d_info)
-            if self.download_raw_3d_model:
-                api = self.api or EasyedaApi()
-                model_3d.raw_obj = api.get_raw_3d_model_obj(uuid=model_3d.uuid)
-                model_3d.step = api.get_step_3d_model(uuid=model_3d.uuid)
-            return model_3d
-
-        logging.warning("No 3D model available for this component")
-        return None
+        model_3d = model_3d_of_node(
+            self.get_3d_model_info(ee_data=ee_data),
+            self.canvas_origin_x,
+            self.canvas_origin_y,
+        )
+        if model_3d is not None and self.download_raw_3d_model:
+            self.download_3d_assets(model_3d)
+        return model_3d
+
+    def download_3d_assets(self, model_3d: Ee3dModel) -> None:
+        """Fetch the OBJ and STEP files of *model_3d* concurrently."""
+        api = self.api or EasyedaApi()
+        obj_task = run_in_background(api.get_raw_3d_model_obj, uuid=model_3d.uuid)
+        if self.stream_step:
+            step_file_task = run_in_background(
+                api.download_step_3d_model, uuid=model_3d.uuid
+            )
+            try:
+                model_3d.raw_obj = obj_task.result()
+            finally:
+                # Don't leave the STEP download running if the OBJ one failed
+                step_file_task.join()
+            step_file = step_file_task.result()
+            model_3d.step_file = str(step_file) if step_file else None
+        else:
+            step_task = run_in_background(api.get_step_3d_model, uuid=model_3d.uuid)
+            try:
+                model_3d.raw_obj = obj_task.result()
+            finally:
+                step_task.join()
+            model_3d.step = step_task.result()
 
     def get_3d_model_info(self, ee_data: list[str]) -> dict[str, Any]:
         for line in ee_data:
-            ee_designator = line.split("~")[0]
-            if ee_designator == "SVGNODE":
-                split_data = line.split("~")[1:]
-                if split_data:
-                    raw_json = split_data[0]
-                    try:
-                        parsed_json: dict[str, Any] = json.loads(raw_json)
-                        # Return full node so parse_3d_model_info can access childNodes
-                        return parsed_json
-                    except json.JSONDecodeError as e:
-                        logging.error(f"Failed to parse 3D model JSON: {e}")
-                        return {}
+            # Only the SVGNODE line is split
+            if designator_of(line) == "SVGNODE":
+                node = parse_svgnode(split_fields(line))
+                if node is not None:
+                    return node
         return {}
 
-    def _outline_centre_mm(self, node: dict[str, Any]) -> tuple[float, float] | None:
-        """Compute 2D outline bbox centre in mm.
-
-        Returns (cx_mm, cy_mm) or None if no childNode points are found.
-        """
-        xs: list[float] = []
-        ys: list[float] = []
-        ox, oy = self.canvas_origin_x, self.canvas_origin_y
-        scale = self._CANVAS_SCALE
-        for child in node.get("childNodes", []):
-            pts = child.get("attrs", {}).get("points", "").split()
-            for i in range(0, len(pts) - 1, 2):
-                xs.append((_safe_float(pts[i]) - ox) * scale)
-                ys.append(-(_safe_float(pts[i + 1]) - oy) * scale)
-        if not xs:
-            return None
-        return ((min(xs) + max(xs)) / 2.0, (min(ys) + max(ys)) / 2.0)
-
     def parse_3d_model_info(self, node: dict[str, Any]) -> Ee3dModel:
-        info = node.get("attrs", {})
-        scale = self._CANVAS_SCALE
-        ox, oy = self.canvas_origin_x, self.canvas_origin_y
-
-        co = info.get("c_origin", "0,0").split(",")
-        c_ox = _safe_float(co[0] if co else "0")
-        c_oy = _safe_float(co[1] if len(co) > 1 else "0")
-
-        # Primary offset: (c_origin - canvas_origin) * scale, Y negated
-        # tx = (c_ox - ox)*scale, ty = -(c_oy - oy)*scale
-        tx = (c_ox - ox) * scale
-        ty = -(c_oy - oy) * scale
-        tz = _safe_float(info.get("z", "0")) * scale
-
-        # Outline-centre correction: if |centre - offset| > 0.1mm → use centre
-        outline = self._outline_centre_mm(node)
-        if outline is not None:
-            out_x, out_y = outline
-            if (
-                abs(out_x - tx) > self._FIX_THRESHOLD
-                or abs(out_y - ty) > self._FIX_THRESHOLD
-            ):
-                logging.debug(
-                    f"3D outline fix for {info.get('uuid', '?')}: "
-                    f"({tx:.3f},{ty:.3f}) → ({out_x:.3f},{out_y:.3f})"
-                )
-                tx, ty = out_x, out_y
-
-        return Ee3dModel(
-            name=info["title"],
-            uuid=info["uuid"],
-            translation=Ee3dModelBase(x=tx, y=ty, z=tz),
-            rotation=Ee3dModelBase(
-                **dict(
-                    zip(
-                        [f.name for f in fields(Ee3dModelBase)],
-                        info.get("c_rotation", "0,0,0").split(","),
-                    )
-                )
-            ),
-        )
+        return parse_3d_model_node(node, self.canvas_origin_x, self.canvas_origin_y)
@@ -31,6 +31,8 @@ import logging
 import re
 from typing import Any
 
+from .shape_tokenizer import ShapeHandlers, split_fields, split_pin
+
 logger = logging.getLogger(__name__)
 
 _PADDING = 1  # minimal margin so strokes at the bbox edge are not clipped (= max stroke-width / 2)
@@ -197,10 +199,9 @@ def _build_svg(elements: list[str], bbox: _BBox, title: str, bg_color: str) -> s
 # ---------------------------------------------------------------------------
 
 
-def _render_pin(shape: str, bbox: _BBox) -> str:
+def _render_pin(segments: list[list[str]], bbox: _BBox) -> str:
     """P~visibility~type~spice_pin_number~x~y~rotation~id~is_locked^^dot_x~dot_y^^path~color^^name_data^^number_data^^dot_data^^clock_data"""
-    segments = shape.split("^^")
-    parts = segments[0].split("~")
+    parts = segments[0]
     if len(parts) < 6:
         return ""
 
@@ -212,13 +213,13 @@ def _render_pin(shape: str, bbox: _BBox) -> str:
 
     # Segment 1: dot_x~dot_y (connection-point anchor — bbox only)
     if len(segments) > 1:
-        seg1 = segments[1].split("~")
+        seg1 = segments[1]
         if len(seg1) >= 2:
             bbox.add(_f(seg1[0]), _f(seg1[1]))
 
     # Segment 2: path~color (pin line)
     if len(segments) > 2:
-        path_segs = segments[2].split("~")
+        path_segs = segments[2]
         path_d = path_segs[0] if path_segs else ""
         stroke = _color(path_segs[1] if len(path_segs) > 1 else "", "#880000")
         if path_d:
@@ -234,7 +235,7 @@ def _render_pin(shape: str, bbox: _BBox) -> str:
     for seg_idx in (3, 4):
         if len(segments) <= seg_idx:
             break
-        seg_parts = segments[seg_idx].split("~")
+        seg_parts = segments[seg_idx]
         if len(seg_parts) < 5 or not seg_parts[4] or seg_parts[0] in ("0", ""):
             continue
         tx, ty = _f(seg_parts[1]), _f(seg_parts[2])
@@ -259,7 +260,7 @@ def _render_pin(shape: str, bbox: _BBox) -> str:
 
     # Segment 5: dot_circle — show~cx~cy (active-low inversion indicator)
     if len(segments) > 5:
-        dot_parts = segments[5].split("~")
+        dot_parts = segments[5]
         if dot_parts[0] not in ("0", "") and len(dot_parts) >= 3:
             dcx, dcy = _f(dot_parts[1]), _f(dot_parts[2])
             bbox.add(dcx, dcy)
@@ -269,7 +270,7 @@ def _render_pin(shape: str, bbox: _BBox) -> str:
 
     # Segment 6: clock_symbol — show~path
     if len(segments) > 6:
-        clk_parts = segments[6].split("~")
+        clk_parts = segments[6]
         if clk_parts[0] not in ("0", "") and len(clk_parts) >= 2 and clk_parts[1]:
             _bbox_from_path(clk_parts[1], bbox)
             elems.append(
@@ -279,9 +280,8 @@ def _render_pin(shape: str, bbox: _BBox) -> str:
     return "\n".join(elems)
 
 
-def _render_polyline(shape: str, bbox: _BBox, closed: bool = False) -> str:
+def _render_polyline(parts: list[str], bbox: _BBox, closed: bool = False) -> str:
     """PL/PG~points~stroke_color~stroke_width~stroke_style~fill_color~id~locked"""
-    parts = shape.split("~")
     if len(parts) < 2:
         return ""
     pts = _parse_points(parts[1])
@@ -296,9 +296,8 @@ def _render_polyline(shape: str, bbox: _BBox, closed: bool = False) -> str:
     return f'<{tag} points="{pts_attr}" stroke="{stroke}" stroke-width="{width}" fill="{fill}"/>'
 
 
-def _render_ellipse(shape: str, bbox: _BBox) -> str:
+def _render_ellipse(parts: list[str], bbox: _BBox) -> str:
     """E~center_x~center_y~radius_x~radius_y~stroke_color~stroke_width~stroke_style~fill_color~id~locked"""
-    parts = shape.split("~")
     if len(parts) < 5:
         return ""
     cx, cy, rx, ry = _f(parts[1]), _f(parts[2]), _f(parts[3]), _f(parts[4])
@@ -310,9 +309,8 @@ def _render_ellipse(shape: str, bbox: _BBox) -> str:
     return f'<ellipse cx="{cx}" cy="{cy}" rx="{rx}" ry="{ry}" stroke="{stroke}" stroke-width="{width}" fill="{fill}"/>'
 
 
-def _render_circle(shape: str, bbox: _BBox) -> str:
+def _render_circle(parts: list[str], bbox: _BBox) -> str:
     """C~center_x~center_y~radius~stroke_color~stroke_width~stroke_style~fill_color~id~locked"""
-    parts = shape.split("~")
     if len(parts) < 4:
         return ""
     cx, cy, r = _f(parts[1]), _f(parts[2]), _f(parts[3])
@@ -324,14 +322,13 @@ def _render_circle(shape: str, bbox: _BBox) -> str:
     return f'<circle cx="{cx}" cy="{cy}" r="{r}" stroke="{stroke}" stroke-width="{width}" fill="{fill}"/>'
 
 
-def _render_rectangle(shape: str, bbox: _BBox) -> str:
+def _render_rectangle(parts: list[str], bbox: _BBox) -> str:
     """R~x~y~[rx~ry]~width~height~stroke_color~stroke_width~stroke_style~fill_color~id~locked
 
     EasyEDA uses two variants: empty strings at positions 3+4 mean no rounded
     corners; numeric values mean rounded corners with those radii.  In both
     cases width/height live at positions 5+6 and color/stroke/fill at 7+.
     """
-    parts = shape.split("~")
     if len(parts) < 7:
         return ""
     x, y = _f(parts[1]), _f(parts[2])
@@ -350,13 +347,12 @@ def _render_rectangle(shape: str, bbox: _BBox) -> str:
     )
 
 
-def _render_arc(shape: str, _bbox: _BBox) -> str:
+def _render_arc(parts: list[str], _bbox: _BBox) -> str:
     """A~path~helper_dots~stroke_color~stroke_width~stroke_style~fill_color~id~locked
 
     bbox is intentionally unused: SVG arc flags (0/1) are misread as coordinates
     by _bbox_from_path, producing bogus (0,0) points. API BBox is authoritative.
     """
-    parts = shape.split("~")
     if len(parts) < 2:
         return ""
     path_d = parts[1]
@@ -368,9 +364,8 @@ def _render_arc(shape: str, _bbox: _BBox) -> str:
     )
 
 
-def _render_path(shape: str, bbox: _BBox) -> str:
+def _render_path(parts: list[str], bbox: _BBox) -> str:
     """PT~path~stroke_color~stroke_width~stroke_style~fill_color~id~locked"""
-    parts = shape.split("~")
     if len(parts) < 2:
         return ""
     path_d = parts[1]
@@ -383,9 +378,8 @@ def _render_path(shape: str, bbox: _BBox) -> str:
     )
 
 
-def _render_text(shape: str, bbox: _BBox) -> str:
+def _render_text(parts: list[str], bbox: _BBox) -> str:
     """T~type~x~y~rotation~color~font~font_size~stroke_width~baseline~text_anchor~role~text~display~..."""
-    parts = shape.split("~")
     if len(parts) < 13 or not parts[12]:
         return ""
     if len(parts) > 13 and parts[13] == "0":
@@ -411,17 +405,27 @@ def _render_text(shape: str, bbox: _BBox) -> str:
     )
 
 
-_SYMBOL_RENDERERS: dict[str, Any] = {
-    "P": _render_pin,
-    "PL": _render_polyline,
-    "PG": lambda s, b: _render_polyline(s, b, closed=True),
-    "E": _render_ellipse,
-    "C": _render_circle,
-    "R": _render_rectangle,
-    "A": _render_arc,
-    "PT": _render_path,
-    "T": _render_text,
-}
+def _render_polygon(parts: list[str], bbox: _BBox) -> str:
+    return _render_polyline(parts, bbox, closed=True)
+
+
+def _unhandled_symbol_shape(designator: str) -> None:
+    logger.debug("render_symbol_svg: unhandled shape type %r", designator)
+
+
+_SYMBOL_RENDERERS: ShapeHandlers[str] = ShapeHandlers(_unhandled_symbol_shape)
+_SYMBOL_RENDERERS.register("P", tokenizer=split_pin)(_render_pin)
+for _designator, _renderer in (
+    ("PL", _render_polyline),
+    ("PG", _render_polygon),
+    ("E", _render_ellipse),
+    ("C", _render_circle),
+    ("R", _render_rectangle),
+    ("A", _render_arc),
+    ("PT", _render_path),
+    ("T", _render_text),
+):
+    _SYMBOL_RENDERERS.register(_designator)(_renderer)
 
 
 # ---------------------------------------------------------------------------
@@ -449,14 +453,9 @@ def render_symbol_svg(api_result: dict[str, Any], bg_color: str = "white") -> st
     for shape in shapes:
         if not isinstance(shape, str):
             continue
-        designator = shape.split("~")[0]
-        renderer = _SYMBOL_RENDERERS.get(designator)
-        if renderer:
-            svg_elem = renderer(shape, bbox)
-            if svg_elem:
-                elements.append(svg_elem)
-        else:
-            logger.debug("render_symbol_svg: unhandled shape type %r", designator)
+        svg_elem = _SYMBOL_RENDERERS.dispatch(shape, bbox)
+        if svg_elem:
+            elements.append(svg_elem)
 
     return _build_svg(elements, bbox, title, bg_color=bg_color)
 
@@ -485,7 +484,7 @@ def render_footprint_svg(api_result: dict[str, Any], bg_color: str = "black") ->
     for shape in shapes:
         if not isinstance(shape, str):
             continue
-        parts = shape.split("~")
+        parts = split_fields(shape)
         designator = parts[0]
 
         if designator == "TRACK":
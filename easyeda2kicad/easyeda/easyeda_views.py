@@ -0,0 +1,256 @@
+"""
+Lazy views over the raw CAD data of a part
+
+EasyedaSymbolImporter and EasyedaFootprintImporter parse every shape of a part
+up front. The views below keep the raw dataStr instead and parse one category
+of shapes (pins, graphics, texts, pads, 3D model...) the first time it is
+read. Until then lines are at most grouped by designator, so metadata such as
+the name, package or pin count never splits a shape line.
+
+Shapes are built by the importers' handlers, so a view's ``symbol`` or
+``footprint`` equals the importer output for the same data.
+"""
+
+from __future__ import annotations
+
+# Global imports
+from functools import cached_property, partial
+from typing import Any, Callable, Generic, TypeVar
+
+# Local imports
+from .easyeda_importer import (
+    EasyedaSymbolImporter,
+    _footprint_arguments,
+    _footprint_header,
+    footprint_shape_handlers,
+    symbol_shape_handlers,
+)
+from .parameters_easyeda import (
+    Ee3dModel,
+    EeFootprint,
+    EeFootprintInfo,
+    EeFootprintPad,
+    EeFootprintText,
+    EeSymbol,
+    EeSymbolInfo,
+    EeSymbolPin,
+    EeSymbolText,
+)
+from .shape_tokenizer import ShapeHandlers, designator_of
+
+__all__ = ["EasyedaSymbolView", "EasyedaFootprintView"]
+
+M = TypeVar("M")
+
+# Shape categories: designator -> attribute of the model it fills
+_SYMBOL_CATEGORIES: dict[str, dict[str, str]] = {
+    "pins": {"P": "pins"},
+    "graphics": {
+        "R": "rectangles",
+        "E": "ellipses",
+        "C": "circles",
+        "A": "arcs",
+        "PL": "polylines",
+        "PG": "polygons",
+        "PT": "paths",
+    },
+    "texts": {"T": "texts"},
+}
+_FOOTPRINT_CATEGORIES: dict[str, dict[str, str]] = {
+    "pads": {"PAD": "pads"},
+    "graphics": {
+        "TRACK": "tracks",
+        "CIRCLE": "circles",
+        "ARC": "arcs",
+        "RECT": "rectangles",
+        "SOLIDREGION": "solid_regions",
+    },
+    "holes": {"HOLE": "holes", "VIA": "vias"},
+    "texts": {"TEXT": "texts"},
+    "model_3d": {"SVGNODE": "model_3d"},
+}
+
+
+class _LazyShapes(Generic[M]):
+    """Shape lines of one dataStr, parsed category by category.
+
+    *new_model* returns an empty model sharing the info and bbox of the part;
+    each category is dispatched into one of its own.
+    """
+
+    def __init__(
+        self,
+        lines: list[str],
+        new_model: Callable[[], M],
+        handlers: ShapeHandlers[None],
+        categories: dict[str, dict[str, str]],
+        *handler_args: Any,
+    ) -> None:
+        self.new_model: Callable[[], M] = new_model
+        self.handlers = handlers
+        self.categories = categories
+        self.handler_args = handler_args
+        self._raw_lines = lines
+        self._parsed: dict[str, M] = {}
+
+    @cached_property
+    def lines(self) -> dict[str, list[str]]:
+        """Unsplit shape lines by designator."""
+        lines: dict[str, list[str]] = {}
+        for line in self._raw_lines:
+            lines.setdefault(designator_of(line), []).append(line)
+        return lines
+
+    def count(self, designator: str) -> int:
+        return len(self.lines.get(designator, ()))
+
+    def category(self, name: str) -> M:
+        """Model holding the shapes of category *name* only."""
+        model = self._parsed.get(name)
+        if model is None:
+            model = self.new_model()
+            for designator in self.categories[name]:
+                for line in self.lines.get(designator, ()):
+                    self.handlers.dispatch(line, model, *self.handler_args)
+            self._parsed[name] = model
+        return model
+
+    def compose(self) -> M:
+        """Model holding every shape, as the importer builds it."""
+        model = self.new_model()
+        for name, attributes in self.categories.items():
+            parsed = self.category(name)
+            for attribute in attributes.values():
+                setattr(model, attribute, getattr(parsed, attribute))
+        for designator, lines in self.lines.items():
+            if designator not in self.handlers and self.handlers.on_unknown:
+                for _ in lines:
+                    self.handlers.on_unknown(designator)
+        return model
+
+
+class EasyedaSymbolView:
+    """Symbol of a part, parsed on demand.
+
+    Reading ``info``, ``name``, ``package`` or ``pin_count`` parses no shape;
+    ``pins``, ``graphics`` and ``texts`` parse their category only, in every
+    unit of a multi-unit symbol.
+    """
+
+    def __init__(self, easyeda_cp_cad_data: dict[str, Any]):
+        self.input = easyeda_cp_cad_data
+        subparts: list[dict[str, Any]] = easyeda_cp_cad_data.get("subparts", [])
+        shared_origin = EasyedaSymbolImporter._shared_origin(subparts)
+        self._headers: list[EeSymbol] = []
+        self._units: list[_LazyShapes[EeSymbol]] = []
+        for ee_data in [easyeda_cp_cad_data] + subparts:
+            header = EasyedaSymbolImporter._unit_header(
+                ee_data=ee_data,
+                ee_data_info=ee_data["dataStr"]["head"]["c_para"],
+                shared_origin=shared_origin,
+            )
+            self._headers.append(header)
+            self._units.append(
+                _LazyShapes(
+                    ee_data["dataStr"]["shape"],
+                    partial(EeSymbol, info=header.info, bbox=header.bbox),
+                    symbol_shape_handlers,
+                    _SYMBOL_CATEGORIES,
+                )
+            )
+
+    @property
+    def info(self) -> EeSymbolInfo:
+        return self._headers[0].info
+
+    @property
+    def name(self) -> str:
+        return self.info.name
+
+    @property
+    def package(self) -> str:
+        return self.info.package
+
+    @cached_property
+    def pin_count(self) -> int:
+        return sum(unit.count("P") for unit in self._units)
+
+    @property
+    def pins(self) -> list[EeSymbolPin]:
+        """Pins of all units, main unit first."""
+        return [pin for unit in self._units for pin in unit.category("pins").pins]
+
+    @property
+    def texts(self) -> list[EeSymbolText]:
+        """Texts of all units, main unit first."""
+        return [text for unit in self._units for text in unit.category("texts").texts]
+
+    @property
+    def graphics(self) -> EeSymbol:
+        """The symbol with its graphic shapes only (no pins, no texts)."""
+        graphics = self._units[0].category("graphics")
+        graphics.sub_symbols = [unit.category("graphics") for unit in self._units[1:]]
+        return graphics
+
+    @cached_property
+    def symbol(self) -> EeSymbol:
+        """The complete symbol, equal to EasyedaSymbolImporter's output."""
+        symbol = self._units[0].compose()
+        symbol.sub_symbols = [unit.compose() for unit in self._units[1:]]
+        return symbol
+
+
+class EasyedaFootprintView:
+    """Footprint of a part, parsed on demand.
+
+    Reading ``info``, ``name`` or ``pad_count`` parses no shape; ``pads``,
+    ``texts`` and ``model_3d`` parse their category only (``model_3d`` reads
+    the SVGNODE line and nothing else).
+    """
+
+    def __init__(self, easyeda_cp_cad_data: dict[str, Any]):
+        self.input = easyeda_cp_cad_data
+        arguments = _footprint_arguments(easyeda_cp_cad_data)
+        self._header = _footprint_header(**arguments)
+        self._shapes = _LazyShapes(
+            arguments["ee_data_str"]["shape"],
+            partial(
+                EeFootprint,
+                info=self._header.info,
+                bbox=self._header.bbox,
+                model_3d=None,
+            ),
+            footprint_shape_handlers,
+            _FOOTPRINT_CATEGORIES,
+            arguments["ee_data_str"],
+        )
+
+    @property
+    def info(self) -> EeFootprintInfo:
+        return self._header.info
+
+    @property
+    def name(self) -> str:
+        return self.info.name
+
+    @cached_property
+    def pad_count(self) -> int:
+        return self._shapes.count("PAD")
+
+    @property
+    def pads(self) -> list[EeFootprintPad]:
+        return self._shapes.category("pads").pads
+
+    @property
+    def texts(self) -> list[EeFootprintText]:
+        return self._shapes.category("texts").texts
+
+    @property
+    def model_3d(self) -> Ee3dModel | None:
+        """3D model info of the SVGNODE, without its assets."""
+        return self._shapes.category("model_3d").model_3d
+
+    @cached_property
+    def footprint(self) -> EeFootprint:
+        """The complete footprint, equal to EasyedaFootprintImporter's output."""
+        return self._shapes.compose()
@@ -0,0 +1,212 @@
+"""
+Persistent HTTP/1.1 connections for urllib
+
+urllib opens a new TCP (and TLS) session for every request. KeepAliveHandler
+plugs a per-host connection pool into a regular urllib opener, so redirects,
+proxies and HTTPError handling keep working while sockets are reused.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import http.client
+import logging
+import ssl
+import threading
+import urllib.error
+import urllib.request
+from typing import Callable, Optional, Union, cast
+
+_PoolKey = tuple[str, str, Optional[str]]
+_Connection = Union[http.client.HTTPConnection, http.client.HTTPSConnection]
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """HTTPResponse that hands its connection back to the pool when closed."""
+
+    _release: Callable[[bool], None] | None = None
+    # Called once the response is closed, after the connection is released
+    on_close: Callable[[], None] | None = None
+
+    def close(self) -> None:
+        # http.client drops fp as soon as the body is fully consumed; only then
+        # is the socket positioned at the start of the next response.
+        reusable = self.fp is None and not self.will_close and not self.length
+        super().close()
+        release, self._release = self._release, None
+        if release is not None:
+            release(reusable)
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class ConnectionPool:
+    """Thread-safe store of idle persistent connections, keyed per host."""
+
+    def __init__(self, max_idle_per_host: int = 4) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[_PoolKey, list[_Connection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: _PoolKey) -> _Connection | None:
+        """Return an idle connection for *key*, or None if none is available."""
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def release(self, key: _PoolKey, conn: _Connection) -> None:
+        """Return *conn* to the pool, closing it if the host's slots are full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def idle_count(self, key: _PoolKey | None = None) -> int:
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, []))
+            return sum(len(conns) for conns in self._idle.values())
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class KeepAliveHandler(urllib.request.HTTPHandler, urllib.request.HTTPSHandler):
+    """urllib handler that sends http/https requests over pooled connections.
+
+    A request on a reused connection that fails before any response arrives
+    (the server dropped an idle socket) is retried once on a fresh connection.
+    """
+
+    def __init__(
+        self, pool: ConnectionPool, context: ssl.SSLContext | None = None
+    ) -> None:
+        urllib.request.HTTPSHandler.__init__(self, context=context)
+        self.pool = pool
+        self.context = context
+
+    def http_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self._pooled_open("http", req)
+
+    def https_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self._pooled_open("https", req)
+
+    http_request = urllib.request.AbstractHTTPHandler.do_request_
+    https_request = urllib.request.AbstractHTTPHandler.do_request_
+
+    def _new_connection(
+        self, scheme: str, req: urllib.request.Request, tunnel_headers: dict[str, str]
+    ) -> _Connection:
+        conn: _Connection
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                req.host, timeout=req.timeout, context=self.context
+            )
+        else:
+            conn = http.client.HTTPConnection(req.host, timeout=req.timeout)
+        tunnel_host = getattr(req, "_tunnel_host", None)
+        if tunnel_host:
+            conn.set_tunnel(tunnel_host, headers=tunnel_headers)
+        conn.response_class = _PooledResponse
+        return conn
+
+    def _pooled_open(
+        self, scheme: str, req: urllib.request.Request
+    ) -> http.client.HTTPResponse:
+        if not req.host:
+            raise urllib.error.URLError("no host given")
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers = {name.title(): val for name, val in headers.items()}
+        tunnel_headers: dict[str, str] = {}
+        if "Proxy-Authorization" in headers and getattr(req, "_tunnel_host", None):
+            # Proxy credentials belong to the CONNECT request, not the origin
+            tunnel_headers["Proxy-Authorization"] = headers.pop("Proxy-Authorization")
+
+        key: _PoolKey = (scheme, req.host, getattr(req, "_tunnel_host", None))
+        conn = self.pool.acquire(key)
+        if conn is not None:
+            conn.timeout = req.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(req.timeout)
+            try:
+                response = self._send(conn, req, headers)
+            except (http.client.HTTPException, ConnectionError):
+                # The server dropped the idle socket; retry on a fresh one
+                conn.close()
+                logging.debug(f"Stale connection to {req.host}, reconnecting")
+            except OSError as err:
+                conn.close()
+                raise urllib.error.URLError(err) from err
+            else:
+                return self._attach(response, key, conn, req)
+
+        conn = self._new_connection(scheme, req, tunnel_headers)
+        try:
+            response = self._send(conn, req, headers)
+        except (http.client.HTTPException, OSError) as err:
+            conn.close()
+            raise urllib.error.URLError(err) from err
+        return self._attach(response, key, conn, req)
+
+    @staticmethod
+    def _send(
+        conn: _Connection, req: urllib.request.Request, headers: dict[str, str]
+    ) -> _PooledResponse:
+        conn.request(
+            req.get_method(),
+            req.selector,
+            req.data,
+            headers,
+            encode_chunked=req.has_header("Transfer-encoding"),
+        )
+        return cast(_PooledResponse, conn.getresponse())
+
+    def _attach(
+        self,
+        response: _PooledResponse,
+        key: _PoolKey,
+        conn: _Connection,
+        req: urllib.request.Request,
+    ) -> http.client.HTTPResponse:
+        response._release = _make_release(self.pool, key, conn)
+        response.url = req.get_full_url()
+        response.msg = response.reason  # type: ignore[assignment]
+        return response
+
+
+def _make_release(
+    pool: ConnectionPool, key: _PoolKey, conn: _Connection
+) -> Callable[[bool], None]:
+    def release(reusable: bool) -> None:
+        if reusable and conn.sock is not None:
+            pool.release(key, conn)
+        else:
+            conn.close()
+
+    return release
+
+
+def call_when_closed(
+    response: http.client.HTTPResponse, callback: Callable[[], None]
+) -> None:
+    """Run *callback* once *response* is closed (at once if it is not pooled)."""
+    if isinstance(response, _PooledResponse):
+        response.on_close = callback
+    else:
+        callback()
+
+
+def build_keep_alive_opener(
+    pool: ConnectionPool, context: ssl.SSLContext | None = None
+) -> urllib.request.OpenerDirector:
+    """Return a urllib opener whose http/https traffic goes through *pool*."""
+    return urllib.request.build_opener(KeepAliveHandler(pool, context=context))
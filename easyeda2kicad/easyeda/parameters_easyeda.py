@@ -1,19 +1,55 @@
 from __future__ import annotations
 
 # Global imports
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 # Local imports
 from .svg_path_parser import parse_svg_path
 
 
+T = TypeVar("T")
+
+
+def slotted(*extra_slots: str) -> Callable[[type[T]], type[T]]:
+    """Give a dataclass __slots__ instead of a per-instance __dict__.
+
+    Same as ``@dataclass(slots=True)``, which needs Python 3.10. Apply it
+    above @dataclass; *extra_slots* are attributes set outside the fields
+    (e.g. in __post_init__). Shapes exist by the thousand in large parts, and
+    a slotted instance is roughly a third smaller.
+    """
+
+    def wrap(cls: type[T]) -> type[T]:
+        inherited = {
+            name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())
+        }
+        names = [f.name for f in fields(cls)] + list(extra_slots)  # type: ignore[arg-type]
+        namespace = dict(cls.__dict__)
+        # Class attributes holding field defaults would clash with the slots;
+        # the generated __init__ keeps its own reference to the defaults
+        for name in names:
+            namespace.pop(name, None)
+        namespace.pop("__dict__", None)
+        namespace.pop("__weakref__", None)
+        namespace["__slots__"] = tuple(n for n in names if n not in inherited)
+        slotted_cls: type[T] = type(cls.__name__, cls.__bases__, namespace)
+        slotted_cls.__qualname__ = cls.__qualname__
+        return slotted_cls
+
+    return wrap
+
+
 # Safe conversion helpers – used by all EasyEDA dataclass __post_init__ methods.
 # EasyEDA API returns all field values as strings; these helpers handle the conversion.
+# Values that already have the target type (e.g. converted by shape_schema
+# before construction) are returned as they are, so they are converted once.
 def _safe_float(
     value: Union[str, float, int, bool, None], default: float = 0.0
 ) -> float:
+    if type(value) is float:
+        return value
     if value is None or value == "":
         return default
     try:
@@ -23,6 +59,8 @@ def _safe_float(
 
 
 def _safe_int(value: Union[str, float, int, bool, None], default: int = 0) -> int:
+    if type(value) is int:
+        return value
     if value is None or value == "":
         return default
     try:
@@ -55,6 +93,7 @@ class EasyedaPinType(Enum):
 
 
 # ------------------------- Symbol -------------------------
+@slotted()
 @dataclass
 class EeSymbolBbox:
     x: float
@@ -71,6 +110,7 @@ class EeSymbolBbox:
 
 
 # ---------------- PIN ----------------
+@slotted()
 @dataclass
 class EeSymbolPinSettings:
     is_displayed: bool
@@ -101,6 +141,7 @@ class EeSymbolPinSettings:
             )
 
 
+@slotted()
 @dataclass
 class EeSymbolPinDot:
     dot_x: float
@@ -111,6 +152,7 @@ class EeSymbolPinDot:
         self.dot_y = _safe_float(self.dot_y)
 
 
+@slotted()
 @dataclass
 class EeSymbolPinPath:
     path: str
@@ -121,6 +163,7 @@ class EeSymbolPinPath:
             self.path = self.path.replace("v", "h")
 
 
+@slotted()
 @dataclass
 class EeSymbolPinName:
     is_displayed: bool
@@ -144,6 +187,7 @@ class EeSymbolPinName:
             self.font_size = _safe_float(self.font_size, 7.0)
 
 
+@slotted()
 @dataclass
 class EeSymbolPinDotBis:
     is_displayed: bool
@@ -156,6 +200,7 @@ class EeSymbolPinDotBis:
         self.is_displayed = _safe_bool(self.is_displayed, True)
 
 
+@slotted()
 @dataclass
 class EeSymbolPinClock:
     is_displayed: bool
@@ -165,6 +210,7 @@ class EeSymbolPinClock:
         self.is_displayed = _safe_bool(self.is_displayed, True)
 
 
+@slotted()
 @dataclass
 class EeSymbolPin:
     settings: EeSymbolPinSettings
@@ -176,6 +222,7 @@ class EeSymbolPin:
 
 
 # ---------------- RECTANGLE ----------------
+@slotted()
 @dataclass
 class EeSymbolRectangle:
     pos_x: float
@@ -214,6 +261,7 @@ class EeSymbolRectangle:
 
 
 # ---------------- CIRCLE ----------------
+@slotted()
 @dataclass
 class EeSymbolCircle:
     center_x: float
@@ -241,6 +289,7 @@ class EeSymbolCircle:
 
 
 # ---------------- ARC ----------------
+@slotted()
 @dataclass
 class EeSymbolArc:
     path: list[Any]
@@ -265,6 +314,7 @@ class EeSymbolArc:
             self.path = parse_svg_path(svg_path=self.path)
 
 
+@slotted()
 @dataclass
 class EeSymbolEllipse:
     center_x: float
@@ -294,6 +344,7 @@ class EeSymbolEllipse:
 
 
 # ---------------- POLYLINE ----------------
+@slotted()
 @dataclass
 class EeSymbolPolyline:
     points: str
@@ -316,11 +367,13 @@ class EeSymbolPolyline:
 
 
 # ---------------- POLYGON ----------------
+@slotted()
 @dataclass
 class EeSymbolPolygon(EeSymbolPolyline):
     pass
 
 
+@slotted()
 @dataclass
 class EeSymbolPath:
     paths: str
@@ -343,6 +396,7 @@ class EeSymbolPath:
 
 
 # ---------------- TEXT ----------------
+@slotted()
 @dataclass
 class EeSymbolText:
     text: str
@@ -397,6 +451,7 @@ def convert_to_mm(dim: float) -> float:
     return round(float(dim) * 10 * 0.0254, 6)
 
 
+@slotted("x_px", "y_px")
 @dataclass
 class EeFootprintBbox:
     x: float
@@ -413,6 +468,7 @@ class EeFootprintBbox:
         self.y = convert_to_mm(y_raw)
 
 
+@slotted()
 @dataclass
 class EeFootprintPad:
     shape: str
@@ -445,6 +501,7 @@ class EeFootprintPad:
         self.is_plated = _safe_bool(self.is_plated, True)
 
 
+@slotted()
 @dataclass
 class EeFootprintTrack:
     stroke_width: float
@@ -460,6 +517,7 @@ class EeFootprintTrack:
         self.is_locked = _safe_bool(self.is_locked)
 
 
+@slotted()
 @dataclass
 class EeFootprintHole:
     center_x: float
@@ -475,6 +533,7 @@ class EeFootprintHole:
         self.is_locked = _safe_bool(self.is_locked)
 
 
+@slotted()
 @dataclass
 class EeFootprintVia:
     center_x: float
@@ -493,6 +552,7 @@ class EeFootprintVia:
         self.is_locked = _safe_bool(self.is_locked)
 
 
+@slotted()
 @dataclass
 class EeFootprintCircle:
     cx: float
@@ -512,6 +572,7 @@ class EeFootprintCircle:
         self.is_locked = _safe_bool(self.is_locked)
 
 
+@slotted()
 @dataclass
 class EeFootprintRectangle:
     x: float
@@ -533,6 +594,7 @@ class EeFootprintRectangle:
         self.is_locked = _safe_bool(self.is_locked)
 
 
+@slotted()
 @dataclass
 class EeFootprintArc:
     stroke_width: float
@@ -549,6 +611,7 @@ class EeFootprintArc:
         self.is_locked = _safe_bool(self.is_locked)
 
 
+@slotted()
 @dataclass
 class EeFootprintSolidRegion:
     layer_id: int
@@ -559,6 +622,7 @@ class EeFootprintSolidRegion:
         self.layer_id = _safe_int(self.layer_id, 3)
 
 
+@slotted()
 @dataclass
 class EeFootprintText:
     type: str
@@ -602,6 +666,7 @@ class EeFootprintInfo:
 
 
 # ------------------------- 3D MODEL -------------------------
+@slotted()
 @dataclass
 class Ee3dModelBase:
     x: float = 0.0
@@ -623,6 +688,8 @@ class Ee3dModel:
     rotation: Ee3dModelBase
     raw_obj: Optional[str] = None
     step: Optional[bytes] = None
+    # STEP streamed to disk instead of loaded into `step`
+    step_file: Optional[str] = None
 
 
 @dataclass
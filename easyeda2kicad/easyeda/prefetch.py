@@ -0,0 +1,164 @@
+"""
+Cache warm-up: download what a conversion needs without converting anything
+
+``prefetch_to_cache`` fills the cache of an ``EasyedaApi`` with the component
+data, symbol/footprint SVGs and OBJ/STEP models of many LCSC ids on a thread
+pool, so later runs with ``--use-cache`` work from the cache alone. Resources
+already cached are not downloaded again, so an interrupted warm-up simply
+picks up where it stopped.
+
+``read_lcsc_ids`` gets the ids out of a plain list or a CSV BOM.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import csv
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+# Local imports
+from .easyeda_api import EasyedaApi
+from .easyeda_importer import Easyeda3dModelImporter
+
+LCSC_ID_PATTERN = re.compile(r"C\d+")
+# Separators between several ids in one BOM cell
+_ID_SEPARATORS = re.compile(r"[\s,;]+")
+DEFAULT_PREFETCH_JOBS = 16
+
+
+@dataclass
+class PrefetchResult:
+    lcsc_id: str
+    # Resources that could not be fetched: component, svg, obj, step
+    missing: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing
+
+
+def _ids_in(cell: str) -> list[str]:
+    tokens = (token.upper() for token in _ID_SEPARATORS.split(cell.strip()))
+    return [token for token in tokens if LCSC_ID_PATTERN.fullmatch(token)]
+
+
+def read_lcsc_ids(lines: Iterable[str]) -> list[str]:
+    """LCSC ids listed in *lines*, in order and without duplicates.
+
+    Accepts one or more ids per line, or a CSV/TSV BOM (e.g. the JLCPCB
+    assembly BOM). When the header row names an LCSC column (``LCSC``,
+    ``LCSC Part #``, ``JLCPCB Part #``, ...) only that column is read,
+    otherwise every cell that looks like an id is taken.
+    """
+    text = list(lines)
+    sample = "".join(text[:20])
+    try:
+        dialect: type[csv.Dialect] | csv.Dialect = csv.Sniffer().sniff(
+            sample, delimiters=",;\t"
+        )
+    except csv.Error:
+        dialect = csv.excel
+    rows = list(csv.reader(text, dialect))
+
+    column = None
+    if rows:
+        for i, name in enumerate(rows[0]):
+            name = name.strip().lower()
+            if "lcsc" in name or name.startswith("jlcpcb part"):
+                column = i
+                break
+
+    ids: list[str] = []
+    for row in rows[1:] if column is not None else rows:
+        cells = row[column : column + 1] if column is not None else row
+        for cell in cells:
+            ids.extend(_ids_in(cell))
+    return list(dict.fromkeys(ids))
+
+
+def _cached(api: EasyedaApi, identifier: str, extension: str) -> bool:
+    return api._in_cache(api._get_cache_path(identifier, extension))
+
+
+def prefetch_component(api: EasyedaApi, lcsc_id: str) -> PrefetchResult:
+    """Bring every resource of *lcsc_id* into the cache of *api*."""
+    result = PrefetchResult(lcsc_id)
+    cad_data = api.get_cad_data_of_component(lcsc_id=lcsc_id)
+    if not cad_data:
+        result.missing.append("component")
+        return result
+
+    if not _cached(api, f"{lcsc_id}_svg", "json"):
+        svgs = api.get_svg_from_api(lcsc_id)
+        if not (svgs.get("symbol") or svgs.get("footprint")):
+            result.missing.append("svg")
+
+    model_3d = Easyeda3dModelImporter(
+        easyeda_cp_cad_data=cad_data, download_raw_3d_model=False
+    ).output
+    if model_3d is None:
+        # Nothing to fetch, conversions skip the 3D model as well
+        return result
+    if (
+        not _cached(api, model_3d.uuid, "obj")
+        and api.get_raw_3d_model_obj(uuid=model_3d.uuid) is None
+    ):
+        result.missing.append("obj")
+    if (
+        not _cached(api, model_3d.uuid, "step")
+        and api.download_step_3d_model(uuid=model_3d.uuid) is None
+    ):
+        result.missing.append("step")
+    return result
+
+
+def prefetch_to_cache(
+    api: EasyedaApi,
+    lcsc_ids: list[str],
+    jobs: int = DEFAULT_PREFETCH_JOBS,
+    progress: Callable[[int, int, PrefetchResult], None] | None = None,
+) -> list[PrefetchResult]:
+    """Prefetch *lcsc_ids* with *jobs* components in flight.
+
+    The ids are first checked in bulk, so unknown ones cost no further
+    request. ``progress(done, total, result)`` is called from the calling
+    thread as components finish. Returns the results in input order.
+    """
+    lcsc_ids = list(dict.fromkeys(lcsc_ids))
+    results: dict[str, PrefetchResult] = {}
+    done = 0
+
+    def finish(result: PrefetchResult) -> None:
+        nonlocal done
+        done += 1
+        results[result.lcsc_id] = result
+        if progress is not None:
+            progress(done, len(lcsc_ids), result)
+
+    unknown = set(api.find_unknown_components(lcsc_ids))
+    for lcsc_id in lcsc_ids:
+        if lcsc_id in unknown:
+            finish(PrefetchResult(lcsc_id, ["component"]))
+
+    with ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="easyeda2kicad-prefetch"
+    ) as executor:
+        futures = {
+            executor.submit(prefetch_component, api, lcsc_id): lcsc_id
+            for lcsc_id in lcsc_ids
+            if lcsc_id not in unknown
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception:
+                # One malformed part must not stop an unattended warm-up
+                logging.exception(f"Prefetching {futures[future]} failed")
+                result = PrefetchResult(futures[future], ["component"])
+            finish(result)
+
+    return [results[lcsc_id] for lcsc_id in lcsc_ids]
@@ -0,0 +1,335 @@
+"""
+Rate limiting and retry policy shared by every EasyEDA/JLCPCB request
+
+Large imports hit the API hard enough to get throttled (429) or to see
+transient 5xx answers and timeouts. RequestScheduler sits between the clients
+and the network and, per host:
+
+- spaces requests with a token bucket,
+- caps in-flight requests with an AIMD limit (additive increase on success,
+  multiplicative decrease on throttling) so throughput settles just below
+  what the server accepts,
+- retries retryable failures with exponential backoff and full jitter, or
+  after the delay a ``Retry-After`` header asks for. Requests that are not
+  idempotent (POST) are never sent twice.
+
+The bookkeeping is thread-safe and non-blocking, so the blocking client
+(``call``) and the asyncio client (``call_async``) share one instance.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import asyncio
+import email.utils
+import logging
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+# 408 Request Timeout, 425 Too Early, 429 Too Many Requests and transient 5xx
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Statuses meaning "slow down", which also shrink the concurrency limit
+THROTTLE_STATUSES = frozenset({429, 503})
+# Methods a request can be repeated with, once it may have reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+_ASYNC_POLL_INTERVAL = 0.01
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/s holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it.
+
+        The token may be borrowed from the future, so concurrent callers get
+        increasing waits instead of all racing for the next refill.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds`` (e.g. after ``Retry-After``)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AimdLimiter:
+    """Concurrency limit adapted with additive increase/multiplicative decrease.
+
+    Each success raises the limit by ``1/limit`` (about one slot per round of
+    requests) up to ``max_limit``; each throttling signal halves it, never
+    below one.
+    """
+
+    def __init__(self, max_limit: int, decrease_factor: float = 0.5) -> None:
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False, succeeded: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit * self.decrease_factor)
+            elif succeeded:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+def _once(fn: Callable[[], None]) -> Callable[[], None]:
+    """Wrap *fn* so that only its first call has an effect."""
+    lock = threading.Lock()
+    called = False
+
+    def wrapper() -> None:
+        nonlocal called
+        with lock:
+            if called:
+                return
+            called = True
+        fn()
+
+    return wrapper
+
+
+@dataclass
+class _HostState:
+    bucket: TokenBucket
+    limiter: AimdLimiter
+
+
+@dataclass
+class _Outcome:
+    """How a failed attempt should be handled."""
+
+    retry: bool
+    throttled: bool = False
+    retry_after: float | None = None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds a ``Retry-After`` header asks for, if any."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def _classify(err: BaseException) -> _Outcome:
+    if isinstance(err, urllib.error.HTTPError):
+        if err.code not in RETRYABLE_STATUSES:
+            return _Outcome(retry=False)
+        headers = err.headers
+        retry_after = parse_retry_after(
+            headers.get("Retry-After") if headers is not None else None
+        )
+        return _Outcome(
+            retry=True,
+            throttled=err.code in THROTTLE_STATUSES,
+            retry_after=retry_after,
+        )
+    reason = err.reason if isinstance(err, urllib.error.URLError) else err
+    if isinstance(reason, str) and "timed out" in reason:
+        return _Outcome(retry=True, throttled=True)
+    # socket.timeout only became an alias of TimeoutError in Python 3.10
+    if isinstance(reason, (TimeoutError, socket.timeout)):
+        return _Outcome(retry=True, throttled=True)
+    if isinstance(reason, (ConnectionResetError, ConnectionAbortedError)):
+        return _Outcome(retry=True)
+    return _Outcome(retry=False)
+
+
+class RequestScheduler:
+    """Per-host rate limit, adaptive concurrency and retry for API requests.
+
+    ``rate``/``burst`` configure the token bucket, ``max_concurrency`` the
+    ceiling of the AIMD limit. A request is tried at most ``max_attempts``
+    times; backoff delays grow from ``base_delay`` and, like ``Retry-After``
+    waits, are capped at ``max_delay`` — a server asking for a longer pause
+    gets the error reported instead.
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: int = 20,
+        max_concurrency: int = 16,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def host_state(self, url: str) -> _HostState:
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(
+                    TokenBucket(self.rate, self.burst),
+                    AimdLimiter(self.max_concurrency),
+                )
+                self._hosts[host] = state
+            return state
+
+    def _backoff(self, attempt: int, outcome: _Outcome, url: str) -> float | None:
+        """Delay before the next attempt, or None when the error is final."""
+        if not outcome.retry or attempt + 1 >= self.max_attempts:
+            return None
+        if outcome.retry_after is not None:
+            if outcome.retry_after > self.max_delay:
+                logging.warning(
+                    f"{url}: server asked to retry after {outcome.retry_after:.0f}s,"
+                    " giving up"
+                )
+                return None
+            return outcome.retry_after
+        # Full jitter: spread retries of many clients over the whole window
+        window = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(0, window)  # noqa: S311
+
+    def _record_failure(
+        self,
+        state: _HostState,
+        err: BaseException,
+        attempt: int,
+        url: str,
+        idempotent: bool,
+    ) -> float | None:
+        outcome = _classify(err)
+        state.limiter.release(throttled=outcome.throttled)
+        if not idempotent:
+            # The server may have acted on it already
+            outcome.retry = False
+        if isinstance(err, urllib.error.HTTPError):
+            # Drop the error body so its connection is not kept checked out
+            err.close()
+        delay = self._backoff(attempt, outcome, url)
+        if delay is None:
+            return None
+        if outcome.retry_after is not None:
+            state.bucket.pause(delay)
+        logging.warning(
+            f"Request to {url} failed ({err}), retry {attempt + 1}/"
+            f"{self.max_attempts - 1} in {delay:.1f}s"
+        )
+        return delay
+
+    def call(
+        self,
+        url: str,
+        send: Callable[[], T],
+        idempotent: bool = True,
+        hold: Callable[[T, Callable[[], None]], None] | None = None,
+    ) -> T:
+        """Run ``send`` (one request to ``url``) under the host's limits.
+
+        Failures are retried only if the request is ``idempotent``. With
+        ``hold``, the concurrency slot outlives ``send``:
+        ``hold(result, release)`` must arrange for ``release()`` to be called
+        once the result is done with (e.g. when a response body is read), so
+        that the limit also covers the transfer of the body.
+        """
+        state = self.host_state(url)
+        attempt = 0
+        while True:
+            time.sleep(state.bucket.reserve())
+            state.limiter.acquire()
+            try:
+                result = send()
+            except (urllib.error.URLError, OSError) as err:
+                delay = self._record_failure(state, err, attempt, url, idempotent)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                state.limiter.release()
+                raise
+            if hold is None:
+                state.limiter.release(succeeded=True)
+            else:
+                hold(result, _once(lambda: state.limiter.release(succeeded=True)))
+            return result
+
+    async def call_async(
+        self, url: str, send: Callable[[], Awaitable[T]], idempotent: bool = True
+    ) -> T:
+        """Coroutine version of ``call`` that never blocks the event loop.
+
+        ``send`` is expected to read the whole response, so the slot is held
+        until the body has arrived.
+        """
+        state = self.host_state(url)
+        attempt = 0
+        while True:
+            await asyncio.sleep(state.bucket.reserve())
+            while not state.limiter.try_acquire():
+                await asyncio.sleep(_ASYNC_POLL_INTERVAL)
+            try:
+                result = await send()
+            except (urllib.error.URLError, OSError) as err:
+                delay = self._record_failure(state, err, attempt, url, idempotent)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                state.limiter.release()
+                raise
+            state.limiter.release(succeeded=True)
+            return result
@@ -0,0 +1,143 @@
+"""
+Field schemas of the EasyEDA shape dataclasses
+
+An EasyEDA shape is a "~"-separated string whose fields map by position onto
+the fields of a dataclass of parameters_easyeda. A ShapeSchema holds what that
+mapping needs, worked out once per class when this module is imported instead
+of once per shape: the field names in order, the caster of each field
+(_safe_float, _safe_int or _safe_bool, from its type annotation) and the
+defaults. ``convert`` is a closure over these, compiled per class.
+
+SHAPE_SCHEMAS maps every Ee* dataclass to its schema; schema_of also compiles
+schemas of other dataclasses on first use.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import dataclasses
+import threading
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Mapping,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+# Local imports
+from . import parameters_easyeda
+from .parameters_easyeda import _safe_bool, _safe_float, _safe_int
+
+T = TypeVar("T")
+
+Caster = Callable[[Any], Any]
+
+# Annotation -> caster; other annotations (str, enums, lists, nested
+# dataclasses) are passed through unchanged
+_CASTERS: dict[Any, Caster] = {
+    float: _safe_float,
+    "float": _safe_float,
+    int: _safe_int,
+    "int": _safe_int,
+    bool: _safe_bool,
+    "bool": _safe_bool,
+}
+
+
+def _caster_for(annotation: Any) -> Caster | None:
+    if get_origin(annotation) is Union:
+        args = get_args(annotation)
+        if type(None) in args:
+            # Optional[T]: cast to T
+            annotation = next((arg for arg in args if arg is not type(None)), str)
+    return _CASTERS.get(annotation)
+
+
+def _compile_converter(
+    names: tuple[str, ...], casters: tuple[Caster | None, ...]
+) -> Callable[[Iterable[Any]], dict[str, Any]]:
+    fields = tuple(zip(names, casters))
+
+    def convert(values: Iterable[Any]) -> dict[str, Any]:
+        return {
+            name: value if caster is None else caster(value)
+            for (name, caster), value in zip(fields, values)
+        }
+
+    return convert
+
+
+class ShapeSchema(Generic[T]):
+    """Positional field layout of the dataclass *cls*."""
+
+    def __init__(self, cls: type[T]) -> None:
+        self.cls = cls
+        dc_fields = dataclasses.fields(cls)  # type: ignore[arg-type]
+        self.names: tuple[str, ...] = tuple(f.name for f in dc_fields)
+        try:
+            hints = get_type_hints(cls)
+        except Exception:
+            # Unresolvable annotations: pass every value through
+            hints = {}
+        self.casters: tuple[Caster | None, ...] = tuple(
+            _caster_for(hints[name]) if name in hints else None for name in self.names
+        )
+        self.defaults: dict[str, Any] = {
+            f.name: f.default for f in dc_fields if f.default is not dataclasses.MISSING
+        }
+        self._caster_by_name = dict(zip(self.names, self.casters))
+        self.convert = _compile_converter(self.names, self.casters)
+
+    def convert_named(self, values: Mapping[str, Any]) -> dict[str, Any]:
+        """Cast the values of a field name -> value mapping; unknown names are
+        kept as they are."""
+        converted = {}
+        for name, value in values.items():
+            caster = self._caster_by_name.get(name)
+            converted[name] = value if caster is None else caster(value)
+        return converted
+
+    def create(self, values: Iterable[Any], **extra: Any) -> T:
+        """Instance from positional *values* (and *extra* named ones), each
+        cast to the type of its field."""
+        kwargs = self.convert(values)
+        if extra:
+            kwargs.update(self.convert_named(extra))
+        return self.cls(**kwargs)
+
+    def make(self, values: Iterable[Any]) -> T:
+        """Instance from positional *values* as they are, for classes whose
+        __post_init__ does the conversion."""
+        return self.cls(**dict(zip(self.names, values)))
+
+
+def _shape_classes() -> list[type]:
+    return [
+        obj
+        for name, obj in vars(parameters_easyeda).items()
+        if name.startswith("Ee")
+        and isinstance(obj, type)
+        and dataclasses.is_dataclass(obj)
+    ]
+
+
+SHAPE_SCHEMAS: dict[type, ShapeSchema[Any]] = {
+    cls: ShapeSchema(cls) for cls in _shape_classes()
+}
+_schemas_lock = threading.Lock()
+
+
+def schema_of(cls: type[T]) -> ShapeSchema[T]:
+    """Schema of the dataclass *cls*, compiled on first use for classes
+    outside parameters_easyeda."""
+    schema = SHAPE_SCHEMAS.get(cls)
+    if schema is None:
+        with _schemas_lock:
+            schema = SHAPE_SCHEMAS.setdefault(cls, ShapeSchema(cls))
+    return schema
@@ -0,0 +1,89 @@
+"""
+Tokenizer and handler tables for EasyEDA shape strings
+
+Every shape of a symbol or footprint is one "~"-separated string whose first
+field is its designator (``PAD~RECT~4000~...``, ``PL~0 0 10 10~...``). Pins
+join several such records with "^^". A ShapeHandlers table maps designators
+to handlers: ``dispatch`` reads the designator without splitting the line,
+splits the line once with the tokenizer registered for it and calls the
+handler with the fields. Lookup is a single dict access, so adding a
+designator costs the others nothing.
+
+The symbol and footprint importers and the SVG renderer share these.
+"""
+
+from __future__ import annotations
+
+# Global imports
+from typing import Any, Callable, Generic, TypeVar
+
+R = TypeVar("R")
+
+FIELD_SEPARATOR = "~"
+PIN_SEGMENT_SEPARATOR = "^^"
+
+Tokenizer = Callable[[str], Any]
+
+
+def designator_of(line: str) -> str:
+    """First field of a shape line, without splitting the rest."""
+    end = line.find(FIELD_SEPARATOR)
+    return line if end < 0 else line[:end]
+
+
+def split_fields(line: str) -> list[str]:
+    """Fields of a shape line; the designator is field 0."""
+    return line.split(FIELD_SEPARATOR)
+
+
+def split_pin(line: str) -> list[list[str]]:
+    """Fields of each "^^" segment of a pin line (P~...^^...).
+
+    Segment 0 starts with the designator.
+    """
+    return [
+        segment.split(FIELD_SEPARATOR) for segment in line.split(PIN_SEGMENT_SEPARATOR)
+    ]
+
+
+class ShapeHandlers(Generic[R]):
+    """Designator -> (tokenizer, handler) table.
+
+    Handlers are called as ``handler(tokens, *args)`` with the extra
+    arguments of ``dispatch``; *on_unknown* is told about lines whose
+    designator has no handler.
+    """
+
+    def __init__(self, on_unknown: Callable[[str], None] | None = None) -> None:
+        self._handlers: dict[str, tuple[Tokenizer, Callable[..., R]]] = {}
+        self.on_unknown = on_unknown
+
+    def register(
+        self, *designators: str, tokenizer: Tokenizer = split_fields
+    ) -> Callable[[Callable[..., R]], Callable[..., R]]:
+        """Decorator registering a handler for *designators*."""
+
+        def wrap(handler: Callable[..., R]) -> Callable[..., R]:
+            for designator in designators:
+                self._handlers[designator] = (tokenizer, handler)
+            return handler
+
+        return wrap
+
+    def __contains__(self, designator: object) -> bool:
+        return designator in self._handlers
+
+    @property
+    def designators(self) -> list[str]:
+        return list(self._handlers)
+
+    def dispatch(self, line: str, *args: Any) -> R | None:
+        """Handle *line*; None when its designator is unknown."""
+        designator = designator_of(line)
+        entry = self._handlers.get(designator)
+        if entry is None:
+            if self.on_unknown is not None:
+                self.on_unknown(designator)
+            return None
+        tokenizer, handler = entry
+        return handler(tokenizer(line), *args)
@@ -0,0 +1,88 @@
+"""
+Generated KiCad outputs kept next to the downloads in the cache
+
+Converting a part (importers and exporters) costs far more than reading its
+cached API response. ConversionCache stores the generated symbol block,
+.kicad_mod text and WRL model under a hash of everything they depend on: the
+raw input, the options that shape the output and the converter version. A
+changed part, option or release therefore never reuses a stale output.
+"""
+
+from __future__ import annotations
+
+# Global imports
+import hashlib
+import json
+import logging
+from typing import Any, Callable
+
+# Local imports
+from .._version import __version__
+from ..easyeda.easyeda_cache import CacheStore
+
+# Bump when the generated output changes without a version bump, e.g. for
+# converter fixes between releases
+CONVERSION_FORMAT = 1
+
+# Key suffixes, one per kind of output
+CONVERTED_SYMBOL = "kicad_sym"
+CONVERTED_FOOTPRINT = "kicad_mod"
+CONVERTED_WRL = "wrl"
+
+
+def conversion_key(kind: str, *inputs: Any) -> str:
+    """Cache key of an output of *kind* generated from *inputs*.
+
+    Inputs are bytes, str or JSON-serialisable values.
+    """
+    digest = hashlib.sha256(f"{__version__}/{CONVERSION_FORMAT}".encode())
+    for item in inputs:
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        elif not isinstance(item, bytes):
+            item = json.dumps(item, separators=(",", ":")).encode("utf-8")
+        digest.update(len(item).to_bytes(8, "little"))
+        digest.update(item)
+    return f"{digest.hexdigest()}.{kind}"
+
+
+class ConversionCache:
+    """Outputs of earlier conversions, stored as JSON records in *store*.
+
+    Without a store (caching disabled) nothing is remembered. ``count`` is
+    told about every lookup, e.g. EasyedaApi.count_cache_lookup.
+    """
+
+    def __init__(
+        self,
+        store: CacheStore | None,
+        count: Callable[[str, bool], None] | None = None,
+    ) -> None:
+        self.store = store
+        self.count = count
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if self.store is None:
+            return None
+        data = self.store.read(key)
+        if self.count is not None:
+            self.count(key, data is not None)
+        if data is None:
+            return None
+        try:
+            value = json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logging.warning(f"Invalid conversion cache entry {key}, converting again")
+            return None
+        if not isinstance(value, dict):
+            return None
+        logging.debug(f"Conversion cache hit: {key}")
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.write(key, json.dumps(value).encode("utf-8"))
+        except Exception as e:
+            logging.warning(f"Failed to write conversion cache {key}: {e}")
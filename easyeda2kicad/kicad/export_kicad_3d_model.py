@@ -7,18 +7,49 @@ from __future__ import annotations
 # Global imports
 import logging
 import re
+import shutil
 import textwrap
+import threading
 from pathlib import Path
 
 # Local imports
+from ..easyeda.background import SingleFlight
 from ..easyeda.parameters_easyeda import Ee3dModel
+from .conversion_cache import CONVERTED_WRL, ConversionCache, conversion_key
 from .parameters_kicad_footprint import Ki3dModel, Ki3dModelBase
 
+# Parts sharing a 3D model (e.g. all 0603 resistors) reuse the WRL generated
+# for the first one instead of converting the OBJ again
+_WRL_MEMO_SIZE = 32
+_wrl_models: SingleFlight[Ki3dModel] = SingleFlight(_WRL_MEMO_SIZE)
+
 VRML_HEADER = """#VRML V2.0 utf8
 # 3D model generated by easyeda2kicad.py (https://github.com/uPesy/easyeda2kicad.py)
 """
 
 
+class ExportedModels:
+    """.wrl files written during one run and the model each one holds.
+
+    Shared by the Exporter3dModelKicad.export calls of a run so that parts
+    with the same 3D model write it once. Only files written through it are
+    known, so files that existed before the run keep the overwrite check.
+    """
+
+    def __init__(self) -> None:
+        self._models: dict[Path, tuple[object, ...]] = {}
+        self._lock = threading.Lock()
+
+    def holds(self, wrl_path: Path, wrl_key: tuple[object, ...]) -> bool:
+        """Whether this run wrote the model *wrl_key* to *wrl_path*."""
+        with self._lock:
+            return self._models.get(wrl_path) == wrl_key and wrl_path.exists()
+
+    def add(self, wrl_path: Path, wrl_key: tuple[object, ...]) -> None:
+        with self._lock:
+            self._models[wrl_path] = wrl_key
+
+
 def get_materials(obj_data: str) -> dict[str, dict[str, str | list[str]]]:
     material_regex = "newmtl .*?endmtl"
     matchs = re.findall(pattern=material_regex, string=obj_data, flags=re.DOTALL)
@@ -238,23 +269,80 @@ def _log_obj_bbox(raw_obj: str) -> None:
     )
 
 
+def _wrl_key(model_3d: Ee3dModel) -> tuple[object, ...]:
+    """Identity of the WRL generated for *model_3d*.
+
+    Name and translation are baked into the output, so parts placing the same
+    model differently get their own WRL. The OBJ hash guards against callers
+    that reuse a uuid for different geometry.
+    """
+    translation = model_3d.translation
+    return (
+        model_3d.uuid,
+        hash(model_3d.raw_obj),
+        model_3d.name,
+        translation.x,
+        translation.y,
+        translation.z,
+    )
+
+
 class Exporter3dModelKicad:
-    def __init__(self, model_3d: Ee3dModel | None):
+    def __init__(
+        self,
+        model_3d: Ee3dModel | None,
+        conversions: ConversionCache | None = None,
+    ):
         self.input = model_3d
+        self._wrl_key: tuple[object, ...] | None = None
+        self.output: Ki3dModel | None = None
         if model_3d and model_3d.raw_obj:
-            _log_obj_bbox(model_3d.raw_obj)
-        self.output = (
-            generate_wrl_model(model_3d=model_3d)
-            if model_3d and model_3d.raw_obj
-            else None
-        )
+            self._wrl_key = _wrl_key(model_3d)
+            self.output = _wrl_models.do(
+                self._wrl_key, lambda: self._generate_wrl(model_3d, conversions)
+            )
         self.output_step = model_3d.step if model_3d else None
-
-    def export(self, output_dir: str, overwrite: bool = True) -> bool:
+        self.output_step_file = model_3d.step_file if model_3d else None
+
+    @staticmethod
+    def _generate_wrl(
+        model_3d: Ee3dModel, conversions: ConversionCache | None = None
+    ) -> Ki3dModel:
+        key = ""
+        if conversions is not None:
+            translation = model_3d.translation
+            key = conversion_key(
+                CONVERTED_WRL,
+                model_3d.raw_obj or "",
+                [model_3d.name, translation.x, translation.y, translation.z],
+            )
+            cached = conversions.get(key)
+            if cached is not None and isinstance(cached.get("raw_wrl"), str):
+                return Ki3dModel(
+                    name=model_3d.name,
+                    translation=Ki3dModelBase(),
+                    rotation=Ki3dModelBase(),
+                    raw_wrl=cached["raw_wrl"],
+                )
+        if model_3d.raw_obj:
+            _log_obj_bbox(model_3d.raw_obj)
+        ki_model = generate_wrl_model(model_3d=model_3d)
+        if conversions is not None and ki_model.raw_wrl:
+            conversions.put(key, {"raw_wrl": ki_model.raw_wrl})
+        return ki_model
+
+    def export(
+        self,
+        output_dir: str,
+        overwrite: bool = True,
+        exported: ExportedModels | None = None,
+    ) -> bool:
         """Write WRL and STEP files into *output_dir* (the .3dshapes folder).
 
         EasyEDA always provides both OBJ (→WRL) and STEP for the same UUID.
         Returns False if files already exist and overwrite is False, True otherwise.
+        With *exported*, the registry of the current run, a model that an
+        earlier part of the run already wrote is not written again.
         """
         if not self.output:
             return False
@@ -264,6 +352,15 @@ class Exporter3dModelKicad:
         wrl_path = output_path / f"{model_name}.wrl"
         step_path = output_path / f"{model_name}.step"
 
+        if (
+            exported is not None
+            and self._wrl_key is not None
+            and exported.holds(wrl_path, self._wrl_key)
+        ):
+            # Another part with the same model already wrote these files
+            logging.debug(f"3D model already exported in this run: {model_name}")
+            return True
+
         if not overwrite and (wrl_path.exists() or step_path.exists()):
             logging.warning(f"3D model files already exist, skipping: {model_name}")
             return False
@@ -280,5 +377,10 @@ class Exporter3dModelKicad:
             # Fix options: (a) write translation into .kicad_mod and remove WRL baking
             # to avoid double-offset; (b) transform STEP geometry (needs opencascade).
             step_path.write_bytes(self.output_step)
+        elif self.output_step_file:
+            # Streamed download: copy file to file without loading it
+            shutil.copyfile(self.output_step_file, step_path)
 
+        if exported is not None and self._wrl_key is not None and self.output.raw_wrl:
+            exported.add(wrl_path, self._wrl_key)
         return True
@@ -3,11 +3,13 @@ from __future__ import annotations
 # Global imports
 import logging
 import re
+from array import array
 from math import acos, cos, isnan, pi, sin, sqrt
 from pathlib import Path
 
 # Local imports
 from ..easyeda.parameters_easyeda import EeFootprint, EeFootprintSolidRegion
+from .footprint_geometry import PadColumns, TrackColumns, bounds
 from .parameters_kicad_footprint import (
     KI_ARC,
     KI_CIRCLE,
@@ -320,30 +322,33 @@ class ExporterFootprintKicad:
 
         self.output = KiFootprint(info=ki_info, model_3d=ki_3d_model_info)
 
-        # For pads
-        for ee_pad in self.input.pads:
+        # For pads: geometry is converted column by column
+        pads = PadColumns.from_pads(self.input.pads)
+        pads.offset(self.input.bbox.x, self.input.bbox.y)
+        for i, ee_pad in enumerate(self.input.pads):
+            hole_radius = pads.hole_radius[i]
             ki_pad = KiFootprintPad(
-                type="thru_hole" if ee_pad.hole_radius > 0 else "smd",
+                type="thru_hole" if hole_radius > 0 else "smd",
                 shape=(
                     KI_PAD_SHAPE[ee_pad.shape]
                     if ee_pad.shape in KI_PAD_SHAPE
                     else "custom"
                 ),
-                pos_x=ee_pad.center_x - self.input.bbox.x,
-                pos_y=ee_pad.center_y - self.input.bbox.y,
-                width=max(ee_pad.width, 0.01),
-                height=max(ee_pad.height, 0.01),
-                layers=(
-                    KI_PAD_LAYER if ee_pad.hole_radius <= 0 else KI_PAD_LAYER_THT
-                ).get(ee_pad.layer_id, ""),
+                pos_x=pads.center_x[i],
+                pos_y=pads.center_y[i],
+                width=max(pads.width[i], 0.01),
+                height=max(pads.height[i], 0.01),
+                layers=(KI_PAD_LAYER if hole_radius <= 0 else KI_PAD_LAYER_THT).get(
+                    pads.layer_id[i], ""
+                ),
                 number=ee_pad.number,
                 drill="",
-                orientation=angle_to_ki(ee_pad.rotation),
+                orientation=angle_to_ki(pads.rotation[i]),
                 polygon="",
             )
 
             ki_pad.drill = drill_to_ki(
-                ee_pad.hole_radius, ee_pad.hole_length, ki_pad.height, ki_pad.width
+                hole_radius, pads.hole_length[i], ki_pad.height, ki_pad.width
             )
             # EasyEDA sometimes encodes pad numbers as "name(number)" (e.g. "A(1)").
             # Extract the part inside the parentheses as the canonical pad number.
@@ -355,9 +360,8 @@ class ExporterFootprintKicad:
                 ki_pad.number = normalized
 
             # For custom polygon
-            is_custom_shape = ki_pad.shape == "custom"
-            point_list = [fp_to_ki(point) for point in ee_pad.points.split()]
-            if is_custom_shape:
+            if ki_pad.shape == "custom":
+                point_list = [fp_to_ki(point) for point in ee_pad.points.split()]
                 if len(point_list) <= 0:
                     logging.warning(
                         f"PAD ${ee_pad.id} is a polygon, but has no points defined"
@@ -389,24 +393,23 @@ class ExporterFootprintKicad:
 
             self.output.pads.append(ki_pad)
 
-        # For tracks
-        for ee_track in self.input.tracks:
+        # For tracks: the points of all tracks are converted at once
+        tracks = TrackColumns.from_tracks(self.input.tracks)
+        tracks.offset(self.input.bbox.x, self.input.bbox.y)
+        for i in range(len(tracks)):
+            layer_id = tracks.layer_id[i]
             ki_track = KiFootprintTrack(
-                layers=(
-                    KI_LAYERS[ee_track.layer_id]
-                    if ee_track.layer_id in KI_LAYERS
-                    else "F.Fab"
-                ),
-                stroke_width=max(ee_track.stroke_width, 0.01),
+                layers=KI_LAYERS[layer_id] if layer_id in KI_LAYERS else "F.Fab",
+                stroke_width=max(tracks.stroke_width[i], 0.01),
             )
 
             # Generate line
-            point_list = [fp_to_ki(point) for point in ee_track.points.split()]
-            for i in range(0, len(point_list) - 2, 2):
-                ki_track.points_start_x.append(point_list[i] - self.input.bbox.x)
-                ki_track.points_start_y.append(point_list[i + 1] - self.input.bbox.y)
-                ki_track.points_end_x.append(point_list[i + 2] - self.input.bbox.x)
-                ki_track.points_end_y.append(point_list[i + 3] - self.input.bbox.y)
+            (
+                ki_track.points_start_x,
+                ki_track.points_start_y,
+                ki_track.points_end_x,
+                ki_track.points_end_y,
+            ) = tracks.segments(i)
 
             self.output.tracks.append(ki_track)
 
@@ -588,6 +591,19 @@ class ExporterFootprintKicad:
         model_3d_path: str,
         model_3d_extension: str = "wrl",
     ) -> None:
+        ki_lib = self.generate(
+            model_3d_path=model_3d_path, model_3d_extension=model_3d_extension
+        )
+        Path(footprint_full_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(
+            file=footprint_full_path,
+            mode="w",
+            encoding="utf-8",
+        ) as my_lib:
+            my_lib.write(ki_lib)
+
+    def generate(self, model_3d_path: str, model_3d_extension: str = "wrl") -> str:
+        """Return the content of the .kicad_mod file."""
         ki = self.output
         ki_lib = ""
 
@@ -603,8 +619,7 @@ class ExporterFootprintKicad:
             )
 
         # Get y_min and y_max to place reference and value text
-        y_low = min((pad.pos_y for pad in ki.pads), default=0)
-        y_high = max((pad.pos_y for pad in ki.pads), default=0)
+        y_low, y_high = bounds(array("d", [pad.pos_y for pad in ki.pads]))
 
         ki_lib += KI_REFERENCE.format(pos_x=0.0, pos_y=y_low - 4)
 
@@ -680,11 +695,4 @@ class ExporterFootprintKicad:
             )
 
         ki_lib += KI_END_FILE
-
-        Path(footprint_full_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(
-            file=footprint_full_path,
-            mode="w",
-            encoding="utf-8",
-        ) as my_lib:
-            my_lib.write(ki_lib)
+        return ki_lib
@@ -0,0 +1,175 @@
+"""
+Columnar footprint geometry
+
+Large footprints (BGAs, connectors) carry thousands of pads and long
+silkscreen tracks, and converting them shape by shape spends its time on a
+function call per coordinate. PadColumns and TrackColumns hold the geometry of
+all pads or all tracks of a footprint as columns instead: array('d') for
+coordinates and sizes, array('i') for layer ids. Unit conversion, the bbox
+offset and min/max then run once per column, as NumPy vector ops when NumPy is
+installed and as plain loops otherwise.
+
+Results are the same floats as those of the per-shape conversion: NumPy only
+does the exact operations (offset, min/max), rounding to KiCad's 1 nm grid
+stays with Python's round().
+"""
+
+from __future__ import annotations
+
+# Global imports
+from array import array
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Sequence, Union
+
+# Local imports
+from ..easyeda.parameters_easyeda import EeFootprintPad, EeFootprintTrack
+
+# Optional import for vectorised column operations
+_numpy: ModuleType | None = None
+try:
+    import numpy
+
+    _numpy = numpy
+except ImportError:
+    pass
+
+# Below this length the NumPy call overhead outweighs the loop
+_NUMPY_MIN_LENGTH = 64
+
+
+def _float_column() -> array[float]:
+    return array("d")
+
+
+def _int_column() -> array[int]:
+    return array("i")
+
+
+def mm_column(values: Sequence[Union[str, float]]) -> array[float]:
+    """EasyEDA footprint units to KiCad mm, as fp_to_ki does value by value:
+    empty and invalid values give 0.0.
+
+    Footprints repeat coordinates (pad grids, outlines), so each distinct
+    value is converted once.
+    """
+    converted: dict[Union[str, float], float] = dict.fromkeys(values, 0.0)
+    for value in converted:
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            continue
+        # number == number is False for NaN only
+        if number == number:
+            converted[value] = round(number * 10 * 0.0254, 6)
+    return array("d", map(converted.__getitem__, values))
+
+
+def offset(column: array[float], origin: float) -> None:
+    """Subtract *origin* from every value of *column*, in place."""
+    if _numpy is not None and len(column) >= _NUMPY_MIN_LENGTH:
+        view = _numpy.frombuffer(column, dtype=_numpy.float64)
+        view -= origin
+        del view
+    else:
+        column[:] = array("d", [v - origin for v in column])
+
+
+def bounds(column: array[float], default: float = 0.0) -> tuple[float, float]:
+    """Min and max of *column*; (default, default) when it is empty."""
+    if not column:
+        return default, default
+    if _numpy is not None and len(column) >= _NUMPY_MIN_LENGTH:
+        view = _numpy.frombuffer(column, dtype=_numpy.float64)
+        return float(view.min()), float(view.max())
+    return min(column), max(column)
+
+
+@dataclass
+class PadColumns:
+    """Position, size, rotation, hole and layer of every pad, in mm."""
+
+    center_x: array[float] = field(default_factory=_float_column)
+    center_y: array[float] = field(default_factory=_float_column)
+    width: array[float] = field(default_factory=_float_column)
+    height: array[float] = field(default_factory=_float_column)
+    rotation: array[float] = field(default_factory=_float_column)
+    hole_radius: array[float] = field(default_factory=_float_column)
+    hole_length: array[float] = field(default_factory=_float_column)
+    layer_id: array[int] = field(default_factory=_int_column)
+
+    @classmethod
+    def from_pads(cls, pads: Sequence[EeFootprintPad]) -> PadColumns:
+        return cls(
+            center_x=array("d", [pad.center_x for pad in pads]),
+            center_y=array("d", [pad.center_y for pad in pads]),
+            width=array("d", [pad.width for pad in pads]),
+            height=array("d", [pad.height for pad in pads]),
+            rotation=array("d", [pad.rotation for pad in pads]),
+            hole_radius=array("d", [pad.hole_radius for pad in pads]),
+            hole_length=array("d", [pad.hole_length for pad in pads]),
+            layer_id=array("i", [pad.layer_id for pad in pads]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.center_x)
+
+    def offset(self, x: float, y: float) -> None:
+        """Move the pads by (-x, -y), e.g. to the footprint origin."""
+        offset(self.center_x, x)
+        offset(self.center_y, y)
+
+
+@dataclass
+class TrackColumns:
+    """Points of every track in two shared columns, in mm.
+
+    The points of track i are xs/ys[starts[i]:starts[i + 1]].
+    """
+
+    xs: array[float] = field(default_factory=_float_column)
+    ys: array[float] = field(default_factory=_float_column)
+    starts: array[int] = field(default_factory=lambda: array("i", [0]))
+    stroke_width: array[float] = field(default_factory=_float_column)
+    layer_id: array[int] = field(default_factory=_int_column)
+
+    @classmethod
+    def from_tracks(cls, tracks: Sequence[EeFootprintTrack]) -> TrackColumns:
+        values: list[str] = []
+        starts = array("i", [0])
+        for track in tracks:
+            points = track.points.split()
+            # A trailing x without its y is dropped
+            count = len(points) // 2
+            values += points[: 2 * count]
+            starts.append(starts[-1] + count)
+        coordinates = mm_column(values)
+        return cls(
+            xs=coordinates[0::2],
+            ys=coordinates[1::2],
+            starts=starts,
+            stroke_width=array("d", [track.stroke_width for track in tracks]),
+            layer_id=array("i", [track.layer_id for track in tracks]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def offset(self, x: float, y: float) -> None:
+        """Move the tracks by (-x, -y), e.g. to the footprint origin."""
+        offset(self.xs, x)
+        offset(self.ys, y)
+
+    def segments(
+        self, index: int
+    ) -> tuple[list[float], list[float], list[float], list[float]]:
+        """Start x, start y, end x and end y of the segments of track *index*."""
+        first, end = self.starts[index], self.starts[index + 1]
+        if end - first < 2:
+            return [], [], [], []
+        return (
+            self.xs[first : end - 1].tolist(),
+            self.ys[first : end - 1].tolist(),
+            self.xs[first + 1 : end].tolist(),
+            self.ys[first + 1 : end].tolist(),
+        )
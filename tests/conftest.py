@@ -18,6 +18,27 @@ def pytest_addoption(parser: pytest.Parser) -> None:
     )
 
 
+@pytest.fixture(autouse=True)
+def isolated_user_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point the user cache at a fresh folder instead of ~/.cache."""
+    path = tmp_path_factory.mktemp("home") / "cache"
+    monkeypatch.setenv("EASYEDA2KICAD_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def isolated_project_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Run each test from a fresh folder, so that a ./.easyeda_cache of the
+    checkout is neither used nor created; tests may still chdir elsewhere."""
+    path = tmp_path_factory.mktemp("cwd")
+    monkeypatch.chdir(path)
+    return path
+
+
 @pytest.fixture
 def create_reference(request: pytest.FixtureRequest) -> bool:
     """Check if we should create reference files."""
@@ -0,0 +1,228 @@
+"""Tests for overlapping 3D downloads and their deferred log output."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.background import run_in_background
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_importer import Easyeda3dModelImporter
+
+SVGNODE = (
+    'SVGNODE~{"gId":"g1","nodeName":"g","nodeType":1,"layerid":"19",'
+    '"attrs":{"c_width":"10","c_height":"10","c_origin":"0,0","z":"0",'
+    '"uuid":"uuid-3d","title":"PART_3D","c_rotation":"0,0,0"},"childNodes":[]}'
+)
+CAD_DATA = {
+    "packageDetail": {"dataStr": {"head": {"x": 0, "y": 0}, "shape": [SVGNODE]}}
+}
+
+
+class _ConcurrentOnlyApi:
+    """Fake API whose getters only return when both run at the same time."""
+
+    def __init__(self) -> None:
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def get_raw_3d_model_obj(self, uuid: str) -> str:
+        self.barrier.wait()
+        return f"obj {uuid}"
+
+    def get_step_3d_model(self, uuid: str) -> bytes:
+        self.barrier.wait()
+        return b"step"
+
+    def download_step_3d_model(self, uuid: str) -> Path:
+        self.barrier.wait()
+        return Path(f"/tmp/{uuid}.step")
+
+
+@pytest.mark.parametrize("stream_step", [False, True])
+def test_obj_and_step_fetched_concurrently(stream_step: bool) -> None:
+    api: Any = _ConcurrentOnlyApi()
+    model = Easyeda3dModelImporter(
+        easyeda_cp_cad_data=CAD_DATA,
+        download_raw_3d_model=True,
+        api=api,
+        stream_step=stream_step,
+    ).output
+    assert model is not None
+    assert model.raw_obj == "obj uuid-3d"
+    if stream_step:
+        assert model.step_file == str(Path("/tmp/uuid-3d.step"))
+    else:
+        assert model.step == b"step"
+
+
+def test_logs_replayed_when_result_is_collected(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    release = threading.Event()
+
+    def work() -> int:
+        logging.warning("from helper")
+        release.wait(5)
+        return 42
+
+    with caplog.at_level(logging.INFO):
+        task = run_in_background(work)
+        logging.warning("from caller")
+        release.set()
+        assert task.result() == 42
+        assert task.result() == 42
+
+    assert [r.getMessage() for r in caplog.records] == ["from caller", "from helper"]
+    assert not any(h.filters for h in logging.getLogger().handlers)
+
+
+def test_named_logger_records_are_deferred(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    release = threading.Event()
+
+    def work() -> None:
+        logging.getLogger("easyeda2kicad.test").warning("from helper")
+        release.wait(5)
+
+    with caplog.at_level(logging.INFO):
+        task = run_in_background(work)
+        logging.warning("from caller")
+        release.set()
+        task.result()
+
+    assert [r.getMessage() for r in caplog.records] == ["from caller", "from helper"]
+
+
+def test_exception_reraised_with_logs(caplog: pytest.LogCaptureFixture) -> None:
+    def fail() -> None:
+        logging.error("about to fail")
+        raise RuntimeError("boom")
+
+    task = run_in_background(fail)
+    with caplog.at_level(logging.INFO), pytest.raises(RuntimeError):
+        task.result()
+    assert [r.getMessage() for r in caplog.records] == ["about to fail"]
+
+
+@pytest.mark.parametrize("stream_step", [False, True])
+def test_step_download_joined_when_obj_fails(stream_step: bool) -> None:
+    step_done = threading.Event()
+
+    class FailingObjApi(_ConcurrentOnlyApi):
+        def get_raw_3d_model_obj(self, uuid: str) -> str:
+            raise RuntimeError("obj failed")
+
+        def get_step_3d_model(self, uuid: str) -> bytes:
+            time.sleep(0.1)
+            step_done.set()
+            return b"step"
+
+        def download_step_3d_model(self, uuid: str) -> Path:
+            time.sleep(0.1)
+            step_done.set()
+            return Path(f"/tmp/{uuid}.step")
+
+    api: Any = FailingObjApi()
+    with pytest.raises(RuntimeError, match="obj failed"):
+        Easyeda3dModelImporter(
+            easyeda_cp_cad_data=CAD_DATA,
+            download_raw_3d_model=True,
+            api=api,
+            stream_step=stream_step,
+        )
+    assert step_done.is_set()
+
+
+def test_cli_starts_3d_before_symbol_conversion(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    started = threading.Event()
+    seen_before_svg: list[bool] = []
+
+    def fake_import(cad_data: dict[str, Any], api: EasyedaApi) -> None:
+        started.set()
+
+    def fake_render(cad_data: dict[str, Any]) -> str:
+        seen_before_svg.append(started.wait(5))
+        return "<svg/>"
+
+    monkeypatch.setattr(
+        EasyedaApi, "get_cad_data_of_component", lambda self, lcsc_id: CAD_DATA
+    )
+    monkeypatch.setattr(cli, "_import_3d_model", fake_import)
+    monkeypatch.setattr(cli, "render_symbol_svg", fake_render)
+    monkeypatch.setattr(cli, "render_footprint_svg", fake_render)
+
+    argv = ["--lcsc_id", "C1", "--svg", "--3d", "--output", str(tmp_path)]
+    assert cli.main(argv) == 0
+    assert seen_before_svg == [True, True]
+
+
+SYMBOL_CAD_DATA = {
+    **CAD_DATA,
+    "dataStr": {
+        "head": {"x": 0, "y": 0, "c_para": {"name": "PART", "pre": "U?"}},
+        "shape": [],
+        "BBox": {"x": 0, "y": 0},
+    },
+}
+
+
+class _Api:
+    use_cache = False
+    count_cache_lookup = None
+
+    def get_cad_data_of_component(self, lcsc_id: str) -> dict[str, Any]:
+        return SYMBOL_CAD_DATA
+
+
+def _arguments(tmp_path: Path) -> dict[str, Any]:
+    return {
+        "output": str(tmp_path / "lib"),
+        "symbol": True,
+        "footprint": False,
+        "3d": True,
+        "svg": False,
+        "overwrite": False,
+        "project_relative": False,
+        "custom_fields": {},
+    }
+
+
+def test_existing_symbol_skips_3d_download(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def no_import(cad_data: dict[str, Any], api: EasyedaApi) -> None:
+        raise AssertionError("3D model of a rejected part downloaded")
+
+    monkeypatch.setattr(cli, "id_already_in_symbol_lib", lambda **kwargs: True)
+    monkeypatch.setattr(cli, "_import_3d_model", no_import)
+    api: Any = _Api()
+    assert not cli._process_component("C1", _arguments(tmp_path), api)
+
+
+def test_rejected_part_replays_3d_logs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Added by another worker while this one converted the symbol
+    answers = iter([False, True])
+
+    def fake_import(cad_data: dict[str, Any], api: EasyedaApi) -> None:
+        logging.error("3D download failed")
+
+    monkeypatch.setattr(cli, "id_already_in_symbol_lib", lambda **kwargs: next(answers))
+    monkeypatch.setattr(
+        cli, "_convert_symbol", lambda *args, **kwargs: {"name": "PART"}
+    )
+    monkeypatch.setattr(cli, "_import_3d_model", fake_import)
+    api: Any = _Api()
+    with caplog.at_level(logging.INFO):
+        assert not cli._process_component("C1", _arguments(tmp_path), api)
+    assert "3D download failed" in [r.getMessage() for r in caplog.records]
@@ -0,0 +1,109 @@
+"""Tests for the bulk id check via searchByNumbers — no network required."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+
+
+class _FakeSearch:
+    """Stand-in for search_v2_component_uuids_by_lcsc recording each chunk."""
+
+    def __init__(self, response: Any) -> None:
+        self.response = response
+        self.chunks: list[list[str]] = []
+
+    def __call__(self, numbers: list[str]) -> dict[str, Any]:
+        self.chunks.append(list(numbers))
+        if callable(self.response):
+            result: dict[str, Any] = self.response(numbers)
+            return result
+        return dict(self.response)
+
+
+def _uuids(numbers: list[str]) -> dict[str, Any]:
+    """UUID of every id but C0, which the answer maps to none."""
+    return {
+        "code": 0,
+        "result": {n: f"uuid-{n}" if n != "C0" else "" for n in numbers},
+    }
+
+
+class TestFindUnknownComponents:
+    def test_chunks_and_reports_unknown(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _FakeSearch(_uuids)
+        monkeypatch.setattr(EasyedaApi, "search_v2_component_uuids_by_lcsc", fake)
+        api = EasyedaApi(use_cache=False)
+        unknown = api.find_unknown_components(
+            ["C1", "C0", "C2", "C3", "C1"], chunk_size=2
+        )
+        assert unknown == ["C0"]
+        assert fake.chunks == [["C1", "C0"], ["C2", "C3"]]
+
+    def test_cached_ids_are_not_sent(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = _FakeSearch(_uuids)
+        monkeypatch.setattr(EasyedaApi, "search_v2_component_uuids_by_lcsc", fake)
+        api = EasyedaApi(use_cache=True)
+        api.cache_dir = tmp_path
+        (tmp_path / "C2.json").write_text(json.dumps({"result": {}}))
+
+        assert api.find_unknown_components(["C1", "C2"]) == []
+        assert fake.chunks == [["C1"]]
+        # Only an id check: nothing is written to the cache
+        assert not api._in_cache(tmp_path / "C1.json")
+
+    def test_ids_left_out_are_not_unknown(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # A truncated answer says nothing about the ids it does not list
+        fake = _FakeSearch({"code": 0, "result": {"C1": "uuid-C1", "C0": None}})
+        monkeypatch.setattr(EasyedaApi, "search_v2_component_uuids_by_lcsc", fake)
+        api = EasyedaApi(use_cache=False)
+        assert api.find_unknown_components(["C1", "C0", "C3"]) == ["C0"]
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            {},
+            {"success": False},
+            {"result": "oops"},
+            {"result": [{"lcsc": {"number": "C1"}}]},
+            {"result": {"C1": {"uuid": "u"}}},
+            {"success": True, "result": []},
+            {"success": True, "result": {}},
+        ],
+    )
+    def test_unusable_response_rejects_nothing(
+        self, response: dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            EasyedaApi, "search_v2_component_uuids_by_lcsc", _FakeSearch(response)
+        )
+        api = EasyedaApi(use_cache=False)
+        assert api.find_unknown_components(["C1", "C2"]) == []
+
+
+def test_cli_skips_unknown_ids(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        EasyedaApi, "search_v2_component_uuids_by_lcsc", _FakeSearch(_uuids)
+    )
+    processed: list[str] = []
+
+    def fake_process(
+        component_id: str, arguments: Any, api: Any, exported: Any
+    ) -> bool:
+        processed.append(component_id)
+        return True
+
+    monkeypatch.setattr(cli, "_process_component", fake_process)
+    argv = ["--lcsc_id", "C1", "C0", "C2", "--symbol", "--output", str(tmp_path)]
+    assert cli.main(argv) == 1
+    assert processed == ["C1", "C2"]
@@ -0,0 +1,188 @@
+"""Tests for cache bundles (easyeda2kicad cache export/import, --cache-bundle)."""
+
+from __future__ import annotations
+
+import json
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.cache_bundle import bundle_keys, export_bundle, import_bundle
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_cache import (
+    BundleCacheStore,
+    CasCacheStore,
+    FileCacheStore,
+    LayeredCacheStore,
+)
+
+STEP = b"ISO-10303-21;\n" + b"DATA;\n" * 1000
+
+
+def _component(uuid: str) -> bytes:
+    svgnode = json.dumps({"attrs": {"uuid": uuid, "title": "R0603"}})
+    return json.dumps(
+        {
+            "success": True,
+            "result": {
+                "title": "R",
+                "packageDetail": {
+                    "dataStr": {
+                        "head": {"x": 0, "y": 0},
+                        "shape": [f"SVGNODE~{svgnode}"],
+                    }
+                },
+            },
+        }
+    ).encode()
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> CasCacheStore:
+    store = CasCacheStore(tmp_path / "cache")
+    store.write("C1.json", _component("u1"), meta={"ETag": '"1"'})
+    store.write("C1_svg.json", b"{}")
+    store.write("u1.obj", b"v 0 0 0\n")
+    store.write("u1.step", STEP)
+    record = {"reason": "HTTP 404", "at": time.time()}
+    store.write("C9.json.missing", json.dumps(record).encode())
+    store.write("C2.json", _component("u2"))
+    return store
+
+
+def test_bundle_keys_follow_the_3d_model(cache: CasCacheStore) -> None:
+    keys, uncached = bundle_keys(cache, ["C1", "C9", "C5"])
+    assert keys == [
+        "C1.json",
+        "C1_svg.json",
+        "u1.obj",
+        "u1.step",
+        "C9.json.missing",
+    ]
+    assert uncached == ["C5"]
+
+
+def test_export_and_read_back(tmp_path: Path, cache: CasCacheStore) -> None:
+    path = tmp_path / "parts.zip"
+    keys, _ = bundle_keys(cache, ["C1"])
+    assert export_bundle(cache, path, keys) == 4
+    assert zipfile.is_zipfile(path)
+
+    bundle = BundleCacheStore(path)
+    assert bundle.keys() == sorted(keys)
+    assert bundle.read("u1.step") == STEP
+    assert bundle.read("C2.json") is None
+    assert bundle.read_meta("C1.json") == {"ETag": '"1"'}
+    f = bundle.open("u1.step")
+    assert f is not None
+    with f:
+        assert f.read(13) == b"ISO-10303-21;"
+    info = {i.key: i for i in bundle.entries()}["u1.step"]
+    assert info.size == len(STEP) and info.stored < info.size
+    assert bundle.verify("u1.step") is None
+    with pytest.raises(PermissionError):
+        bundle.write("C3.json", b"{}")
+    bundle.close()
+
+
+def test_not_a_bundle(tmp_path: Path) -> None:
+    for data in (b"", b"not a zip"):
+        (tmp_path / "x.zip").write_bytes(data)
+        with pytest.raises(ValueError, match="not a cache bundle"):
+            BundleCacheStore(tmp_path / "x.zip")
+    with pytest.raises(ValueError):
+        BundleCacheStore(tmp_path / "missing.zip")
+
+
+def test_layered_store_reads_tiers_and_writes_in_front(
+    tmp_path: Path, cache: CasCacheStore
+) -> None:
+    path = tmp_path / "parts.zip"
+    front = FileCacheStore(tmp_path / "front")
+    front.write("C1.obj", b"v 1 1 1\n")
+    cache.write("C1.obj", b"v 0 0 0\n")
+    export_bundle(cache, path, ["C1.json", "C1.obj", "u1.step"])
+    store = LayeredCacheStore(front, [BundleCacheStore(path)])
+
+    assert store.read("C1.obj") == b"v 1 1 1\n"
+    assert store.read("C1.json") == cache.read("C1.json")
+    assert store.read("u1.step") == STEP
+    assert store.exists("u1.step") and not store.exists("u1.obj")
+    # Entries only in the bundle have no plain file to hand out
+    assert store.local_file("u1.step") is None
+    assert store.local_file("C1.obj") == front.root / "C1.obj"
+    store.write("C2.json", b"{}")
+    assert front.keys() == ["C1.obj", "C2.json"]
+    assert store.keys() == ["C1.json", "C1.obj", "C2.json", "u1.step"]
+    store.close()
+
+
+def test_api_works_offline_from_bundle(
+    tmp_path: Path, cache: CasCacheStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def offline(api: EasyedaApi, req: object, timeout: float) -> None:
+        raise AssertionError("no network access expected")
+
+    monkeypatch.setattr(EasyedaApi, "_urlopen", offline)
+    path = tmp_path / "parts.zip"
+    export_bundle(cache, path, bundle_keys(cache, ["C1", "C9"])[0])
+    api = EasyedaApi(use_cache=True, cache_bundles=[path])
+    api.cache_dir = tmp_path / "empty"
+
+    assert api.get_cad_data_of_component("C1")["title"] == "R"
+    assert api.get_cad_data_of_component("C9") == {}
+    assert api.get_raw_3d_model_obj("u1") == "v 0 0 0\n"
+    step = api.download_step_3d_model("u1")
+    assert step is not None and step.read_bytes() == STEP
+    api.close()
+    assert not (tmp_path / "empty" / "u1.step").exists()
+
+
+def test_cli_export_import_and_use(
+    tmp_path: Path,
+    cache: CasCacheStore,
+    monkeypatch: pytest.MonkeyPatch,
+    isolated_user_cache: Path,
+) -> None:
+    cache.close()
+    (tmp_path / "cache").rename(tmp_path / ".easyeda_cache")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bom.csv").write_text("Value,LCSC\n10k,C1\n", encoding="utf-8")
+
+    assert cli.main(["cache", "export", "parts.zip", "bom.csv"]) == 0
+    assert BundleCacheStore(tmp_path / "parts.zip").keys() == [
+        "C1.json",
+        "C1_svg.json",
+        "u1.obj",
+        "u1.step",
+    ]
+    # Uncached parts are reported, the rest is still exported
+    assert cli.main(["cache", "export", "more.zip", "--lcsc_id", "C1", "C7"]) == 1
+    assert (tmp_path / "more.zip").exists()
+    assert cli.main(["cache", "export", "all.zip"]) == 0
+    assert len(BundleCacheStore(tmp_path / "all.zip").keys()) == 6
+
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.chdir(other)
+    assert cli.main(["cache", "import", str(tmp_path / "parts.zip")]) == 0
+    # Without a project cache, entries go to the user cache
+    assert CasCacheStore(isolated_user_cache).read("u1.step") == STEP
+    assert cli.main(["cache", "import", str(tmp_path / "bom.csv")]) == 1
+
+    args = ["--lcsc_id", "C1", "--svg", "--cache-bundle", "nowhere.zip"]
+    assert cli.main(args) == 1
+
+
+def test_import_into_plain_files(tmp_path: Path, cache: CasCacheStore) -> None:
+    path = tmp_path / "parts.zip"
+    export_bundle(cache, path, cache.keys())
+    files = FileCacheStore(tmp_path / "files")
+    bundle = BundleCacheStore(path)
+    assert import_bundle(bundle, files) == 6
+    assert files.read("u1.step") == STEP
+    assert files.read_meta("C1.json") == {"ETag": '"1"'}
+    bundle.close()
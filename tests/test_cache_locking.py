@@ -0,0 +1,132 @@
+"""Tests for atomic cache writes and locking between cache users."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from email.message import Message
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_cache import (
+    CasCacheStore,
+    file_lock,
+    open_cache_store,
+    write_atomic,
+)
+
+
+def test_write_atomic_replaces_without_leftovers(tmp_path: Path) -> None:
+    path = tmp_path / "a.json"
+    write_atomic(path, b"old")
+    write_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.json"]
+
+
+def test_file_lock_serializes_holders(tmp_path: Path) -> None:
+    inside = 0
+    peak = 0
+    counter_lock = threading.Lock()
+
+    def hold() -> None:
+        nonlocal inside, peak
+        with file_lock(tmp_path / "locks" / "k.lock"):
+            with counter_lock:
+                inside += 1
+                peak = max(peak, inside)
+            time.sleep(0.02)
+            with counter_lock:
+                inside -= 1
+
+    threads = [threading.Thread(target=hold) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 1
+
+
+def test_cas_instances_see_each_other(tmp_path: Path) -> None:
+    a = CasCacheStore(tmp_path)
+    b = CasCacheStore(tmp_path)
+    a.write("x.obj", b"shared")
+    assert b.read("x.obj") == b"shared"
+    b.write("y.obj", b"shared")
+    a.delete("x.obj")
+    # The object is still used by the key the other instance wrote
+    assert b.read("y.obj") == b"shared"
+    assert not b.exists("x.obj")
+
+
+def test_cas_concurrent_writers(tmp_path: Path) -> None:
+    stores = [CasCacheStore(tmp_path) for _ in range(4)]
+
+    def write(n: int) -> None:
+        for i in range(20):
+            stores[n].write(f"{n}-{i}.obj", f"{n}/{i}".encode())
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    fresh = CasCacheStore(tmp_path)
+    assert len(fresh.keys()) == 80
+    assert fresh.read("3-19.obj") == b"3/19"
+
+
+def test_cas_terminates_interrupted_index_line(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("a.obj", b"a")
+    with open(store.index_path, "a") as f:
+        f.write('{"key": "b.obj", "ha')
+    store.write("c.obj", b"c")
+    assert CasCacheStore(tmp_path).keys() == ["a.obj", "c.obj"]
+
+
+@pytest.mark.parametrize("backend", ["files", "cas", "sqlite"])
+def test_racing_apis_fetch_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, backend: str
+) -> None:
+    calls: list[str] = []
+    body = json.dumps({"success": True, "result": {"title": "R"}}).encode()
+
+    def urlopen(api: EasyedaApi, req: Any, timeout: float) -> MagicMock:
+        calls.append(req.full_url)
+        time.sleep(0.05)
+        resp = MagicMock()
+        resp.read.return_value = body
+        resp.status = 200
+        resp.headers = Message()
+        resp.__enter__ = lambda s: s
+        resp.__exit__ = MagicMock(return_value=False)
+        return resp
+
+    monkeypatch.setattr(EasyedaApi, "_urlopen", urlopen)
+    # Separate instances stand in for separate processes
+    apis = [EasyedaApi(use_cache=True, cache_backend=backend) for _ in range(3)]
+    results: list[dict[str, Any]] = []
+    for api in apis:
+        api.cache_dir = tmp_path
+
+    threads = [
+        threading.Thread(
+            target=lambda api=api: results.append(api.get_cad_data_of_component("C1"))
+        )
+        for api in apis
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for api in apis:
+        api.close()
+    assert results == [{"title": "R"}] * 3
+    assert len(calls) == 1
+    assert open_cache_store(backend, tmp_path).exists("C1.json")
@@ -0,0 +1,200 @@
+"""Tests for the cache maintenance helpers and `easyeda2kicad cache`."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.cache_maintenance import (
+    check_content,
+    prune_cache,
+    summarize,
+    verify_cache,
+)
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_cache import (
+    CasCacheStore,
+    FileCacheStore,
+    SqliteCacheStore,
+    detect_cache_backend,
+    open_cache_store,
+    read_run_stats,
+)
+
+COMPONENT = json.dumps({"success": True, "result": {"title": "R"}}).encode()
+STEP = b"ISO-10303-21;\nHEADER;\nENDSEC;"
+
+
+@pytest.mark.parametrize(
+    "key, data, problem",
+    [
+        ("C1.json", COMPONENT, None),
+        ("C1.json", b"{", "invalid JSON"),
+        ("C1.json", b'{"success": false}', "no component data"),
+        ("C1_svg.json", b'{"symbol": ""}', None),
+        ("u.obj", b"newmtl a\nv 0 0 0\n", None),
+        ("u.obj", b"<html></html>", "OBJ model without vertices"),
+        ("u.step", b"\n" + STEP, None),
+        ("u.step", b"<html>", "not a STEP file"),
+        ("C1.json.missing", b'{"reason": "x"}', "negative entry without date"),
+    ],
+)
+def test_check_content(key: str, data: bytes, problem: str | None) -> None:
+    assert check_content(key, data) == problem
+
+
+@pytest.mark.parametrize("backend", ["files", "cas", "sqlite"])
+def test_verify_reports_and_deletes_broken_entries(
+    tmp_path: Path, backend: str
+) -> None:
+    store = open_cache_store(backend, tmp_path)
+    store.write("C1.json", COMPONENT)
+    store.write("C2.json", b"not json")
+    store.write("u.step", STEP)
+    assert verify_cache(store) == [("C2.json", "invalid JSON")]
+    verify_cache(store, delete=True)
+    assert store.keys() == ["C1.json", "u.step"]
+    store.close()
+
+
+def test_verify_detects_corrupt_cas_object(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("u.step", STEP)
+    path = store.object_path(store.entry("u.step")["hash"])  # type: ignore[index]
+    path.write_bytes(gzip.compress(STEP + b"tampered"))
+    assert verify_cache(store) == [("u.step", "content does not match its hash")]
+    path.write_bytes(path.read_bytes()[:10])
+    assert verify_cache(store)[0][1].startswith("unreadable")
+
+
+def test_summary_per_type(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("C1.json", COMPONENT)
+    store.write("C2.json", COMPONENT)
+    store.write("u.step", STEP)
+    summary = summarize(store)
+    assert list(summary) == ["component", "step"]
+    assert summary["component"].entries == 2
+    assert summary["component"].size == 2 * len(COMPONENT)
+    # One object shared by two keys is counted once
+    assert summary["component"].stored == store.usage() - summary["step"].stored
+
+
+def test_prune_by_age_and_size(tmp_path: Path) -> None:
+    store = FileCacheStore(tmp_path)
+    now = time.time()
+    for i, age_days in enumerate([40, 20, 10, 0]):
+        store.write(f"u{i}.obj", b"v 0 0 0\n" * 100)
+        at = now - age_days * 24 * 3600
+        os.utime(tmp_path / f"u{i}.obj", (at, at))
+
+    removed = prune_cache(store, older_than=30 * 24 * 3600)
+    assert [info.key for info in removed] == ["u0.obj"]
+    removed = prune_cache(store, max_size=1000)
+    assert [info.key for info in removed] == ["u1.obj", "u2.obj"]
+    assert store.keys() == ["u3.obj"]
+
+
+def test_cas_compact_rewrites_index(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    other = CasCacheStore(tmp_path)
+    for i in range(5):
+        store.write("C1.json", json.dumps({"result": {"i": i}}).encode())
+    store.write("C2.json", COMPONENT)
+    store.delete("C2.json")
+    orphan = store.object_path("ab" + "0" * 62)
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(gzip.compress(b"lost"))
+    os.utime(orphan, (0, 0))
+    assert other.keys() == ["C1.json"]
+
+    store.compact()
+
+    assert len(store.index_path.read_text().splitlines()) == 1
+    assert not orphan.exists()
+    assert len(list((tmp_path / "objects").glob("*/*.gz"))) == 1
+    # Instances that read the old index notice the new file
+    other.write("C3.json", COMPONENT)
+    assert CasCacheStore(tmp_path).keys() == ["C1.json", "C3.json"]
+    assert json.loads(other.read("C1.json") or b"") == {"result": {"i": 4}}
+
+
+def test_sqlite_compact_drops_expired_rows(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path, ttls={"component": -1})
+    store.write("C1.json", COMPONENT)
+    store.write("u.step", STEP)
+    store.compact()
+    count = store._db().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    assert count == 1
+    store.close()
+
+
+def test_compact_removes_stale_leftovers(tmp_path: Path) -> None:
+    store = FileCacheStore(tmp_path)
+    store.write("C1.json", COMPONENT, meta={"etag": "x"})
+    (tmp_path / "C2.json.meta").write_text("{}")
+    stale = tmp_path / "u.step.part"
+    fresh = tmp_path / "u2.step.part"
+    stale.write_bytes(b"ISO")
+    fresh.write_bytes(b"ISO")
+    os.utime(stale, (0, 0))
+    store.compact()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "C1.json",
+        "C1.json.meta",
+        "u2.step.part",
+    ]
+
+
+def test_detect_backend(tmp_path: Path) -> None:
+    assert detect_cache_backend(tmp_path) == "cas"
+    FileCacheStore(tmp_path).write("C1.json", COMPONENT)
+    assert detect_cache_backend(tmp_path) == "files"
+    SqliteCacheStore(tmp_path).write("C2.json", COMPONENT)
+    assert detect_cache_backend(tmp_path) == "sqlite"
+
+
+def test_api_records_hits_and_misses(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = EasyedaApi(use_cache=True)
+    api.cache_dir = tmp_path
+    api.cache_store.write("C1.json", COMPONENT)
+    api.cache_store.write("u.step", STEP)
+    api.get_cad_data_of_component("C1")
+    api.get_cad_data_of_component("C1")
+    api.get_step_3d_model("u")
+    api.close()
+    api.close()
+    assert [(r["hits"], r["misses"]) for r in read_run_stats(tmp_path)] == [
+        ({"component": 2, "step": 1}, {})
+    ]
+
+
+def test_cli_stats_and_prune(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert cli.main(["cache", "stats"]) == 1
+    store = CasCacheStore(tmp_path / ".easyeda_cache")
+    store.write("C1.json", COMPONENT)
+    store.write("u.step", STEP)
+    store.close()
+
+    assert cli.main(["cache", "stats"]) == 0
+    out = capsys.readouterr().out
+    assert "(cas backend)" in out
+    assert "component         1" in out
+    assert cli.main(["cache", "verify"]) == 0
+    assert cli.main(["cache", "prune"]) == 1
+    assert cli.main(["cache", "prune", "--max-size", "0"]) == 0
+    assert CasCacheStore(tmp_path / ".easyeda_cache").keys() == []
+    assert cli.main(["cache", "compact"]) == 0
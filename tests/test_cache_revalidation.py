@@ -0,0 +1,137 @@
+"""Tests for ETag/Last-Modified revalidation of cached component data."""
+
+from __future__ import annotations
+
+import http.server
+import json
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.easyeda.easyeda_api as api_module
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.request_scheduler import RequestScheduler
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class _ComponentHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    version = "v1"
+    send_validators = True
+    statuses: list[int] = []
+    request_headers: list[dict[str, str]] = []
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        cls.request_headers.append(dict(self.headers))
+        etag = f'"{cls.version}"'
+        if cls.send_validators and self.headers.get("If-None-Match") == etag:
+            cls.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps({"success": True, "result": {"v": cls.version}}).encode()
+        cls.statuses.append(200)
+        self.send_response(200)
+        if cls.send_validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def stub_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    _ComponentHandler.version = "v1"
+    _ComponentHandler.send_validators = True
+    _ComponentHandler.statuses = []
+    _ComponentHandler.request_headers = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _ComponentHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(api_module, "API_ENDPOINT", base + "/{lcsc_id}")
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def _api(tmp_path: Path, revalidate: bool = True) -> EasyedaApi:
+    api = EasyedaApi(
+        use_cache=True,
+        revalidate=revalidate,
+        scheduler=RequestScheduler(max_attempts=1),
+    )
+    api.cache_dir = tmp_path
+    return api
+
+
+def test_stores_validators_next_to_entry(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path)
+    api.get_cad_data_of_component("C1")
+    meta = api._read_validators(tmp_path / "C1.json")
+    assert meta == {"ETag": '"v1"', "Last-Modified": LAST_MODIFIED}
+
+
+def test_not_modified_reuses_cached_body(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path)
+    assert api.get_cad_data_of_component("C1") == {"v": "v1"}
+    assert api.get_cad_data_of_component("C1") == {"v": "v1"}
+    assert _ComponentHandler.statuses == [200, 304]
+    sent = _ComponentHandler.request_headers[1]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_changed_upstream_is_picked_up(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path)
+    api.get_cad_data_of_component("C1")
+    _ComponentHandler.version = "v2"
+    assert api.get_cad_data_of_component("C1") == {"v": "v2"}
+    assert api._read_validators(tmp_path / "C1.json")["ETag"] == '"v2"'
+
+
+def test_plain_cache_mode_never_revalidates(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path, revalidate=False)
+    api.get_cad_data_of_component("C1")
+    _ComponentHandler.version = "v2"
+    assert api.get_cad_data_of_component("C1") == {"v": "v1"}
+    assert _ComponentHandler.statuses == [200]
+
+
+def test_entry_without_validators_is_refetched(
+    tmp_path: Path, stub_server: str
+) -> None:
+    _ComponentHandler.send_validators = False
+    api = _api(tmp_path)
+    api.get_cad_data_of_component("C1")
+    assert api._read_validators(tmp_path / "C1.json") == {}
+    api.get_cad_data_of_component("C1")
+    assert _ComponentHandler.statuses == [200, 200]
+    assert "If-None-Match" not in _ComponentHandler.request_headers[1]
+
+
+def test_unreachable_server_falls_back_to_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(api_module, "API_ENDPOINT", "http://127.0.0.1:1/{lcsc_id}")
+    (tmp_path / "C1.json").write_text(json.dumps({"result": {"v": "old"}}))
+    assert _api(tmp_path).get_cad_data_of_component("C1") == {"v": "old"}
+
+
+def test_write_without_validators_drops_stale_meta(tmp_path: Path) -> None:
+    api = _api(tmp_path)
+    path = tmp_path / "C1.json"
+    api._write_to_cache(path, "{}", validators={"ETag": '"x"'})
+    assert api._read_validators(path) == {"ETag": '"x"'}
+    api._write_to_cache(path, "{}")
+    assert api._read_validators(path) == {}
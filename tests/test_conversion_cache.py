@@ -0,0 +1,128 @@
+"""Tests for reusing generated symbols, footprints and WRL models across runs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+import easyeda2kicad.kicad.conversion_cache as conversion_cache
+import easyeda2kicad.kicad.export_kicad_3d_model as export_3d
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_cache import CasCacheStore
+from easyeda2kicad.easyeda.easyeda_importer import (
+    EasyedaFootprintImporter,
+    EasyedaSymbolImporter,
+)
+from easyeda2kicad.easyeda.parameters_easyeda import Ee3dModel, Ee3dModelBase
+from easyeda2kicad.kicad.conversion_cache import ConversionCache, conversion_key
+from easyeda2kicad.kicad.export_kicad_3d_model import Exporter3dModelKicad
+
+CAD_DATA: dict[str, Any] = {
+    "title": "R1",
+    "lcsc": {"number": "C1"},
+    "dataStr": {
+        "head": {"x": 0, "y": 0, "c_para": {"pre": "R?", "name": "R1"}},
+        "shape": ["R~0~0~~~10~10~#880000~1~0~none~gge1~0~"],
+        "BBox": {"x": 0, "y": 0, "width": 10, "height": 10},
+    },
+    "packageDetail": {
+        "dataStr": {
+            "head": {"x": 0, "y": 0, "c_para": {"package": "R0603"}},
+            "shape": [
+                "PAD~RECT~0~0~4~4~1~~1~0~0 0 4 0 4 4 0 4~0~gge2~0~~Y~0~0~0.2~0,0"
+            ],
+            "BBox": {"x": 0, "y": 0, "width": 10, "height": 10},
+        }
+    },
+}
+
+
+def test_key_depends_on_every_input(monkeypatch: pytest.MonkeyPatch) -> None:
+    key = conversion_key("kicad_mod", "payload", ["a", 1])
+    assert key.endswith(".kicad_mod")
+    assert key == conversion_key("kicad_mod", "payload", ["a", 1])
+    assert key != conversion_key("kicad_mod", "payload", ["a", 2])
+    assert key != conversion_key("kicad_mod", "payloa", "d", ["a", 1])
+    assert key != conversion_key("kicad_sym", "payload", ["a", 1])
+    monkeypatch.setattr(conversion_cache, "__version__", "99.0")
+    assert key != conversion_key("kicad_mod", "payload", ["a", 1])
+
+
+class _Counting:
+    def __init__(self, fn: Callable[..., Any]) -> None:
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        return self.fn(*args, **kwargs)
+
+
+def _run(tmp_path: Path, *extra: str) -> None:
+    args = ["--lcsc_id", "C1", "--symbol", "--footprint", "--use-cache"]
+    args += ["--output", str(tmp_path / "lib"), "--overwrite", *extra]
+    assert cli.main(args) == 0
+
+
+def test_unchanged_part_is_not_converted_again(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        EasyedaApi, "get_cad_data_of_component", lambda self, lcsc_id: CAD_DATA
+    )
+    symbols = _Counting(EasyedaSymbolImporter)
+    footprints = _Counting(EasyedaFootprintImporter)
+    monkeypatch.setattr(cli, "EasyedaSymbolImporter", symbols)
+    monkeypatch.setattr(cli, "EasyedaFootprintImporter", footprints)
+    sym_path = tmp_path / "lib.kicad_sym"
+    fp_path = tmp_path / "lib.pretty" / "R0603.kicad_mod"
+
+    _run(tmp_path)
+    first = sym_path.read_text(), fp_path.read_text()
+    sym_path.unlink()
+    fp_path.unlink()
+    _run(tmp_path)
+
+    assert (symbols.calls, footprints.calls) == (1, 1)
+    assert (sym_path.read_text(), fp_path.read_text()) == first
+
+    # A different option is a different output
+    _run(tmp_path, "--custom-field", "Mfr:TI")
+    assert (symbols.calls, footprints.calls) == (2, 1)
+    assert '"Mfr"' in sym_path.read_text()
+
+
+def test_without_cache_nothing_is_stored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        EasyedaApi, "get_cad_data_of_component", lambda self, lcsc_id: CAD_DATA
+    )
+    args = ["--lcsc_id", "C1", "--footprint", "--output", str(tmp_path / "lib")]
+    assert cli.main(args) == 0
+    assert not (tmp_path / ".easyeda_cache").exists()
+
+
+def test_wrl_is_reused(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    generated = _Counting(export_3d.generate_wrl_model)
+    monkeypatch.setattr(export_3d, "generate_wrl_model", generated)
+    conversions = ConversionCache(CasCacheStore(tmp_path))
+    model = Ee3dModel(
+        name="R0603",
+        uuid="uuid-1",
+        translation=Ee3dModelBase(),
+        rotation=Ee3dModelBase(),
+        raw_obj="newmtl m\nKd 1 0 0\nv 0 0 0\nv 1 0 0\nv 0 1 0\nusemtl m\nf 1 2 3\n",
+    )
+    first = Exporter3dModelKicad._generate_wrl(model, conversions)
+    again = Exporter3dModelKicad._generate_wrl(model, conversions)
+    assert generated.calls == 1
+    assert again == first
+    model.name = "R0603_moved"
+    Exporter3dModelKicad._generate_wrl(model, conversions)
+    assert generated.calls == 2
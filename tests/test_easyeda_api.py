@@ -74,18 +74,20 @@ class TestCacheRoundtripText:
         result = api_with_cache._read_from_cache(path, binary=False)
         assert result == "hello cache"
 
-    def test_write_json_pretty_prints(self, api_with_cache: EasyedaApi) -> None:
-        path = api_with_cache._get_cache_path("test_json", "json")
-        api_with_cache._write_to_cache(path, '{"a":1}')
+    def test_write_json_pretty_prints(self, tmp_path: Path) -> None:
+        api = EasyedaApi(use_cache=True, cache_backend="files")
+        api.cache_dir = tmp_path
+        path = api._get_cache_path("test_json", "json")
+        api._write_to_cache(path, '{"a":1}')
         content = path.read_text()
         assert "\n" in content  # pretty-printed
 
-    def test_write_invalid_json_falls_back_to_plain(
-        self, api_with_cache: EasyedaApi
-    ) -> None:
-        path = api_with_cache._get_cache_path("test_badjson", "json")
-        api_with_cache._write_to_cache(path, "not-json{{{")
-        assert path.exists()
+    def test_write_invalid_json_falls_back_to_plain(self, tmp_path: Path) -> None:
+        api = EasyedaApi(use_cache=True, cache_backend="files")
+        api.cache_dir = tmp_path
+        path = api._get_cache_path("test_badjson", "json")
+        api._write_to_cache(path, "not-json{{{")
+        assert path.read_text() == "not-json{{{"
 
     def test_read_returns_none_if_file_missing(
         self, api_with_cache: EasyedaApi
@@ -157,7 +159,7 @@ class TestGetInfoCacheHit:
         def fake_urlopen(*args: object, **kwargs: object) -> None:
             raise urllib.error.URLError("no network in test")
 
-        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", fake_urlopen)
         result = api_with_cache.get_info_from_easyeda_api("C88888")
         assert result == {}
 
@@ -217,7 +219,7 @@ class TestGetSvgFromApiCacheHit:
         def fake_urlopen(*args: object, **kwargs: object) -> None:
             raise urllib.error.URLError("no network in test")
 
-        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", fake_urlopen)
         result = api_with_cache.get_svg_from_api("C1591")
         assert result == {"symbol": "", "footprint": ""}
 
@@ -235,7 +237,7 @@ class TestGetInfoNetworkPath:
         payload = {"success": True, "result": {"dataStr": "abc"}}
         body = json.dumps(payload).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         result = api.get_info_from_easyeda_api("C11111")
         assert result == payload
@@ -247,7 +249,7 @@ class TestGetInfoNetworkPath:
         payload = {"success": True, "result": {"dataStr": "gz"}}
         body = _gzip_encode(json.dumps(payload))
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         result = api.get_info_from_easyeda_api("C22222")
         assert result == payload
@@ -260,7 +262,7 @@ class TestGetInfoNetworkPath:
         def raise_url_error(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("timeout")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_url_error)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_url_error)
         assert api.get_info_from_easyeda_api("C33333") == {}
 
     def test_writes_to_cache_on_success(
@@ -271,18 +273,17 @@ class TestGetInfoNetworkPath:
         payload = {"success": True, "result": {"dataStr": "cached"}}
         body = json.dumps(payload).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         api.get_info_from_easyeda_api("C44444")
-        cache_file = api._get_cache_path("C44444", "json")
-        assert cache_file.exists()
+        assert api._in_cache(api._get_cache_path("C44444", "json"))
 
     def test_success_false_returns_empty(self, monkeypatch: pytest.MonkeyPatch) -> None:
         api = EasyedaApi(use_cache=False)
         payload = {"success": False, "message": "not found"}
         body = json.dumps(payload).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         assert api.get_info_from_easyeda_api("C55555") == {}
 
@@ -298,7 +299,7 @@ class TestGetCadDataOfComponent:
         payload = {"success": True, "result": {"dataStr": "xyz"}}
         body = json.dumps(payload).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         assert api.get_cad_data_of_component("C66666") == {"dataStr": "xyz"}
 
@@ -308,7 +309,7 @@ class TestGetCadDataOfComponent:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         assert api.get_cad_data_of_component("C77777") == {}
 
 
@@ -322,7 +323,8 @@ class TestGet3dModelObjNetworkPath:
         api = EasyedaApi(use_cache=False)
         obj_text = "v 0 0 0\nf 1 2 3\n"
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(obj_text.encode()),
         )
         result = api.get_raw_3d_model_obj("uuid-net")
@@ -331,7 +333,8 @@ class TestGet3dModelObjNetworkPath:
     def test_non_200_returns_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         api = EasyedaApi(use_cache=False)
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(b"not found", status=404),
         )
         assert api.get_raw_3d_model_obj("uuid-404") is None
@@ -342,7 +345,7 @@ class TestGet3dModelObjNetworkPath:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         assert api.get_raw_3d_model_obj("uuid-err") is None
 
     def test_writes_to_cache(
@@ -352,11 +355,12 @@ class TestGet3dModelObjNetworkPath:
         api.cache_dir = tmp_path
         obj_text = "v 1 2 3\n"
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(obj_text.encode()),
         )
         api.get_raw_3d_model_obj("uuid-cache")
-        assert api._get_cache_path("uuid-cache", "obj").exists()
+        assert api._in_cache(api._get_cache_path("uuid-cache", "obj"))
 
 
 # ---------------------------------------------------------------------------
@@ -369,7 +373,8 @@ class TestGetStepNetworkPath:
         api = EasyedaApi(use_cache=False)
         step_bytes = b"ISO-10303-21;"
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(step_bytes),
         )
         result = api.get_step_3d_model("uuid-step-net")
@@ -378,7 +383,8 @@ class TestGetStepNetworkPath:
     def test_non_200_returns_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         api = EasyedaApi(use_cache=False)
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(b"", status=404),
         )
         assert api.get_step_3d_model("uuid-step-404") is None
@@ -389,7 +395,7 @@ class TestGetStepNetworkPath:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         assert api.get_step_3d_model("uuid-step-err") is None
 
     def test_writes_to_cache(
@@ -399,11 +405,12 @@ class TestGetStepNetworkPath:
         api.cache_dir = tmp_path
         step_bytes = b"ISO-10303-21;"
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(step_bytes),
         )
         api.get_step_3d_model("uuid-step-cache")
-        assert api._get_cache_path("uuid-step-cache", "step").exists()
+        assert api._in_cache(api._get_cache_path("uuid-step-cache", "step"))
 
 
 # ---------------------------------------------------------------------------
@@ -425,7 +432,7 @@ class TestGetSvgFromApiNetworkPath:
         ]
         body = self._make_api_body(entries)
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         result = api.get_svg_from_api("C1591")
         assert result["symbol"] == "<svg>symbol</svg>"
@@ -436,7 +443,7 @@ class TestGetSvgFromApiNetworkPath:
         entries = [{"svg": "<svg>fp_only</svg>"}]
         body = self._make_api_body(entries)
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         result = api.get_svg_from_api("C0001")
         assert result["symbol"] == ""
@@ -448,7 +455,7 @@ class TestGetSvgFromApiNetworkPath:
         api = EasyedaApi(use_cache=False)
         body = json.dumps({"result": []}).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         result = api.get_svg_from_api("C0002")
         assert result == {"symbol": "", "footprint": ""}
@@ -461,7 +468,7 @@ class TestGetSvgFromApiNetworkPath:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         result = api.get_svg_from_api("C0003")
         assert result == {"symbol": "", "footprint": ""}
 
@@ -473,10 +480,10 @@ class TestGetSvgFromApiNetworkPath:
         entries = [{"svg": "<svg>s</svg>"}, {"svg": "<svg>f</svg>"}]
         body = self._make_api_body(entries)
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         api.get_svg_from_api("C0004")
-        assert api._get_cache_path("C0004_svg", "json").exists()
+        assert api._in_cache(api._get_cache_path("C0004_svg", "json"))
 
 
 # ---------------------------------------------------------------------------
@@ -513,7 +520,7 @@ class TestSearchJlcpcbComponents:
         ]
         body = self._make_jlcpcb_body(items)
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(body)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(body)
         )
         result = api.search_jlcpcb_components("CL10B104KB8NNNC")
         assert result["total"] == 1
@@ -526,7 +533,7 @@ class TestSearchJlcpcbComponents:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         result = api.search_jlcpcb_components("anything")
         assert result == {"total": 0, "results": []}
 
@@ -534,11 +541,11 @@ class TestSearchJlcpcbComponents:
         api = EasyedaApi(use_cache=False)
         captured: list[Any] = []
 
-        def fake_urlopen(req: Any, **kw: Any) -> Any:
+        def fake_urlopen(_self: EasyedaApi, req: Any, **kw: Any) -> Any:
             captured.append(req)
             return _fake_response(self._make_jlcpcb_body([]))
 
-        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", fake_urlopen)
         api.search_jlcpcb_components("cap", part_type="base")
         body_sent = captured[0].data.decode()
         assert "componentLibraryType" in body_sent
@@ -558,7 +565,7 @@ class TestGetProductImageUrl:
             b"</head></html>"
         )
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(html)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(html)
         )
         result = api.get_product_image_url("https://www.lcsc.com/product/C1591.html")
         assert result == "https://img.lcsc.com/product.jpg"
@@ -571,7 +578,7 @@ class TestGetProductImageUrl:
             f"</head></html>"
         ).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(html)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(html)
         )
         result = api.get_product_image_url("https://lcsc.com/product/C1591.html")
         assert result == "https://img.lcsc.com/ld.jpg"
@@ -590,13 +597,14 @@ class TestGetProductImageUrl:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         assert api.get_product_image_url("https://www.lcsc.com/product/C1.html") is None
 
     def test_no_image_returns_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         api = EasyedaApi(use_cache=False)
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(b"<html><body>no image</body></html>"),
         )
         assert api.get_product_image_url("https://www.lcsc.com/product/C1.html") is None
@@ -612,7 +620,8 @@ class TestGetV2Json:
         api = EasyedaApi(use_cache=False)
         payload = {"code": 0, "result": [{"uuid": "abc"}]}
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(json.dumps(payload).encode()),
         )
         result = api._get_v2_json("/api/some/path")
@@ -624,7 +633,7 @@ class TestGetV2Json:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         assert api._get_v2_json("/api/broken") == {}
 
 
@@ -633,7 +642,8 @@ class TestSearchV2ComponentUuidsByLcsc:
         api = EasyedaApi(use_cache=False)
         payload = {"code": 0, "result": {"C1591": "uuid-abc"}}
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(json.dumps(payload).encode()),
         )
         result = api.search_v2_component_uuids_by_lcsc(["C1591"])
@@ -645,7 +655,7 @@ class TestSearchV2ComponentUuidsByLcsc:
         def raise_err(*a: Any, **kw: Any) -> None:
             raise urllib.error.URLError("no net")
 
-        monkeypatch.setattr("urllib.request.urlopen", raise_err)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", raise_err)
         assert api.search_v2_component_uuids_by_lcsc(["C1591"]) == {}
 
 
@@ -661,7 +671,8 @@ class TestEdgeCases:
         """Lines 186-188: inner json.JSONDecodeError inside urlopen block."""
         api = EasyedaApi(use_cache=False)
         monkeypatch.setattr(
-            "urllib.request.urlopen",
+            EasyedaApi,
+            "_urlopen",
             lambda *a, **kw: _fake_response(b"not-json{{{"),
         )
         assert api.get_info_from_easyeda_api("C99991") == {}
@@ -707,7 +718,7 @@ class TestEdgeCases:
             f"</head></html>"
         ).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(html)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(html)
         )
         result = api.get_product_image_url("https://www.lcsc.com/product/C1.html")
         assert result == "https://img.lcsc.com/cu.jpg"
@@ -725,7 +736,7 @@ class TestEdgeCases:
             "</head></html>"
         ).encode()
         monkeypatch.setattr(
-            "urllib.request.urlopen", lambda *a, **kw: _fake_response(html)
+            EasyedaApi, "_urlopen", lambda *a, **kw: _fake_response(html)
         )
         result = api.get_product_image_url("https://www.lcsc.com/product/C1.html")
         assert result == "https://img.lcsc.com/valid.jpg"
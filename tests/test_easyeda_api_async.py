@@ -0,0 +1,216 @@
+"""Tests for AsyncEasyedaApi against a local stub HTTP server."""
+
+from __future__ import annotations
+
+import asyncio
+import http.server
+import json
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.easyeda.easyeda_api_async as async_api
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_api_async import AsyncEasyedaApi
+from easyeda2kicad.easyeda.request_scheduler import RequestScheduler
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    delay = 0.0
+    paths: list[str] = []
+    # If-None-Match of each component request
+    conditions: list[str | None] = []
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, payload: dict[str, Any], chunked: bool = False) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 7):
+                piece = body[i : i + 7]
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.paths.append(self.path)
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(cls.delay)
+            if self.path.startswith("/components/"):
+                lcsc_id = self.path.rsplit("/", 1)[1]
+                condition = self.headers.get("If-None-Match")
+                cls.conditions.append(condition)
+                if condition == '"v1"':
+                    self.send_response(304)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._send_json(
+                    {"success": True, "result": {"id": lcsc_id}},
+                    chunked=lcsc_id.endswith("9"),
+                )
+            elif self.path == "/moved":
+                self.send_response(302)
+                self.send_header("Location", "/components/C7")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        self.rfile.read(length)
+        self._send_json({"code": 0, "result": []})
+
+
+@pytest.fixture()
+def stub_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    _StubHandler.active = _StubHandler.peak = 0
+    _StubHandler.delay = 0.0
+    _StubHandler.paths = []
+    _StubHandler.conditions = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(async_api, "API_ENDPOINT", base + "/components/{lcsc_id}")
+    monkeypatch.setattr(async_api, "ENDPOINT_3D_MODEL", base + "/missing/{uuid}")
+    monkeypatch.setattr(
+        async_api, "ENDPOINT_3D_MODEL_STEP", base + "/missing-step/{uuid}"
+    )
+    monkeypatch.setattr(async_api, "ENDPOINT_SVG", base + "/missing-svg/{lcsc_id}")
+    monkeypatch.setattr(async_api, "API_BASE_LEGACY", base)
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetches_component(stub_server: str) -> None:
+    api = AsyncEasyedaApi()
+    result = asyncio.run(api.get_cad_data_of_component("C1"))
+    assert result == {"id": "C1"}
+
+
+def test_chunked_response(stub_server: str) -> None:
+    api = AsyncEasyedaApi()
+    result = asyncio.run(api.get_cad_data_of_component("C9"))
+    assert result == {"id": "C9"}
+
+
+def test_follows_redirect(stub_server: str) -> None:
+    api = AsyncEasyedaApi()
+
+    async def run() -> bytes:
+        response = await api._request("GET", f"{stub_server}/moved", {})
+        return response.body
+
+    assert json.loads(asyncio.run(run()))["result"] == {"id": "C7"}
+
+
+def test_concurrency_is_bounded(stub_server: str) -> None:
+    _StubHandler.delay = 0.05
+    api = AsyncEasyedaApi(max_concurrency=2)
+
+    async def run() -> list[dict[str, Any]]:
+        ids = [f"C{i}" for i in range(8)]
+        return await asyncio.gather(*(api.get_cad_data_of_component(i) for i in ids))
+
+    results = asyncio.run(run())
+    assert [r["id"] for r in results] == [f"C{i}" for i in range(8)]
+    assert _StubHandler.peak == 2
+
+
+def test_timeout_returns_empty(stub_server: str) -> None:
+    _StubHandler.delay = 0.5
+    sync = EasyedaApi(scheduler=RequestScheduler(max_attempts=1))
+    api = AsyncEasyedaApi(timeout=0.05, api=sync)
+    assert asyncio.run(api.get_info_from_easyeda_api("C1")) == {}
+
+
+def test_http_error_returns_none(stub_server: str) -> None:
+    api = AsyncEasyedaApi()
+    assert asyncio.run(api.get_raw_3d_model_obj("uuid-x")) is None
+
+
+def test_not_found_is_remembered(tmp_path: Path, stub_server: str) -> None:
+    sync = EasyedaApi(use_cache=True)
+    sync.cache_dir = tmp_path
+    api = AsyncEasyedaApi(api=sync)
+
+    async def fetch_all() -> tuple[Any, ...]:
+        return (
+            await api.get_raw_3d_model_obj("uuid-x"),
+            await api.get_step_3d_model("uuid-x"),
+            await api.get_svg_from_api("C404"),
+        )
+
+    no_svg = {"symbol": "", "footprint": ""}
+    assert asyncio.run(fetch_all()) == (None, None, no_svg)
+    assert len(_StubHandler.paths) == 3
+    for identifier, extension in (("uuid-x", "obj"), ("uuid-x", "step")):
+        assert sync._known_missing(sync._get_cache_path(identifier, extension))
+    assert sync._known_missing(sync._get_cache_path("C404_svg", "json"))
+
+    # The negative entries answer the second round without any request
+    assert asyncio.run(fetch_all()) == (None, None, no_svg)
+    assert len(_StubHandler.paths) == 3
+
+
+def test_search_by_numbers_posts(stub_server: str) -> None:
+    api = AsyncEasyedaApi()
+    result = asyncio.run(api.search_v2_component_uuids_by_lcsc(["C1"]))
+    assert result == {"code": 0, "result": []}
+
+
+def test_shares_cache_with_sync_api(tmp_path: Path, stub_server: str) -> None:
+    sync = EasyedaApi(use_cache=True)
+    sync.cache_dir = tmp_path
+    api = AsyncEasyedaApi(api=sync)
+    asyncio.run(api.get_info_from_easyeda_api("C5"))
+    assert sync._in_cache(sync._get_cache_path("C5", "json"))
+    # Served from the cache written above: no network needed
+    assert sync.get_cad_data_of_component("C5") == {"id": "C5"}
+
+
+def test_revalidates_with_conditional_request(tmp_path: Path, stub_server: str) -> None:
+    sync = EasyedaApi(use_cache=True, revalidate=True)
+    sync.cache_dir = tmp_path
+    api = AsyncEasyedaApi(api=sync)
+    assert asyncio.run(api.get_cad_data_of_component("C1")) == {"id": "C1"}
+    assert sync._read_validators(sync._get_cache_path("C1", "json")) == {"ETag": '"v1"'}
+    # The cached copy is checked with the server, which answers 304
+    assert asyncio.run(api.get_cad_data_of_component("C1")) == {"id": "C1"}
+    assert _StubHandler.conditions == [None, '"v1"']
+
+
+def test_cache_hit_skips_network(tmp_path: Path) -> None:
+    api = AsyncEasyedaApi(use_cache=True)
+    api.api.cache_dir = tmp_path
+    (tmp_path / "uuid-1.step").write_bytes(b"ISO-10303-21;")
+    assert asyncio.run(api.get_step_3d_model("uuid-1")) == b"ISO-10303-21;"
@@ -0,0 +1,456 @@
+"""Tests for the .easyeda_cache storage backends."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from easyeda2kicad.__main__ import get_parser, parse_cache_ttls, parse_size
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_cache import (
+    CacheStore,
+    CasCacheStore,
+    FileCacheStore,
+    MemoryCache,
+    SqliteCacheStore,
+    open_cache_store,
+    resource_id,
+    resource_type,
+)
+
+
+def _objects(root: Path) -> list[Path]:
+    return sorted((root / "objects").rglob("*.gz"))
+
+
+def test_roundtrip_is_compressed(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    data = b'{"result": "' + b"x" * 10_000 + b'"}'
+    store.write("C1.json", data)
+    assert store.read("C1.json") == data
+    [obj] = _objects(tmp_path)
+    assert obj.stat().st_size < len(data) // 10
+    assert gzip.decompress(obj.read_bytes()) == data
+
+
+def test_identical_payloads_share_one_object(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("a.obj", b"v 1 2 3\n")
+    store.write("b.obj", b"v 1 2 3\n")
+    store.write("c.obj", b"v 4 5 6\n")
+    assert len(_objects(tmp_path)) == 2
+    assert store.keys() == ["a.obj", "b.obj", "c.obj"]
+
+
+def test_index_is_reloaded_by_new_instance(tmp_path: Path) -> None:
+    CasCacheStore(tmp_path).write("C1.json", b"{}", meta={"ETag": '"v1"'})
+    CasCacheStore(tmp_path).write("C1.json", b"[]")
+    store = CasCacheStore(tmp_path)
+    assert store.read("C1.json") == b"[]"
+    # Rewriting an entry replaces its meta
+    assert store.read_meta("C1.json") == {}
+
+
+def test_meta_roundtrip(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("C1.json", b"{}", meta={"ETag": '"v1"'})
+    assert CasCacheStore(tmp_path).read_meta("C1.json") == {"ETag": '"v1"'}
+
+
+def test_reads_entries_of_the_original_layout(tmp_path: Path) -> None:
+    (tmp_path / "C1.json").write_text('{"old": true}')
+    (tmp_path / "C1.json.meta").write_text(json.dumps({"ETag": '"old"'}))
+    store = CasCacheStore(tmp_path)
+    assert store.exists("C1.json")
+    assert store.read("C1.json") == b'{"old": true}'
+    assert store.read_meta("C1.json") == {"ETag": '"old"'}
+    # Newer entries take precedence over the old file
+    store.write("C1.json", b'{"old": false}')
+    assert store.read("C1.json") == b'{"old": false}'
+
+
+def test_delete_writes_tombstone(tmp_path: Path) -> None:
+    (tmp_path / "C1.json").write_text("{}")
+    store = CasCacheStore(tmp_path)
+    store.write("C1.json", b"[]")
+    store.delete("C1.json")
+    assert not store.exists("C1.json")
+    assert not CasCacheStore(tmp_path).exists("C1.json")
+
+
+def test_malformed_index_lines_are_skipped(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("C1.json", b"{}")
+    with open(store.index_path, "a") as f:
+        f.write('{"key": "C2.js')
+    assert CasCacheStore(tmp_path).keys() == ["C1.json"]
+
+
+def test_put_file_and_open_stream(tmp_path: Path) -> None:
+    src = tmp_path / "model.step"
+    src.write_bytes(b"ISO-10303-21;" * 5000)
+    store = CasCacheStore(tmp_path / "cache")
+    store.put_file("model.step", src)
+    assert store.local_file("model.step") is None
+    f = store.open("model.step")
+    assert f is not None
+    with f:
+        assert f.read() == src.read_bytes()
+    entry = store.entry("model.step")
+    assert entry is not None and entry["size"] == 65000
+
+
+def test_file_store_keeps_plain_files(tmp_path: Path) -> None:
+    store = FileCacheStore(tmp_path)
+    store.write("C1.json", b'{"a":1}', meta={"ETag": '"v1"'})
+    assert json.loads((tmp_path / "C1.json").read_text()) == {"a": 1}
+    assert store.keys() == ["C1.json"]
+    store.write("C1.json", b'{"a":2}')
+    assert not (tmp_path / "C1.json.meta").exists()
+
+
+def test_unknown_backend_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown cache backend"):
+        open_cache_store("zip", tmp_path)
+
+
+def test_incomplete_backend_cannot_be_created(tmp_path: Path) -> None:
+    class ReadOnlyStore(CacheStore):
+        def read(self, key: str) -> bytes | None:
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyStore(tmp_path)  # type: ignore[abstract]
+
+
+def test_resource_type_and_id() -> None:
+    assert resource_type("C2040.json") == "component"
+    assert resource_type("C2040_svg.json") == "svg"
+    assert resource_type("abc.step") == "step"
+    assert resource_id("C2040_svg.json") == "C2040"
+    assert resource_id("abc.obj") == "abc"
+
+
+def test_sqlite_roundtrip(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path)
+    store.write("C1.json", b'{"a":1}', meta={"ETag": '"v1"'})
+    store.close()
+    store = SqliteCacheStore(tmp_path)
+    assert store.read("C1.json") == b'{"a":1}'
+    assert store.read_meta("C1.json") == {"ETag": '"v1"'}
+    assert store.keys() == ["C1.json"]
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".json"] == []
+    store.close()
+
+
+def test_sqlite_uses_wal(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path)
+    store.write("C1.json", b"{}")
+    store.close()
+    with sqlite3.connect(tmp_path / "cache.sqlite3") as db:
+        assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_sqlite_entries_expire_per_type(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path, ttls={"component": -1})
+    store.write("C1.json", b"{}")
+    store.write("uuid.step", b"ISO-10303-21;")
+    assert not store.exists("C1.json")
+    assert store.read("C1.json") is None
+    assert store.read("uuid.step") == b"ISO-10303-21;"
+    assert store.keys() == ["uuid.step"]
+    # A fresh write makes the entry valid again
+    store.ttls["component"] = 3600
+    store.write("C1.json", b"[]")
+    assert store.read("C1.json") == b"[]"
+    store.close()
+
+
+def test_sqlite_expired_entry_hides_old_layout_file(tmp_path: Path) -> None:
+    (tmp_path / "C1.json").write_text("{}")
+    store = SqliteCacheStore(tmp_path, ttls={"component": -1})
+    assert store.read("C1.json") == b"{}"
+    store.write("C1.json", b"[]")
+    assert store.read("C1.json") is None
+    store.close()
+
+
+def test_sqlite_lookup_by_resource_id(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path)
+    for key in ("C1.json", "C1_svg.json", "C12.json"):
+        store.write(key, b"{}")
+    assert store.keys_for("C1") == ["C1.json", "C1_svg.json"]
+    store.delete("C1_svg.json")
+    assert store.keys_for("C1") == ["C1.json"]
+    store.close()
+
+
+def test_sqlite_concurrent_writers(tmp_path: Path) -> None:
+    stores = [SqliteCacheStore(tmp_path) for _ in range(2)]
+
+    def work(i: int) -> None:
+        for j in range(20):
+            stores[i % 2].write(f"C{i}_{j}.json", b"{}")
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(stores[0].keys()) == 80
+    for store in stores:
+        store.close()
+
+
+def test_api_uses_selected_backend(tmp_path: Path) -> None:
+    api = EasyedaApi(use_cache=True)
+    api.cache_dir = tmp_path
+    path = api._get_cache_path("C1", "json")
+    api._write_to_cache(path, '{"a": 1}')
+    assert not path.exists()
+    assert api._read_from_cache(path) == '{"a": 1}'
+
+    api.cache_backend = "files"
+    assert isinstance(api.cache_store, FileCacheStore)
+    api._write_to_cache(path, '{"a": 2}')
+    assert path.exists()
+
+
+def test_api_detects_backend_of_existing_cache(tmp_path: Path) -> None:
+    FileCacheStore(tmp_path / "files").write("C1.json", b"{}")
+    sqlite_store = SqliteCacheStore(tmp_path / "sqlite")
+    sqlite_store.write("C1.json", b"{}")
+    sqlite_store.close()
+    for name, store_class in (
+        ("files", FileCacheStore),
+        ("sqlite", SqliteCacheStore),
+        ("new", CasCacheStore),
+    ):
+        api = EasyedaApi(use_cache=True, cache_dir=tmp_path / name)
+        assert isinstance(api.cache_store, store_class)
+        api.close()
+    assert get_parser().parse_args(["--lcsc_id", "C1"]).cache_backend is None
+
+
+def test_api_sqlite_backend(tmp_path: Path) -> None:
+    api = EasyedaApi(use_cache=True, cache_backend="sqlite")
+    api.cache_dir = tmp_path
+    path = api._get_cache_path("C1", "json")
+    api._write_to_cache(path, '{"a": 1}', validators={"ETag": '"v1"'})
+    assert api._in_cache(path)
+    assert api._read_from_cache(path) == '{"a": 1}'
+    assert api._read_validators(path) == {"ETag": '"v1"'}
+    api.close()
+
+
+def test_parse_cache_ttls() -> None:
+    assert parse_cache_ttls(["component=2", "step=never"]) == {
+        "component": 2 * 24 * 3600,
+        "step": None,
+    }
+
+
+@pytest.mark.parametrize("value", ["component", "pcb=1", "svg=soon"])
+def test_parse_cache_ttls_rejects_invalid_values(value: str) -> None:
+    with pytest.raises(ValueError):
+        parse_cache_ttls([value])
+
+
+def test_parse_size() -> None:
+    assert parse_size("2G") == 2 * 1024**3
+    assert parse_size("500MB") == 500 * 1024**2
+    assert parse_size("1.5k") == 1536
+    assert parse_size("4096") == 4096
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_cas_evicts_least_recently_used(tmp_path: Path) -> None:
+    # Random payloads do not compress: ~3 KB on disk each
+    store = CasCacheStore(tmp_path, max_size=11_000)
+    for i in range(3):
+        store.write(f"u{i}.step", os.urandom(3000))
+    # Reading u0 makes u1 the least recently used entry
+    assert store.read("u0.step") is not None
+    store.write("u3.step", os.urandom(3000))
+    assert store.keys() == ["u0.step", "u2.step", "u3.step"]
+    assert store.usage() <= 11_000
+    assert len(_objects(tmp_path)) == 3
+
+
+def test_cas_access_times_survive_restart(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("a.obj", os.urandom(3000))
+    store.write("b.obj", os.urandom(3000))
+    store.read("a.obj")
+    store.close()
+    store = CasCacheStore(tmp_path, max_size=5000)
+    store.write("c.obj", os.urandom(100))
+    assert store.keys() == ["a.obj", "c.obj"]
+
+
+def test_cas_keeps_objects_still_referenced(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path, max_size=7000)
+    shared = os.urandom(3000)
+    store.write("a.obj", shared)
+    store.write("c.obj", os.urandom(3000))
+    store.write("b.obj", shared)
+    store.write("d.obj", os.urandom(3000))
+    # Evicting a.obj frees nothing as b.obj uses the same object
+    assert store.keys() == ["b.obj", "d.obj"]
+    assert store.read("b.obj") == shared
+
+
+def test_cas_overwrite_removes_unused_object(tmp_path: Path) -> None:
+    store = CasCacheStore(tmp_path)
+    store.write("C1.json", b"old")
+    store.write("C1.json", b"new")
+    assert len(_objects(tmp_path)) == 1
+    store.delete("C1.json")
+    assert _objects(tmp_path) == []
+    assert store.usage() == 0
+
+
+def test_sqlite_keeps_models_as_files(tmp_path: Path) -> None:
+    src = tmp_path / "model.step"
+    src.write_bytes(b"ISO-10303-21;" * 5000)
+    store = SqliteCacheStore(tmp_path / "cache")
+    store.put_file("model.step", src)
+    store.write("model.obj", b"v 0 0 0")
+    path = tmp_path / "cache" / "files" / "model.step"
+    assert store.local_file("model.step") == path
+    assert path.read_bytes() == src.read_bytes()
+    assert store.local_file("C1.json") is None
+    f = store.open("model.step")
+    assert f is not None
+    with f:
+        assert f.name == str(path)
+        assert f.read() == src.read_bytes()
+    assert store.read("model.obj") == b"v 0 0 0"
+    with sqlite3.connect(tmp_path / "cache" / "cache.sqlite3") as db:
+        rows = db.execute("SELECT key, length(data), size FROM entries ORDER BY key")
+        assert rows.fetchall() == [("model.obj", 0, 7), ("model.step", 0, 65000)]
+    store.delete("model.obj")
+    assert not (tmp_path / "cache" / "files" / "model.obj").exists()
+    path.unlink()
+    assert not store.exists("model.step")
+    store.close()
+
+
+def test_sqlite_reads_inline_models_of_older_databases(tmp_path: Path) -> None:
+    with sqlite3.connect(tmp_path / "cache.sqlite3") as db:
+        db.execute(
+            "CREATE TABLE entries (key TEXT PRIMARY KEY, resource_id TEXT NOT NULL,"
+            " resource_type TEXT NOT NULL, data BLOB NOT NULL, meta TEXT,"
+            " size INTEGER NOT NULL, stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        db.execute(
+            "INSERT INTO entries VALUES ('u.step', 'u', 'step', ?, NULL, 3, 1e12, 0)",
+            (b"ISO",),
+        )
+    db.close()
+    store = SqliteCacheStore(tmp_path)
+    assert store.read("u.step") == b"ISO"
+    assert store.local_file("u.step") is None
+    store.write("u.step", b"ISO-10303-21;")
+    assert store.local_file("u.step") == tmp_path / "files" / "u.step"
+    store.close()
+
+
+def test_sqlite_compact_removes_model_files(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path, ttls={"step": -1})
+    store.write("old.step", b"ISO-10303-21;")
+    orphan = tmp_path / "files" / "gone.obj"
+    orphan.write_bytes(b"v 0 0 0")
+    os.utime(orphan, (0, 0))
+    store.compact()
+    assert sorted((tmp_path / "files").iterdir()) == []
+    store.close()
+
+
+def test_sqlite_evicts_least_recently_used(tmp_path: Path) -> None:
+    store = SqliteCacheStore(tmp_path, max_size=10_000)
+    for i in range(3):
+        store.write(f"u{i}.step", os.urandom(3000))
+    assert store.read("u0.step") is not None
+    store.write("u3.step", os.urandom(3000))
+    assert store.keys() == ["u0.step", "u2.step", "u3.step"]
+    assert store.usage() == 9000
+    assert not (tmp_path / "files" / "u1.step").exists()
+    store.close()
+
+
+def test_memory_cache_bounded_by_entries() -> None:
+    cache: MemoryCache[int] = MemoryCache(max_entries=2, max_bytes=1000)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    assert cache.get("a") == 1
+    cache.put("c", 3, 10)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert len(cache) == 2 and cache.nbytes == 20
+
+
+def test_memory_cache_bounded_by_bytes() -> None:
+    cache: MemoryCache[int] = MemoryCache(max_entries=10, max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 60)
+    assert cache.get("a") is None
+    assert cache.nbytes == 60
+    # Values larger than the whole budget are not kept
+    cache.put("c", 3, 200)
+    assert cache.get("c") is None
+    assert cache.get("b") == 2
+
+
+def test_memory_cache_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache: MemoryCache[int] = MemoryCache(max_entries=10, max_bytes=100)
+    cache.put("a", 1, 10, ttl=60)
+    cache.put("b", 2, 10)
+    now[0] += 61
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.nbytes == 10
+
+
+def test_api_memory_cache_follows_disk_ttl(tmp_path: Path) -> None:
+    api = EasyedaApi(
+        use_cache=True, cache_backend="sqlite", cache_ttls={"component": -1}
+    )
+    api.cache_dir = tmp_path
+    api._store_component("C1", '{"result": {}}', {"result": {}})
+    # Expired on disk, so not served from memory either
+    assert api._cached_component("C1") is None
+    api.close()
+
+
+def test_api_serves_hot_components_from_memory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = EasyedaApi(use_cache=True)
+    api.cache_dir = tmp_path
+    path = api._get_cache_path("C1", "json")
+    api._write_to_cache(path, json.dumps({"result": {"title": "R"}}))
+    first = api.get_cad_data_of_component("C1")
+
+    def no_disk(*args: object, **kwargs: object) -> None:
+        raise AssertionError("disk cache read")
+
+    monkeypatch.setattr(EasyedaApi, "_read_from_cache", no_disk)
+    assert api.get_cad_data_of_component("C1") is first
+
+
+def test_api_memory_cache_follows_use_cache(tmp_path: Path) -> None:
+    api = EasyedaApi(use_cache=False)
+    api._store_component("C1", "{}", {})
+    assert len(api.memory_cache) == 0
@@ -0,0 +1,155 @@
+"""Tests for the lazy symbol and footprint views — no network required."""
+
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.easyeda_importer import (
+    EasyedaFootprintImporter,
+    EasyedaSymbolImporter,
+    footprint_shape_handlers,
+    symbol_shape_handlers,
+)
+from easyeda2kicad.easyeda.easyeda_views import EasyedaFootprintView, EasyedaSymbolView
+
+PIN = (
+    "P~show~0~{n}~0~{y}~180~gge{n}~0^^0~{y}^^M 0 {y} h 10~#880000"
+    "^^1~14~{y}~0~IO{n}~start~~~#0000FF^^1~6~{y}~0~{n}~end~~~#0000FF"
+    "^^0~11~{y}^^0~M 13 {y} L 16 {y}"
+)
+SVGNODE = "SVGNODE~" + json.dumps(
+    {"attrs": {"uuid": "u1", "title": "SOT-23", "c_origin": "4000,3000", "z": "0"}}
+)
+
+
+def _unit(name: str, pins: range) -> dict[str, Any]:
+    return {
+        "dataStr": {
+            "head": {"x": 400, "y": 300, "c_para": {"pre": "U?", "name": name}},
+            "shape": [PIN.format(n=n, y=n * 10) for n in pins]
+            + [
+                "R~0~0~~~80~40~#880000~1~0~none~gge90~0",
+                "PL~0 0 10 10~#880000~1~0~none~gge91~0",
+                "T~L~10~20~0~#000000~Arial~7pt~normal~baseline~start~~Hi~1",
+            ],
+            "BBox": {"x": 0, "y": 0, "width": 80, "height": 40},
+        }
+    }
+
+
+def _cad_data() -> dict[str, Any]:
+    cad_data = _unit("AMP", range(1, 4))
+    cad_data["dataStr"]["head"]["c_para"]["package"] = "SOT-23"
+    cad_data["subparts"] = [_unit("AMP.1", range(1, 3)), _unit("AMP.2", range(3, 4))]
+    cad_data.update(
+        title="AMP",
+        lcsc={"number": "C1"},
+        packageDetail={
+            "title": "SOT-23",
+            "dataStr": {
+                "head": {"x": 4000, "y": 3000, "c_para": {"package": "SOT-23"}},
+                "shape": [
+                    "PAD~RECT~4000~3000~6~4~1~~1~0~~0~gge1~0~~Y~0~0~0.2~0,0",
+                    "PAD~RECT~4010~3000~6~4~1~~2~0~~0~gge2~0~~Y~0~0~0.2~0,0",
+                    "TRACK~1~3~~4000 3000 4010 3000~gge3~0",
+                    "HOLE~4000~3000~2~gge4~0",
+                    "TEXT~P~4000~3000~0.5~0~0~3~~5pt~REF~M 0 0~~gge5~0",
+                    SVGNODE,
+                ],
+            },
+        },
+    )
+    return cad_data
+
+
+def _count_dispatches(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    dispatched: list[str] = []
+    for handlers in (symbol_shape_handlers, footprint_shape_handlers):
+
+        def counting(line: str, *args: Any, _dispatch: Any = handlers.dispatch) -> Any:
+            dispatched.append(line.split("~")[0])
+            return _dispatch(line, *args)
+
+        monkeypatch.setattr(handlers, "dispatch", counting)
+    return dispatched
+
+
+def test_views_equal_importer_output() -> None:
+    symbol = EasyedaSymbolImporter(copy.deepcopy(_cad_data())).output
+    footprint = EasyedaFootprintImporter(copy.deepcopy(_cad_data())).output
+
+    symbol_view = EasyedaSymbolView(_cad_data())
+    footprint_view = EasyedaFootprintView(_cad_data())
+    assert symbol_view.symbol == symbol
+    assert len(symbol.sub_symbols) == 2
+    assert footprint_view.footprint == footprint
+    assert footprint_view.model_3d is not None
+    assert footprint_view.model_3d == footprint.model_3d
+
+
+def test_metadata_parses_no_shape(monkeypatch: pytest.MonkeyPatch) -> None:
+    dispatched = _count_dispatches(monkeypatch)
+    symbol_view = EasyedaSymbolView(_cad_data())
+    footprint_view = EasyedaFootprintView(_cad_data())
+
+    assert (symbol_view.name, symbol_view.package) == ("AMP", "SOT-23")
+    assert symbol_view.pin_count == 6
+    assert (footprint_view.name, footprint_view.pad_count) == ("SOT-23", 2)
+    assert footprint_view.info.lcsc_id == "C1"
+    assert dispatched == []
+
+    # A category parses its own lines only, once
+    assert [pin.settings.spice_pin_number for pin in symbol_view.pins] == [
+        "1", "2", "3", "1", "2", "3"
+    ]  # fmt: skip
+    assert symbol_view.pins[0] is symbol_view.pins[0]
+    assert footprint_view.model_3d is not None
+    assert footprint_view.model_3d.uuid == "u1"
+    assert dispatched == ["P"] * 6 + ["SVGNODE"]
+
+    assert [text.text for text in symbol_view.texts] == ["Hi"] * 3
+    graphics = symbol_view.graphics
+    assert len(graphics.rectangles) == 1 and not graphics.pins
+    assert len(graphics.sub_symbols[1].polylines) == 1
+
+
+def test_cli_skips_conversion_of_existing_outputs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Api:
+        use_cache = False
+        count_cache_lookup = None
+
+        def get_cad_data_of_component(self, lcsc_id: str) -> dict[str, Any]:
+            return _cad_data()
+
+    arguments = {
+        "output": str(tmp_path / "lib"),
+        "symbol": True,
+        "footprint": True,
+        "3d": False,
+        "svg": False,
+        "overwrite": False,
+        "project_relative": False,
+        "custom_fields": {},
+    }
+    assert cli._process_component("C1", arguments, Api())  # type: ignore[arg-type]
+    assert (tmp_path / "lib.pretty" / "SOT-23.kicad_mod").is_file()
+
+    def no_conversion(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("existing output converted again")
+
+    monkeypatch.setattr(cli, "_convert_symbol", no_conversion)
+    monkeypatch.setattr(cli, "_convert_footprint", no_conversion)
+    assert not cli._process_component("C1", arguments, Api())  # type: ignore[arg-type]
+    assert not cli._process_component(
+        "C1",
+        {**arguments, "symbol": False},
+        Api(),  # type: ignore[arg-type]
+    )
@@ -0,0 +1,97 @@
+"""Tests for the columnar footprint geometry."""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from easyeda2kicad.easyeda.easyeda_importer import EasyedaFootprintImporter
+from easyeda2kicad.kicad.export_kicad_footprint import ExporterFootprintKicad, fp_to_ki
+from easyeda2kicad.kicad.footprint_geometry import (
+    PadColumns,
+    TrackColumns,
+    bounds,
+    mm_column,
+    offset,
+)
+
+TRACKS = [
+    "TRACK~1~3~~4000 3000 4010 3000 4010 3010~gge1~0",
+    "TRACK~0.5~13~~4000 3000~gge2~0",
+    "TRACK~0.5~99~~4000 3000 4020 3020 4020~gge3~0",
+]
+PADS = [
+    "PAD~RECT~4000~3000~6~4~1~~1~0~~90~gge4~0~~Y~0~0~0.2~0,0",
+    "PAD~ELLIPSE~4010.5~3000~6~6~11~~2~1.5~~270~gge5~0~~Y~0~0~0.2~0,0",
+]
+
+
+def _footprint(shapes: list[str]) -> ExporterFootprintKicad:
+    cad_data = {
+        "title": "T",
+        "lcsc": {"number": "C1"},
+        "packageDetail": {
+            "dataStr": {
+                "head": {"x": 4000, "y": 3000, "c_para": {"package": "T"}},
+                "shape": shapes,
+            }
+        },
+    }
+    return ExporterFootprintKicad(EasyedaFootprintImporter(cad_data).output)
+
+
+def test_mm_column_matches_fp_to_ki() -> None:
+    values: list[str | float] = [
+        "100",
+        "-3",
+        "0.123457",
+        "",
+        "abc",
+        "nan",
+        "inf",
+        12.5,
+        "100",
+    ]
+    assert mm_column(values).tolist() == [fp_to_ki(v) for v in values]
+    assert mm_column([]) == array("d")
+
+
+def test_offset_and_bounds() -> None:
+    column = array("d", [1.5, -2.0, 4.25])
+    offset(column, 0.5)
+    assert column.tolist() == [1.0, -2.5, 3.75]
+    assert bounds(column) == (-2.5, 3.75)
+    assert bounds(array("d"), default=1.0) == (1.0, 1.0)
+
+
+def test_track_columns() -> None:
+    exporter = _footprint(TRACKS)
+    tracks = TrackColumns.from_tracks(exporter.input.tracks)
+    assert len(tracks) == 3
+    # The trailing x of the last track is dropped
+    assert tracks.starts.tolist() == [0, 3, 4, 6]
+    assert tracks.segments(1) == ([], [], [], [])
+
+    ki_tracks = exporter.output.tracks
+    assert ki_tracks[0].points_start_x == pytest.approx([0.0, 2.54])
+    assert ki_tracks[0].points_end_y == pytest.approx([0.0, 2.54])
+    assert ki_tracks[1].points_start_x == []
+    assert ki_tracks[2].layers == "F.CrtYd"
+    assert ki_tracks[2].points_end_x == pytest.approx([5.08])
+
+
+def test_pad_columns() -> None:
+    exporter = _footprint(PADS)
+    pads = PadColumns.from_pads(exporter.input.pads)
+    assert len(pads) == 2
+    assert pads.layer_id.tolist() == [1, 11]
+    pads.offset(exporter.input.bbox.x, exporter.input.bbox.y)
+    assert pads.center_x.tolist() == pytest.approx([0.0, 2.667])
+
+    first, second = exporter.output.pads
+    assert (first.type, first.pos_x, first.orientation) == ("smd", 0.0, 90.0)
+    assert (second.type, second.orientation) == ("thru_hole", -90.0)
+    assert second.pos_x == pads.center_x[1]
+    # The reference sits above the topmost pad
+    assert "REF** (at 0.000 -4.000)" in exporter.generate(model_3d_path="")
@@ -0,0 +1,89 @@
+"""Tests for the keep-alive connection pool against a local stub HTTP server."""
+
+from __future__ import annotations
+
+import http.server
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self) -> None:
+        type(self).connections += 1
+        super().setup()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/missing":
+            body = b"nope"
+            self.send_response(404)
+        else:
+            body = f"hello {self.path}".encode()
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/drop":
+            # Close the socket without announcing it, like an idle timeout would
+            self.close_connection = True
+
+
+@pytest.fixture()
+def stub_server() -> Iterator[str]:
+    _StubHandler.connections = 0
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(api: EasyedaApi, url: str) -> bytes:
+    req = urllib.request.Request(url)  # noqa: S310
+    with api._urlopen(req, timeout=5) as response:
+        body: bytes = response.read()
+    return body
+
+
+def test_connection_reused_across_requests(stub_server: str) -> None:
+    api = EasyedaApi()
+    assert _get(api, f"{stub_server}/a") == b"hello /a"
+    assert _get(api, f"{stub_server}/b") == b"hello /b"
+    assert _get(api, f"{stub_server}/c") == b"hello /c"
+    assert _StubHandler.connections == 1
+    assert api.connection_pool.idle_count() == 1
+    api.close()
+    assert api.connection_pool.idle_count() == 0
+
+
+def test_reconnects_after_server_drops_socket(stub_server: str) -> None:
+    api = EasyedaApi()
+    assert _get(api, f"{stub_server}/drop") == b"hello /drop"
+    assert _get(api, f"{stub_server}/after") == b"hello /after"
+    assert _StubHandler.connections == 2
+
+
+def test_http_error_raised_like_urlopen(stub_server: str) -> None:
+    api = EasyedaApi()
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _get(api, f"{stub_server}/missing")
+    assert excinfo.value.code == 404
+
+
+def test_unreachable_host_raises_url_error() -> None:
+    api = EasyedaApi()
+    with pytest.raises(urllib.error.URLError):
+        _get(api, "http://127.0.0.1:1/")
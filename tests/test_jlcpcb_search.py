@@ -123,7 +123,7 @@ class TestSearchJlcpcbComponents:
     ) -> None:
         """Full field mapping for a realistic Basic resistor item."""
         raw = _jlcpcb_response([_item_resistor()])
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response(raw))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response(raw))
 
         result = api.search_jlcpcb_components("100k 0402")
 
@@ -150,7 +150,7 @@ class TestSearchJlcpcbComponents:
     ) -> None:
         """price_breaks list must contain all tiers with qty + price."""
         raw = _jlcpcb_response([_item_resistor()])
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response(raw))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response(raw))
 
         r = api.search_jlcpcb_components("100k 0402")["results"][0]
 
@@ -165,7 +165,7 @@ class TestSearchJlcpcbComponents:
     ) -> None:
         """Attributes with value '-' or empty string must be dropped."""
         raw = _jlcpcb_response([_item_resistor()])
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response(raw))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response(raw))
 
         r = api.search_jlcpcb_components("100k 0402")["results"][0]
 
@@ -183,7 +183,7 @@ class TestSearchJlcpcbComponents:
     ) -> None:
         """Extended component with empty price list: type='Extended', price=None, price_breaks=[]."""
         raw = _jlcpcb_response([_item_capacitor_extended()])
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response(raw))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response(raw))
 
         r = api.search_jlcpcb_components("100uF 25V")["results"][0]
 
@@ -198,7 +198,7 @@ class TestSearchJlcpcbComponents:
     ) -> None:
         """Completely empty API item must not raise — all fields get safe defaults."""
         raw = _jlcpcb_response([_item_missing_fields()])
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response(raw))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response(raw))
 
         r = api.search_jlcpcb_components("anything")["results"][0]
 
@@ -219,7 +219,7 @@ class TestSearchJlcpcbComponents:
             [_item_resistor(), _item_capacitor_extended()],
             total=247,
         )
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response(raw))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response(raw))
 
         result = api.search_jlcpcb_components("resistor")
 
@@ -236,7 +236,7 @@ class TestSearchJlcpcbComponents:
         def fail(*_args: object, **_kwargs: object) -> None:
             raise urllib.error.URLError("simulated timeout")
 
-        monkeypatch.setattr("urllib.request.urlopen", fail)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", fail)
 
         result = api.search_jlcpcb_components("anything")
         assert result == {"total": 0, "results": []}
@@ -245,7 +245,7 @@ class TestSearchJlcpcbComponents:
         self, api: EasyedaApi, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """API returning {} or missing keys must not raise."""
-        monkeypatch.setattr("urllib.request.urlopen", _fake_response({}))
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_response({}))
 
         result = api.search_jlcpcb_components("ghost")
         assert result == {"total": 0, "results": []}
@@ -298,9 +298,7 @@ class TestGetProductImageUrl:
         self, api: EasyedaApi, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """og:image with property= attribute is the primary extraction path."""
-        monkeypatch.setattr(
-            "urllib.request.urlopen", _fake_html_response(_HTML_OG_IMAGE)
-        )
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_html_response(_HTML_OG_IMAGE))
         assert (
             api.get_product_image_url("https://www.lcsc.com/product-detail/C25744.html")
             == IMAGE_URL
@@ -311,7 +309,7 @@ class TestGetProductImageUrl:
     ) -> None:
         """og:image with name= attribute is also accepted."""
         monkeypatch.setattr(
-            "urllib.request.urlopen", _fake_html_response(_HTML_OG_IMAGE_NAME_ATTR)
+            EasyedaApi, "_urlopen", _fake_html_response(_HTML_OG_IMAGE_NAME_ATTR)
         )
         assert (
             api.get_product_image_url("https://www.lcsc.com/product-detail/C25744.html")
@@ -323,7 +321,7 @@ class TestGetProductImageUrl:
     ) -> None:
         """Falls back to JSON-LD Product.image when og:image is absent."""
         monkeypatch.setattr(
-            "urllib.request.urlopen", _fake_html_response(_HTML_JSON_LD_ONLY)
+            EasyedaApi, "_urlopen", _fake_html_response(_HTML_JSON_LD_ONLY)
         )
         assert (
             api.get_product_image_url("https://www.lcsc.com/product-detail/C25744.html")
@@ -335,7 +333,7 @@ class TestGetProductImageUrl:
     ) -> None:
         """Falls back to JSON-LD ImageObject.contentUrl when og:image is absent."""
         monkeypatch.setattr(
-            "urllib.request.urlopen", _fake_html_response(_HTML_JSON_LD_IMAGE_OBJECT)
+            EasyedaApi, "_urlopen", _fake_html_response(_HTML_JSON_LD_IMAGE_OBJECT)
         )
         assert (
             api.get_product_image_url("https://www.lcsc.com/product-detail/C25744.html")
@@ -346,9 +344,7 @@ class TestGetProductImageUrl:
         self, api: EasyedaApi, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Returns None when HTML contains no recognisable image metadata."""
-        monkeypatch.setattr(
-            "urllib.request.urlopen", _fake_html_response(_HTML_NO_IMAGE)
-        )
+        monkeypatch.setattr(EasyedaApi, "_urlopen", _fake_html_response(_HTML_NO_IMAGE))
         assert (
             api.get_product_image_url("https://www.lcsc.com/product-detail/C25744.html")
             is None
@@ -370,7 +366,7 @@ class TestGetProductImageUrl:
         def fail(*_args: object, **_kwargs: object) -> None:
             raise urllib.error.URLError("simulated timeout")
 
-        monkeypatch.setattr("urllib.request.urlopen", fail)
+        monkeypatch.setattr(EasyedaApi, "_urlopen", fail)
         assert (
             api.get_product_image_url("https://www.lcsc.com/product-detail/C25744.html")
             is None
@@ -0,0 +1,145 @@
+"""Tests for negative cache entries of missing parts and 3D models."""
+
+from __future__ import annotations
+
+import json
+import urllib.error
+from email.message import Message
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+
+
+class _FakeNetwork:
+    """Stand-in for EasyedaApi._urlopen counting requests."""
+
+    def __init__(self, body: bytes | None = None, status: int = 200) -> None:
+        self.body = body
+        self.status = status
+        self.urls: list[str] = []
+
+    def __call__(self, req: Any, timeout: float) -> MagicMock:
+        self.urls.append(req.full_url)
+        if self.status >= 400:
+            raise urllib.error.HTTPError(
+                req.full_url, self.status, "Not Found", Message(), None
+            )
+        resp = MagicMock()
+        resp.read.side_effect = [self.body, b""]
+        resp.status = self.status
+        resp.headers = Message()
+        resp.getheader.return_value = None
+        resp.__enter__ = lambda s: s
+        resp.__exit__ = MagicMock(return_value=False)
+        return resp
+
+
+def _api(tmp_path: Path, **kwargs: Any) -> EasyedaApi:
+    api = EasyedaApi(use_cache=True, **kwargs)
+    api.cache_dir = tmp_path
+    return api
+
+
+def test_success_false_is_remembered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    network = _FakeNetwork(json.dumps({"success": False}).encode())
+    monkeypatch.setattr(EasyedaApi, "_urlopen", network)
+    assert _api(tmp_path).get_cad_data_of_component("C1") == {}
+    assert _api(tmp_path).get_cad_data_of_component("C1") == {}
+    assert len(network.urls) == 1
+
+
+def test_not_found_component_is_remembered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    network = _FakeNetwork(status=404)
+    monkeypatch.setattr(EasyedaApi, "_urlopen", network)
+    api = _api(tmp_path)
+    assert api.get_cad_data_of_component("C1") == {}
+    assert api.get_cad_data_of_component("C1") == {}
+    assert len(network.urls) == 1
+
+
+def test_negative_entries_expire(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    network = _FakeNetwork(status=404)
+    monkeypatch.setattr(EasyedaApi, "_urlopen", network)
+    api = _api(tmp_path, cache_ttls={"missing": -1})
+    api.get_cad_data_of_component("C1")
+    api.get_cad_data_of_component("C1")
+    assert len(network.urls) == 2
+
+
+def test_cached_data_wins_over_negative_entry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = _api(tmp_path)
+    cache_path = api._get_cache_path("C1", "json")
+    api._remember_missing(cache_path, "HTTP 404")
+    api._write_to_cache(cache_path, json.dumps({"result": {"title": "R"}}))
+    monkeypatch.setattr(EasyedaApi, "_urlopen", _FakeNetwork(status=404))
+    assert api.get_cad_data_of_component("C1") == {"title": "R"}
+
+
+def test_without_cache_nothing_is_remembered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    network = _FakeNetwork(status=404)
+    monkeypatch.setattr(EasyedaApi, "_urlopen", network)
+    api = EasyedaApi(use_cache=False)
+    api.cache_dir = tmp_path
+    api.get_cad_data_of_component("C1")
+    api.get_cad_data_of_component("C1")
+    assert len(network.urls) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_missing_3d_models_are_remembered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    network = _FakeNetwork(status=404)
+    monkeypatch.setattr(EasyedaApi, "_urlopen", network)
+    for _ in range(2):
+        api = _api(tmp_path)
+        assert api.get_raw_3d_model_obj("uuid-1") is None
+        assert api.get_step_3d_model("uuid-1") is None
+        assert api.download_step_3d_model("uuid-2") is None
+        api.close()
+    assert len(network.urls) == 3
+
+
+def test_empty_svg_result_is_remembered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    network = _FakeNetwork(json.dumps({"success": True, "result": []}).encode())
+    monkeypatch.setattr(EasyedaApi, "_urlopen", network)
+    api = _api(tmp_path)
+    assert api.get_svg_from_api("C1") == {"symbol": "", "footprint": ""}
+    assert api.get_svg_from_api("C1") == {"symbol": "", "footprint": ""}
+    assert len(network.urls) == 1
+
+
+def test_bulk_check_uses_but_never_writes_negative_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    chunks: list[list[str]] = []
+
+    def search(api: EasyedaApi, numbers: list[str]) -> dict[str, Any]:
+        chunks.append(list(numbers))
+        return {"success": True, "result": {n: None for n in numbers}}
+
+    monkeypatch.setattr(EasyedaApi, "search_v2_component_uuids_by_lcsc", search)
+    api = _api(tmp_path)
+    assert api.find_unknown_components(["C0", "C1"]) == ["C0", "C1"]
+    assert not api._known_missing(tmp_path / "C0.json")
+
+    # Entries written by a per-component request answer without a batch request
+    api._remember_missing(tmp_path / "C0.json", "success: false")
+    assert _api(tmp_path).find_unknown_components(["C0", "C1"]) == ["C0", "C1"]
+    assert chunks == [["C0", "C1"], ["C1"]]
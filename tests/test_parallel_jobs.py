@@ -0,0 +1,98 @@
+"""Tests for the --jobs worker pool in __main__.main — no network required."""
+
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.background import DeferredLogFilter
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+
+
+@pytest.fixture(autouse=True)
+def _no_batch_prefetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(EasyedaApi, "find_unknown_components", lambda self, ids: [])
+
+
+def _fake_process(delays: dict[str, float], failing: set[str]) -> Any:
+    def fake(
+        component_id: str, arguments: dict[str, Any], api: Any, exported: Any
+    ) -> bool:
+        # Later components finish first so completion order != input order
+        time.sleep(delays.get(component_id, 0.0))
+        logging.info(f"done {component_id}")
+        return component_id not in failing
+
+    return fake
+
+
+def _args(tmp_path: Path, ids: list[str], jobs: int) -> list[str]:
+    return [
+        "--lcsc_id",
+        *ids,
+        "--symbol",
+        "--output",
+        str(tmp_path / "lib"),
+        "--jobs",
+        str(jobs),
+    ]
+
+
+def test_logs_replayed_in_input_order(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    ids = ["C1", "C2", "C3", "C4"]
+    delays = {"C1": 0.15, "C2": 0.1, "C3": 0.05, "C4": 0.0}
+    monkeypatch.setattr(cli, "_process_component", _fake_process(delays, set()))
+
+    with caplog.at_level(logging.INFO):
+        assert cli.main(_args(tmp_path, ids, jobs=4)) == 0
+
+    done = [r.getMessage() for r in caplog.records if r.getMessage().startswith("done")]
+    assert done == [f"done {i}" for i in ids]
+
+
+def test_failure_sets_exit_code(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cli, "_process_component", _fake_process({}, {"C2"}))
+    assert cli.main(_args(tmp_path, ["C1", "C2", "C3"], jobs=2)) == 1
+
+
+def test_filter_removed_after_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cli, "_process_component", _fake_process({}, set()))
+    cli.main(_args(tmp_path, ["C1", "C2"], jobs=2))
+    assert not any(
+        isinstance(f, DeferredLogFilter)
+        for handler in logging.getLogger().handlers
+        for f in handler.filters
+    )
+
+
+def test_rejects_non_positive_jobs(tmp_path: Path) -> None:
+    assert cli.main(_args(tmp_path, ["C1"], jobs=0)) == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_api_closed_when_processing_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int
+) -> None:
+    closed: list[EasyedaApi] = []
+
+    def failing(*args: Any) -> bool:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(cli, "_process_component", failing)
+    monkeypatch.setattr(EasyedaApi, "close", lambda self: closed.append(self))
+    with pytest.raises(RuntimeError):
+        cli.main(_args(tmp_path, ["C1", "C2"], jobs=jobs))
+    assert len(closed) == 1
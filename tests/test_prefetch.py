@@ -0,0 +1,174 @@
+"""Tests for the cache warm-up (easyeda2kicad prefetch) — no network required."""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+import easyeda2kicad.easyeda.prefetch as prefetch
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.parameters_easyeda import Ee3dModel, Ee3dModelBase
+from easyeda2kicad.easyeda.prefetch import prefetch_to_cache, read_lcsc_ids
+
+JLCPCB_BOM = """\
+Comment,Designator,Footprint,LCSC Part #
+100nF,"C1,C2,C3",0402,C1525
+10k,R1,0402,C25744
+ESP32,U1,QFN-48,
+"""
+
+
+def test_reads_plain_list() -> None:
+    lines = io.StringIO("C2040\nc20197 C163691\n\nC2040\n")
+    assert read_lcsc_ids(lines) == ["C2040", "C20197", "C163691"]
+
+
+def test_reads_lcsc_column_of_bom() -> None:
+    # Capacitor designators look like ids too: only the LCSC column counts
+    assert read_lcsc_ids(io.StringIO(JLCPCB_BOM)) == ["C1525", "C25744"]
+
+
+def test_reads_semicolon_bom() -> None:
+    bom = "Value;LCSC\n100nF;C1525\n10k;C25744, C25745\n"
+    assert read_lcsc_ids(io.StringIO(bom)) == ["C1525", "C25744", "C25745"]
+
+
+class _FakeParts:
+    """Stand-in for the EasyedaApi getters used by the warm-up."""
+
+    def __init__(
+        self,
+        unknown: frozenset[str] = frozenset(),
+        no_step: frozenset[str] = frozenset(),
+    ) -> None:
+        self.unknown = unknown
+        self.no_step = no_step
+        self.fetched: list[str] = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def install(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        parts = self
+
+        def find_unknown_components(api: EasyedaApi, ids: list[str]) -> list[str]:
+            return [i for i in ids if i in parts.unknown]
+
+        def get_cad_data(api: EasyedaApi, lcsc_id: str) -> dict[str, Any]:
+            with parts.lock:
+                parts.active += 1
+                parts.peak = max(parts.peak, parts.active)
+            time.sleep(0.02)
+            with parts.lock:
+                parts.active -= 1
+                parts.fetched.append(f"component {lcsc_id}")
+            return {"uuid": f"model-{lcsc_id}"}
+
+        def get_svg(api: EasyedaApi, lcsc_id: str) -> dict[str, Any]:
+            parts.fetched.append(f"svg {lcsc_id}")
+            return {"symbol": "<svg/>", "footprint": "<svg/>"}
+
+        def get_obj(api: EasyedaApi, uuid: str) -> str:
+            parts.fetched.append(f"obj {uuid}")
+            return "v 0 0 0"
+
+        def download_step(api: EasyedaApi, uuid: str) -> Path | None:
+            parts.fetched.append(f"step {uuid}")
+            return None if uuid.removeprefix("model-") in parts.no_step else Path(uuid)
+
+        class FakeModelImporter:
+            def __init__(self, easyeda_cp_cad_data: dict[str, Any], **kwargs: Any):
+                self.output = Ee3dModel(
+                    name="M",
+                    uuid=easyeda_cp_cad_data["uuid"],
+                    translation=Ee3dModelBase(),
+                    rotation=Ee3dModelBase(),
+                )
+
+        monkeypatch.setattr(
+            EasyedaApi, "find_unknown_components", find_unknown_components
+        )
+        monkeypatch.setattr(EasyedaApi, "get_cad_data_of_component", get_cad_data)
+        monkeypatch.setattr(EasyedaApi, "get_svg_from_api", get_svg)
+        monkeypatch.setattr(EasyedaApi, "get_raw_3d_model_obj", get_obj)
+        monkeypatch.setattr(EasyedaApi, "download_step_3d_model", download_step)
+        monkeypatch.setattr(prefetch, "Easyeda3dModelImporter", FakeModelImporter)
+
+
+def test_fetches_every_resource(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    parts = _FakeParts(unknown=frozenset({"C9"}), no_step=frozenset({"C2"}))
+    parts.install(monkeypatch)
+    api = EasyedaApi(use_cache=True)
+    api.cache_dir = tmp_path
+    ids = [f"C{i}" for i in range(1, 10)]
+    seen: list[int] = []
+
+    results = prefetch_to_cache(
+        api, ids, jobs=4, progress=lambda done, total, result: seen.append(done)
+    )
+
+    assert [r.lcsc_id for r in results] == ids
+    assert {r.lcsc_id: r.missing for r in results if not r.ok} == {
+        "C2": ["step"],
+        "C9": ["component"],
+    }
+    assert seen == list(range(1, 10))
+    assert parts.peak == 4
+    assert "component C9" not in parts.fetched
+    assert sorted(parts.fetched) == sorted(
+        f"{kind} {prefix}C{i}"
+        for i in range(1, 9)
+        for kind, prefix in (
+            ("component", ""),
+            ("svg", ""),
+            ("obj", "model-"),
+            ("step", "model-"),
+        )
+    )
+
+
+def test_cached_resources_are_skipped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    parts = _FakeParts()
+    parts.install(monkeypatch)
+    api = EasyedaApi(use_cache=True)
+    api.cache_dir = tmp_path
+    api.cache_store.write("C1_svg.json", b"{}")
+    api.cache_store.write("model-C1.obj", b"v 0 0 0")
+    api.cache_store.write("model-C1.step", b"ISO-10303-21;")
+
+    assert prefetch_to_cache(api, ["C1"])[0].ok
+    assert parts.fetched == ["component C1"]
+
+
+def test_cli_reads_bom_and_reports_failures(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    _FakeParts(unknown=frozenset({"C25744"})).install(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    bom = tmp_path / "bom.csv"
+    bom.write_text(JLCPCB_BOM, encoding="utf-8")
+
+    with caplog.at_level(logging.INFO):
+        assert cli.main(["prefetch", str(bom), "--lcsc_id", "C2040"]) == 1
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Prefetched 2/3 components completely" in messages
+    assert "C25744: missing component" in messages
+
+
+def test_cli_without_ids_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert cli.main(["prefetch"]) == 1
@@ -0,0 +1,222 @@
+"""Tests for RequestScheduler retry/backoff against a local stub HTTP server."""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import http.server
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.easyeda.easyeda_api as api_module
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_api_async import AsyncEasyedaApi
+from easyeda2kicad.easyeda.request_scheduler import (
+    AimdLimiter,
+    RequestScheduler,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class _ScriptedHandler(http.server.BaseHTTPRequestHandler):
+    """Answers each path with the next (status, headers, delay) of its script."""
+
+    protocol_version = "HTTP/1.1"
+    scripts: dict[str, list[tuple[int, dict[str, str], float]]] = {}
+    hits: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            count = cls.hits.get(self.path, 0)
+            cls.hits[self.path] = count + 1
+            script = cls.scripts.get(self.path, [])
+            status, headers, delay = (
+                script[count] if count < len(script) else (200, {}, 0.0)
+            )
+        time.sleep(delay)
+        body = f"{status} {self.path}".encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.do_GET()
+
+
+@pytest.fixture()
+def stub_server() -> Iterator[str]:
+    _ScriptedHandler.scripts = {}
+    _ScriptedHandler.hits = {}
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _api(**scheduler_kwargs: Any) -> EasyedaApi:
+    scheduler_kwargs.setdefault("base_delay", 0.01)
+    return EasyedaApi(scheduler=RequestScheduler(**scheduler_kwargs))
+
+
+def _get(api: EasyedaApi, url: str, timeout: float = 5) -> bytes:
+    req = urllib.request.Request(url)  # noqa: S310
+    with api._urlopen(req, timeout=timeout) as response:
+        body: bytes = response.read()
+    return body
+
+
+def test_retries_transient_server_errors(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/flaky"] = [(500, {}, 0.0), (502, {}, 0.0)]
+    assert _get(_api(), f"{stub_server}/flaky") == b"200 /flaky"
+    assert _ScriptedHandler.hits["/flaky"] == 3
+
+
+def test_client_errors_are_not_retried(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/gone"] = [(404, {}, 0.0)]
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _get(_api(), f"{stub_server}/gone")
+    assert excinfo.value.code == 404
+    assert _ScriptedHandler.hits["/gone"] == 1
+
+
+def test_gives_up_after_max_attempts(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/down"] = [(503, {}, 0.0)] * 5
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _get(_api(max_attempts=3), f"{stub_server}/down")
+    assert excinfo.value.code == 503
+    assert _ScriptedHandler.hits["/down"] == 3
+
+
+def test_honors_retry_after(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/busy"] = [(429, {"Retry-After": "1"}, 0.0)]
+    api = _api(base_delay=0.0)
+    start = time.monotonic()
+    assert _get(api, f"{stub_server}/busy") == b"200 /busy"
+    assert time.monotonic() - start >= 0.9
+    assert api.scheduler.host_state(stub_server).limiter.limit < 16
+
+
+def test_long_retry_after_is_reported(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/later"] = [(429, {"Retry-After": "3600"}, 0.0)]
+    with pytest.raises(urllib.error.HTTPError):
+        _get(_api(), f"{stub_server}/later")
+    assert _ScriptedHandler.hits["/later"] == 1
+
+
+def test_retries_timeouts(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/slow"] = [(200, {}, 0.5)]
+    assert _get(_api(), f"{stub_server}/slow", timeout=0.1) == b"200 /slow"
+    assert _ScriptedHandler.hits["/slow"] == 2
+
+
+def test_post_is_not_retried(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/search"] = [(200, {}, 0.5)]
+    _ScriptedHandler.scripts["/busy-search"] = [(503, {}, 0.0)]
+    api = _api()
+    for path, timeout in (("/search", 0.1), ("/busy-search", 5.0)):
+        req = urllib.request.Request(f"{stub_server}{path}", data=b"q=1")  # noqa: S310
+        with pytest.raises(urllib.error.URLError):
+            api._urlopen(req, timeout=timeout).close()
+        assert _ScriptedHandler.hits[path] == 1
+
+
+def test_async_post_is_not_retried() -> None:
+    calls = 0
+
+    async def send() -> None:
+        nonlocal calls
+        calls += 1
+        raise urllib.error.URLError("timed out")
+
+    scheduler = RequestScheduler(base_delay=0.01)
+    with pytest.raises(urllib.error.URLError):
+        asyncio.run(scheduler.call_async("http://host/", send, idempotent=False))
+    assert calls == 1
+    with pytest.raises(urllib.error.URLError):
+        asyncio.run(scheduler.call_async("http://host/", send))
+    assert calls == 1 + scheduler.max_attempts
+
+
+def test_slot_held_until_response_is_closed(stub_server: str) -> None:
+    api = _api()
+    limiter = api.scheduler.host_state(stub_server).limiter
+    req = urllib.request.Request(f"{stub_server}/body")  # noqa: S310
+    with api._urlopen(req, timeout=5) as response:
+        # The body is still to be transferred
+        assert limiter.in_flight == 1
+        assert response.read() == b"200 /body"
+    assert limiter.in_flight == 0
+
+
+def test_getter_recovers_instead_of_returning_empty(
+    stub_server: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(api_module, "ENDPOINT_3D_MODEL", stub_server + "/obj/{uuid}")
+    _ScriptedHandler.scripts["/obj/u1"] = [(503, {"Retry-After": "0"}, 0.0)]
+    assert _api().get_raw_3d_model_obj("u1") == "200 /obj/u1"
+
+
+def test_async_client_shares_retry_policy(stub_server: str) -> None:
+    _ScriptedHandler.scripts["/async"] = [(503, {}, 0.0), (500, {}, 0.0)]
+    client = AsyncEasyedaApi(api=_api())
+
+    async def run() -> bytes:
+        response = await client._request("GET", f"{stub_server}/async", {})
+        return response.body
+
+    assert asyncio.run(run()) == b"200 /async"
+    assert _ScriptedHandler.hits["/async"] == 3
+
+
+def test_token_bucket_spaces_requests() -> None:
+    bucket = TokenBucket(rate=10.0, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_aimd_limiter_adapts() -> None:
+    limiter = AimdLimiter(max_limit=8)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(succeeded=True)
+    assert limiter.limit == pytest.approx(5, abs=0.1)
+    assert limiter.in_flight == 0
+
+
+def test_aimd_limiter_blocks_above_limit() -> None:
+    limiter = AimdLimiter(max_limit=1)
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    future = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert parse_retry_after(future) == pytest.approx(30, abs=2)
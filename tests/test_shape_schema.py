@@ -0,0 +1,91 @@
+"""Tests for the precompiled field schemas of the EasyEDA shape dataclasses."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Optional
+
+from easyeda2kicad.easyeda import parameters_easyeda
+from easyeda2kicad.easyeda.easyeda_importer import convert_fields_to_types
+from easyeda2kicad.easyeda.parameters_easyeda import (
+    EasyedaPinType,
+    EeFootprintBbox,
+    EeFootprintPad,
+    EeSymbolPinSettings,
+    EeSymbolPolygon,
+    EeSymbolPolyline,
+    EeSymbolRectangle,
+    _safe_float,
+)
+from easyeda2kicad.easyeda.shape_schema import SHAPE_SCHEMAS, schema_of
+
+
+def test_every_shape_dataclass_is_registered() -> None:
+    shape_classes = {
+        obj
+        for name, obj in vars(parameters_easyeda).items()
+        if name.startswith("Ee") and dataclasses.is_dataclass(obj)
+    }
+    assert shape_classes <= SHAPE_SCHEMAS.keys()
+
+
+def test_casters_follow_annotations() -> None:
+    schema = schema_of(EeSymbolRectangle)
+    assert schema.names[:4] == ("pos_x", "pos_y", "width", "height")
+    assert schema.defaults == {"rx": None, "ry": None}
+    values = schema.convert(["1.5", "", "x", "4", "#000", "1", "0", "none", "g", "1"])
+    assert values["pos_x"] == 1.5
+    assert values["pos_y"] == 0.0 and values["width"] == 0.0
+    assert values["stroke_color"] == "#000"
+    assert values["is_locked"] is True
+
+
+def test_create_casts_extra_fields_and_keeps_unknown_types() -> None:
+    rect = schema_of(EeSymbolRectangle).create(
+        ["0", "0", "10", "5", "", "1", "0", "none", "g", "0"], rx="2"
+    )
+    assert rect.rx == 2.0 and rect.ry is None
+    pin = schema_of(EeSymbolPinSettings).create(
+        ["show", "4", "7", "10", "20", "90", "g1", "0"]
+    )
+    assert pin.type is EasyedaPinType.power
+    assert pin.rotation == 90 and pin.spice_pin_number == "7"
+
+
+def test_make_leaves_conversion_to_post_init() -> None:
+    pad = schema_of(EeFootprintPad).make(
+        "RECT~4000~3000~6~4~1~GND~1~0~~90~g1~0~~N~0~extra".split("~")
+    )
+    assert pad.center_x == 1016.0
+    assert pad.is_plated is False and pad.number == "1"
+
+
+def test_convert_fields_to_types_still_works_for_any_dataclass() -> None:
+    @dataclasses.dataclass
+    class Local:
+        a: int
+        b: Optional[float] = None
+        c: str = ""
+
+    assert convert_fields_to_types({"a": "3.0", "b": "x", "z": "1"}, Local) == {
+        "a": 3,
+        "b": 0.0,
+        "z": "1",
+    }
+    assert Local in SHAPE_SCHEMAS
+
+
+def test_shapes_are_slotted() -> None:
+    bbox = EeFootprintBbox(x=100.0, y=50.0)
+    assert not hasattr(bbox, "__dict__")
+    assert (bbox.x_px, bbox.x) == (100.0, 25.4)
+    polygon = schema_of(EeSymbolPolygon).create(
+        ["0 0 1 1", "#000", "1", "0", "none", "g", "0"]
+    )
+    assert isinstance(polygon, EeSymbolPolyline)
+    assert not hasattr(polygon, "__dict__")
+    assert vars(EeSymbolPolygon)["__slots__"] == ()
+    assert polygon == dataclasses.replace(polygon)
+    # Values the schema already cast are not converted again
+    value = 1.5
+    assert _safe_float(value) is value
@@ -0,0 +1,99 @@
+"""Tests for the shared shape tokenizer and designator handler tables."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from easyeda2kicad.easyeda.easyeda_importer import (
+    EasyedaFootprintImporter,
+    footprint_shape_handlers,
+    symbol_shape_handlers,
+)
+from easyeda2kicad.easyeda.shape_tokenizer import (
+    ShapeHandlers,
+    designator_of,
+    split_fields,
+    split_pin,
+)
+
+SVGNODE = "SVGNODE~" + json.dumps(
+    {
+        "attrs": {
+            "uuid": "u1",
+            "title": "R0603",
+            "c_origin": "4010,3000",
+            "c_rotation": "0,0,90",
+            "z": "0",
+        }
+    }
+)
+
+
+def test_tokenizers() -> None:
+    assert designator_of("PAD~RECT~1") == "PAD"
+    assert designator_of("SVGNODE") == "SVGNODE"
+    assert split_fields("PL~0 0 1 1~#000") == ["PL", "0 0 1 1", "#000"]
+    assert split_pin("P~show~0^^1~2^^M 0 0 h 5~#880000") == [
+        ["P", "show", "0"],
+        ["1", "2"],
+        ["M 0 0 h 5", "#880000"],
+    ]
+
+
+def test_dispatch() -> None:
+    unknown: list[str] = []
+    handlers: ShapeHandlers[object] = ShapeHandlers(unknown.append)
+
+    @handlers.register("X", "Y")
+    def join(fields: list[str], sep: str) -> str:
+        return sep.join(fields)
+
+    handlers.register("P", tokenizer=split_pin)(lambda segments, sep: segments)
+
+    assert handlers.dispatch("X~a~b", "-") == "X-a-b"
+    assert handlers.dispatch("Y", "-") == "Y"
+    assert handlers.dispatch("P~a^^b", "") == [["P", "a"], ["b"]]
+    assert handlers.dispatch("Z~a", "-") is None
+    assert unknown == ["Z"]
+    assert "X" in handlers and handlers.designators == ["X", "Y", "P"]
+
+
+def test_importer_tables_cover_known_designators() -> None:
+    assert set(symbol_shape_handlers.designators) == {
+        "P", "R", "E", "C", "A", "PL", "PG", "PT", "T"
+    }  # fmt: skip
+    assert set(footprint_shape_handlers.designators) == {
+        "PAD", "TRACK", "HOLE", "VIA", "CIRCLE", "ARC", "RECT", "TEXT",
+        "SVGNODE", "SOLIDREGION",
+    }  # fmt: skip
+
+
+def test_svgnode_is_parsed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    loads: list[str] = []
+
+    def counting_loads(data: str) -> object:
+        loads.append(data)
+        return json.JSONDecoder().decode(data)
+
+    monkeypatch.setattr(
+        "easyeda2kicad.easyeda.easyeda_importer.json.loads", counting_loads
+    )
+    cad_data = {
+        "title": "R",
+        "packageDetail": {
+            "title": "R0603",
+            "dataStr": {
+                "head": {"x": 4000, "y": 3000, "c_para": {"package": "R0603"}},
+                "shape": ["HOLE~4000~3000~2~gge1~0", SVGNODE, "BOGUS~1"],
+            },
+        },
+    }
+    footprint = EasyedaFootprintImporter(cad_data).output
+    assert len(loads) == 1
+    assert len(footprint.holes) == 1
+    assert footprint.model_3d is not None
+    assert footprint.model_3d.uuid == "u1"
+    assert footprint.model_3d.translation.x == pytest.approx(2.54)
+    assert footprint.model_3d.rotation.z == 90
@@ -0,0 +1,135 @@
+"""Tests for coalesced 3D model downloads and WRL reuse — no network required."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.kicad.export_kicad_3d_model as export_3d
+from easyeda2kicad.easyeda.background import SingleFlight
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.parameters_easyeda import Ee3dModel, Ee3dModelBase
+from easyeda2kicad.kicad.export_kicad_3d_model import (
+    ExportedModels,
+    Exporter3dModelKicad,
+)
+
+RAW_OBJ = "newmtl m\nKd 1 1 1\nKs 0 0 0\nendmtl\nv 0 0 0\nv 1 0 0\nv 0 1 0\nusemtl m\nf 1 2 3\n"
+
+
+def _run_concurrently(fn: Any, count: int = 8) -> list[Any]:
+    results: list[Any] = [None] * count
+
+    def run(i: int) -> None:
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self) -> None:
+        flight: SingleFlight[int] = SingleFlight()
+        calls: list[int] = []
+
+        def slow() -> int:
+            calls.append(1)
+            time.sleep(0.1)
+            return 7
+
+        assert _run_concurrently(lambda: flight.do("k", slow)) == [7] * 8
+        assert len(calls) == 1
+
+    def test_errors_reach_waiters_and_are_not_remembered(self) -> None:
+        flight: SingleFlight[int] = SingleFlight(max_results=4)
+
+        def fail() -> int:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flight.do("k", fail)
+        assert flight.do("k", lambda: 3) == 3
+
+    def test_results_bounded_and_none_not_kept(self) -> None:
+        flight: SingleFlight[int | None] = SingleFlight(max_results=2)
+        flight.do("a", lambda: 1)
+        flight.do("b", lambda: 2)
+        flight.do("c", lambda: 3)
+        assert flight.do("a", lambda: 10) == 10
+        assert flight.do("c", lambda: 30) == 3
+        assert flight.do("n", lambda: None) is None
+        assert flight.do("n", lambda: 5) == 5
+
+
+def test_api_downloads_shared_obj_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    def fake_fetch(self: EasyedaApi, uuid: str) -> str:
+        calls.append(uuid)
+        time.sleep(0.05)
+        return f"obj {uuid}"
+
+    monkeypatch.setattr(EasyedaApi, "_fetch_raw_3d_model_obj", fake_fetch)
+    api = EasyedaApi()
+    results = _run_concurrently(lambda: api.get_raw_3d_model_obj("uuid-0603"))
+    assert results == ["obj uuid-0603"] * 8
+    assert api.get_raw_3d_model_obj("uuid-0603") == "obj uuid-0603"
+    assert calls == ["uuid-0603"]
+
+
+def _model(name: str = "R0603", x: float = 0.0) -> Ee3dModel:
+    return Ee3dModel(
+        name=name,
+        uuid="uuid-0603",
+        translation=Ee3dModelBase(x=x),
+        rotation=Ee3dModelBase(),
+        raw_obj=RAW_OBJ,
+    )
+
+
+def test_wrl_generated_once_per_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    real_generate = export_3d.generate_wrl_model
+
+    def counting_generate(model_3d: Ee3dModel) -> Any:
+        calls.append(model_3d.name)
+        return real_generate(model_3d=model_3d)
+
+    monkeypatch.setattr(export_3d, "generate_wrl_model", counting_generate)
+    name = f"R0603_{time.monotonic_ns()}"  # not generated by earlier tests
+    first = Exporter3dModelKicad(_model(name)).output
+    second = Exporter3dModelKicad(_model(name)).output
+    shifted = Exporter3dModelKicad(_model(name, x=1.5)).output
+    assert first is not None and first is second
+    assert shifted is not None and shifted.raw_wrl != first.raw_wrl
+    assert calls == [name, name]
+
+
+def test_shared_model_exported_once_per_run(tmp_path: Path) -> None:
+    out_dir = tmp_path / "lib.3dshapes"
+    run = ExportedModels()
+    assert Exporter3dModelKicad(_model()).export(str(out_dir), False, run)
+    wrl = out_dir / "R0603.wrl"
+    wrl.write_text("marker")
+
+    # A second part of the run with the same model is not an "already exists"
+    # error and does not rewrite the file
+    assert Exporter3dModelKicad(_model()).export(str(out_dir), False, run)
+    assert wrl.read_text() == "marker"
+
+    # A different model under the same name still refuses to overwrite
+    assert not Exporter3dModelKicad(_model(x=2.0)).export(str(out_dir), False, run)
+
+    # Files written before a run (or without a registry) keep the overwrite check
+    assert not Exporter3dModelKicad(_model()).export(
+        str(out_dir), False, ExportedModels()
+    )
+    assert not Exporter3dModelKicad(_model()).export(str(out_dir), overwrite=False)
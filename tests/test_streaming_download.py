@@ -0,0 +1,187 @@
+"""Tests for streamed, resumable STEP downloads against a local stub server."""
+
+from __future__ import annotations
+
+import http.server
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import easyeda2kicad.easyeda.easyeda_api as api_module
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.parameters_easyeda import Ee3dModel, Ee3dModelBase
+from easyeda2kicad.easyeda.request_scheduler import RequestScheduler
+from easyeda2kicad.kicad.export_kicad_3d_model import Exporter3dModelKicad
+
+STEP_BODY = bytes(range(256)) * 1024  # 256 KiB, several download chunks
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Bytes sent before dropping the connection, per request (None = all)
+    cut_after: list[int | None] = []
+    honor_range = True
+    ranges: list[str | None] = []
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        if not self.path.endswith("/model"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        range_header = self.headers.get("Range")
+        cls.ranges.append(range_header)
+        start = 0
+        if range_header and cls.honor_range:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(STEP_BODY) - 1}/{len(STEP_BODY)}"
+            )
+        else:
+            self.send_response(200)
+        body = STEP_BODY[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        cut = cls.cut_after.pop(0) if cls.cut_after else None
+        if cut is not None:
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def stub_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    _RangeHandler.cut_after = []
+    _RangeHandler.honor_range = True
+    _RangeHandler.ranges = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(api_module, "ENDPOINT_3D_MODEL_STEP", base + "/{uuid}")
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def _api(
+    tmp_path: Path, use_cache: bool = True, cache_backend: str = "cas"
+) -> EasyedaApi:
+    api = EasyedaApi(
+        use_cache=use_cache,
+        scheduler=RequestScheduler(max_attempts=1),
+        cache_backend=cache_backend,
+    )
+    api.cache_dir = tmp_path / "cache"
+    return api
+
+
+def test_streams_into_cache(tmp_path: Path, stub_server: str) -> None:
+    path = _api(tmp_path, cache_backend="files").download_step_3d_model("model")
+    assert path == tmp_path / "cache" / "model.step"
+    assert path.read_bytes() == STEP_BODY
+    assert not (tmp_path / "cache" / "model.step.part").exists()
+
+
+def test_streams_into_compressed_store(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path)
+    path = api.download_step_3d_model("model")
+    assert path is not None and path.read_bytes() == STEP_BODY
+    assert api.cache_store.read("model.step") == STEP_BODY
+    assert list((tmp_path / "cache" / "tmp").iterdir()) == []
+    api.close()
+    # A new instance unpacks the stored entry without downloading again
+    api = _api(tmp_path)
+    path = api.download_step_3d_model("model")
+    assert path is not None and path.read_bytes() == STEP_BODY
+    assert _RangeHandler.ranges == [None]
+    api.close()
+
+
+def test_streams_into_sqlite_store(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path, cache_backend="sqlite")
+    path = api.download_step_3d_model("model")
+    # The model stays a file beside the database, served without a copy
+    assert path == tmp_path / "cache" / "files" / "model.step"
+    assert path.read_bytes() == STEP_BODY
+    assert api.cache_store.read("model.step") == STEP_BODY
+    api.close()
+    assert path.exists()
+
+
+def test_cached_file_is_not_downloaded_again(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path)
+    api.download_step_3d_model("model")
+    api.download_step_3d_model("model")
+    assert _RangeHandler.ranges == [None]
+
+
+def test_resumes_broken_transfer_with_range(tmp_path: Path, stub_server: str) -> None:
+    _RangeHandler.cut_after = [100_000, 50_000]
+    path = _api(tmp_path).download_step_3d_model("model")
+    assert path is not None and path.read_bytes() == STEP_BODY
+    assert _RangeHandler.ranges == [None, "bytes=100000-", "bytes=150000-"]
+
+
+def test_restarts_when_range_is_ignored(tmp_path: Path, stub_server: str) -> None:
+    _RangeHandler.cut_after = [100_000]
+    _RangeHandler.honor_range = False
+    path = _api(tmp_path).download_step_3d_model("model")
+    assert path is not None and path.read_bytes() == STEP_BODY
+
+
+def test_resumes_partial_file_from_previous_run(
+    tmp_path: Path, stub_server: str
+) -> None:
+    api = _api(tmp_path)
+    staging = api.cache_store.staging_path("model.step")
+    part = staging.with_name(staging.name + ".part")
+    part.parent.mkdir(parents=True)
+    part.write_bytes(STEP_BODY[:4096])
+    path = api.download_step_3d_model("model")
+    assert path is not None and path.read_bytes() == STEP_BODY
+    assert _RangeHandler.ranges == ["bytes=4096-"]
+
+
+def test_gives_up_after_max_resumes(tmp_path: Path, stub_server: str) -> None:
+    _RangeHandler.cut_after = [10] * (api_module.DOWNLOAD_MAX_RESUMES + 1)
+    assert _api(tmp_path).download_step_3d_model("model") is None
+
+
+def test_missing_model_returns_none(tmp_path: Path, stub_server: str) -> None:
+    assert _api(tmp_path).download_step_3d_model("other") is None
+
+
+def test_without_cache_uses_scratch_file(tmp_path: Path, stub_server: str) -> None:
+    api = _api(tmp_path, use_cache=False)
+    path = api.download_step_3d_model("model")
+    assert path is not None and path.read_bytes() == STEP_BODY
+    assert not (tmp_path / "cache").exists()
+    api.close()
+    assert not path.exists()
+
+
+def test_exporter_copies_streamed_step(tmp_path: Path) -> None:
+    step_file = tmp_path / "model.step"
+    step_file.write_bytes(STEP_BODY)
+    model = Ee3dModel(
+        name="PART",
+        uuid="model",
+        translation=Ee3dModelBase(),
+        rotation=Ee3dModelBase(),
+        raw_obj="newmtl m\nKd 1 1 1\nKs 0 0 0\nendmtl\nv 0 0 0\nusemtl m\nf 1 1 1\n",
+        step_file=str(step_file),
+    )
+    out_dir = tmp_path / "lib.3dshapes"
+    assert Exporter3dModelKicad(model_3d=model).export(output_dir=str(out_dir))
+    assert (out_dir / "PART.step").read_bytes() == STEP_BODY
@@ -0,0 +1,107 @@
+"""Tests for the user cache shared by projects and the layered lookup."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import easyeda2kicad.__main__ as cli
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from easyeda2kicad.easyeda.easyeda_cache import (
+    CasCacheStore,
+    FileCacheStore,
+    default_cache_dir,
+    user_cache_dir,
+)
+
+COMPONENT = {"success": True, "result": {"title": "R"}}
+
+
+def test_user_cache_location(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EASYEDA2KICAD_CACHE_DIR", str(tmp_path / "shared"))
+    assert user_cache_dir() == tmp_path / "shared"
+
+    monkeypatch.delenv("EASYEDA2KICAD_CACHE_DIR")
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert user_cache_dir() == tmp_path / "xdg" / "easyeda2kicad"
+    # Relative values are invalid per the XDG spec
+    monkeypatch.setenv("XDG_CACHE_HOME", "relative")
+    assert user_cache_dir() == Path.home() / ".cache" / "easyeda2kicad"
+
+
+def test_project_cache_takes_precedence(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, isolated_user_cache: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert default_cache_dir() == isolated_user_cache
+    (tmp_path / ".easyeda_cache").mkdir()
+    assert default_cache_dir() == tmp_path / ".easyeda_cache"
+
+
+def _offline(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    requested: list[str] = []
+
+    def urlopen(api: EasyedaApi, req: object, timeout: float) -> None:
+        requested.append(getattr(req, "full_url", ""))
+        raise AssertionError("no network access expected")
+
+    monkeypatch.setattr(EasyedaApi, "_urlopen", urlopen)
+    return requested
+
+
+def test_lookup_goes_project_then_user_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, isolated_user_cache: Path
+) -> None:
+    _offline(monkeypatch)
+    project = FileCacheStore(tmp_path / ".easyeda_cache")
+    project.write("C1.json", json.dumps(COMPONENT).encode())
+    project.write("u.obj", b"v 1 1 1\n")
+    shared = CasCacheStore(isolated_user_cache)
+    shared.write("C2.json", json.dumps(COMPONENT).encode())
+    shared.write("u.obj", b"v 0 0 0\n")
+    shared.write("u.step", b"ISO-10303-21;")
+    shared.close()
+    monkeypatch.chdir(tmp_path)
+
+    api = EasyedaApi(use_cache=True, cache_backend="files")
+    assert api.cache_dir == tmp_path / ".easyeda_cache"
+    assert api.get_cad_data_of_component("C1")["title"] == "R"
+    assert api.get_cad_data_of_component("C2")["title"] == "R"
+    assert api.get_raw_3d_model_obj("u") == "v 1 1 1\n"
+    step = api.download_step_3d_model("u")
+    assert step is not None and step.read_bytes() == b"ISO-10303-21;"
+    api.close()
+    # Hits in the user cache are not copied into the project
+    assert project.keys() == ["C1.json", "u.obj"]
+
+
+def test_projects_share_the_user_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, isolated_user_cache: Path
+) -> None:
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    monkeypatch.chdir(first)
+    api = EasyedaApi(use_cache=True)
+    api._write_to_cache(api._get_cache_path("C1", "json"), json.dumps(COMPONENT))
+    api.close()
+    assert not (first / ".easyeda_cache").exists()
+
+    _offline(monkeypatch)
+    monkeypatch.chdir(second)
+    api = EasyedaApi(use_cache=True)
+    assert api.cache_dir == isolated_user_cache
+    assert api.get_cad_data_of_component("C1")["title"] == "R"
+    api.close()
+
+
+def test_cli_cache_dir_option(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    custom = tmp_path / "custom"
+    CasCacheStore(custom).write("C1.json", json.dumps(COMPONENT).encode())
+    assert cli.main(["cache", "stats"]) == 1
+    assert cli.main(["cache", "stats", "--cache-dir", str(custom)]) == 0
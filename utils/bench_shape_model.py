@@ -0,0 +1,186 @@
+"""
+Memory and throughput of the EasyEDA shape model on a large part
+
+Builds a synthetic BGA (rows x rows balls, one symbol pin per ball), runs the
+symbol and footprint importers on it and reports:
+
+- the time to import, best of --repeat runs, and to convert the footprint;
+- the memory held by the imported shapes (tracemalloc);
+- the size of one shape instance, slotted (parameters_easyeda) against a
+  dict-backed copy of the same dataclass, for the classes that occur most.
+
+    python utils/bench_shape_model.py --rows 40
+"""
+
+from __future__ import annotations
+
+# Global imports
+import argparse
+import dataclasses
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Local imports
+from easyeda2kicad.easyeda import parameters_easyeda  # noqa: E402
+from easyeda2kicad.easyeda.easyeda_importer import (  # noqa: E402
+    EasyedaFootprintImporter,
+    EasyedaSymbolImporter,
+)
+from easyeda2kicad.kicad.export_kicad_footprint import (  # noqa: E402
+    ExporterFootprintKicad,
+)
+
+
+def bga_part(rows: int) -> dict[str, Any]:
+    """CAD data of a rows x rows BGA with matching symbol pins."""
+    pins = []
+    pads = []
+    for i in range(rows * rows):
+        row, col = divmod(i, rows)
+        number = f"{chr(65 + row % 26)}{row // 26 or ''}{col + 1}"
+        y = i * 10
+        pins.append(
+            f"P~show~0~{number}~0~{y}~180~gge{i}~0^^0~{y}^^M 0 {y} h 10~#880000"
+            f"^^1~14~{y + 4}~0~BALL_{number}~start~~~#0000FF^^1~6~{y - 1}~0~"
+            f"{number}~end~~~#0000FF^^0~11~{y}^^0~M 13 {y - 3} L 16 {y} L 13 {y + 3}"
+        )
+        pad_x, pad_y = 4000 + col * 3.937, 3000 + row * 3.937
+        pads.append(
+            f"PAD~ELLIPSE~{pad_x}~{pad_y}~1.9685~1.9685~1~NET{i}~{number}~0~~0"
+            f"~gge{i}~0~~Y~0~0~0.2~{pad_x},{pad_y}"
+        )
+    side = rows * 3.937 + 4
+    silk = [
+        f"TRACK~0.6~3~~3996 2996 {3996 + side} 2996 {3996 + side} {2996 + side}",
+        f"TRACK~0.6~3~~3996 {2996 + side} 3996 2996",
+    ]
+    return {
+        "title": f"BGA-{rows * rows}",
+        "description": "",
+        "tags": [],
+        "lcsc": {"number": "C0"},
+        "dataStr": {
+            "head": {"x": 0, "y": 0, "c_para": {"pre": "U?", "name": "BGA"}},
+            "shape": [f"R~10~-10~~~80~{rows * rows * 10 + 20}~#880000~1~0~none~r~0"]
+            + pins,
+            "BBox": {"x": 0, "y": 0, "width": 100, "height": rows * rows * 10},
+        },
+        "packageDetail": {
+            "dataStr": {
+                "head": {"x": 4000, "y": 3000, "c_para": {"package": "BGA"}},
+                "shape": pads + [s + f"~gge{n}~0" for n, s in enumerate(silk)],
+            }
+        },
+    }
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def held_memory(fn: Callable[[], object]) -> tuple[int, object]:
+    """Bytes still allocated once *fn* returned, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held, result
+
+
+def dict_backed(cls: type) -> type:
+    """The dataclass *cls* with a per-instance __dict__ instead of slots."""
+    namespace = {
+        "__annotations__": {f.name: f.type for f in dataclasses.fields(cls)},
+    }
+    return dataclasses.dataclass(type(cls.__name__, (), namespace))
+
+
+def instance_size(objects: list[Any], cls: type) -> int:
+    """Bytes per instance of copies of *objects* as instances of *cls*.
+
+    Field values are shared with the originals, so only the instances (and
+    their __dict__) are counted.
+    """
+    names = [f.name for f in dataclasses.fields(cls)]
+
+    def copy() -> list[Any]:
+        copies = []
+        for obj in objects:
+            new: Any = object.__new__(cls)
+            for name in names:
+                object.__setattr__(new, name, getattr(obj, name))
+            copies.append(new)
+        return copies
+
+    held, _ = held_memory(copy)
+    # Minus the list holding the copies
+    return (held - sys.getsizeof(objects)) // len(objects)
+
+
+def shapes_of(model: Any) -> list[Any]:
+    """Every Ee* shape instance reachable from *model*."""
+    found = []
+    todo = [model]
+    while todo:
+        obj = todo.pop()
+        if isinstance(obj, list):
+            todo.extend(obj)
+        elif dataclasses.is_dataclass(obj):
+            if type(obj).__module__ == parameters_easyeda.__name__:
+                found.append(obj)
+            todo.extend(getattr(obj, f.name) for f in dataclasses.fields(obj))
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=40, help="BGA rows (default 40)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs (default 5)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    data = bga_part(args.rows)
+    print(f"{data['title']}: {args.rows * args.rows} pins and pads\n")
+    print(f"{'importer':<10} {'time':>10} {'held':>12}")
+    shapes: list[Any] = []
+    for name, importer in (
+        ("symbol", EasyedaSymbolImporter),
+        ("footprint", EasyedaFootprintImporter),
+    ):
+        seconds = best_time(lambda: importer(data), args.repeat)  # noqa: B023
+        held, model = held_memory(lambda: importer(data).output)  # noqa: B023
+        shapes += shapes_of(model)
+        print(f"{name:<10} {seconds * 1000:>7.1f} ms {held / 1024:>9.0f} kB")
+    seconds = best_time(lambda: ExporterFootprintKicad(model), args.repeat)  # type: ignore[arg-type]
+    print(f"{'exporter':<10} {seconds * 1000:>7.1f} ms")
+
+    by_class: dict[type, list[Any]] = {}
+    for shape in shapes:
+        by_class.setdefault(type(shape), []).append(shape)
+    print(f"\n{'shape':<22} {'count':>6} {'slotted':>8} {'dict':>6}  (bytes each)")
+    for cls, objects in sorted(by_class.items(), key=lambda item: -len(item[1])):
+        if len(objects) < 100:
+            continue
+        print(
+            f"{cls.__name__:<22} {len(objects):>6} {instance_size(objects, cls):>8}"
+            f" {instance_size(objects, dict_backed(cls)):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()